@@ -1,3 +1,5 @@
+import contextlib
+import io
 import json
 import os
 import shutil
@@ -8,6 +10,7 @@ from pathlib import Path
 
 sys.path.append(os.path.abspath("tools"))
 import aggregate_history
+import line_index
 
 
 class AggregateHistoryTests(unittest.TestCase):
@@ -227,6 +230,242 @@ class AggregateHistoryTests(unittest.TestCase):
         assert "### Header" in narrative
         assert "Content for J1" in narrative
 
+    def _write_run(self, name, claim):
+        run_dir = Path("artifacts/history/runs") / name
+        run_dir.mkdir(parents=True, exist_ok=True)
+        (run_dir / "walkthrough.md").write_text(
+            f"# Walkthrough\nHYP-0001: {claim}\nEvidence: artifacts/history/runs/{name}/walkthrough.md\n",
+            encoding="utf-8",
+        )
+        return run_dir
+
+    def _outputs(self):
+        return [
+            Path(p).read_bytes()
+            for p in (
+                "artifacts/history/history.ndjson",
+                "artifacts/history/deep-thoughts.md",
+                "artifacts/history/history.md",
+            )
+            if Path(p).exists()
+        ]
+
+    def test_run_cache_skips_unchanged_runs_and_matches_full_rebuild(self):
+        self._write_run("run1", "first note")
+        run2 = self._write_run("run2", "second note")
+        self.assertEqual(aggregate_history.main([]), 0)
+        self.assertTrue(Path("artifacts/cache/aggregate_runs.json").exists())
+
+        (run2 / "walkthrough.md").write_text(
+            "# Walkthrough\nHYP-0001: a much longer revised second note\n", encoding="utf-8"
+        )
+        parsed = []
+        original = aggregate_history.parse_run_dir
+
+        def tracking(run_dir, repo_root):
+            parsed.append(run_dir.name)
+            return original(run_dir, repo_root)
+
+        aggregate_history.parse_run_dir = tracking
+        try:
+            self.assertEqual(aggregate_history.main(["--jobs", "1"]), 0)
+        finally:
+            aggregate_history.parse_run_dir = original
+        self.assertEqual(parsed, ["run2"])
+        cached_outputs = self._outputs()
+
+        self.assertEqual(aggregate_history.main(["--no-cache"]), 0)
+        self.assertEqual(self._outputs(), cached_outputs)
+
+    def test_run_cache_ignores_stale_or_foreign_entries(self):
+        self._write_run("run1", "note")
+        cache_path = Path("artifacts/cache/aggregate_runs.json")
+        cache_path.parent.mkdir(parents=True)
+        cache_path.write_text(
+            json.dumps({"version": aggregate_history.RUN_CACHE_VERSION, "repo_root": "/elsewhere", "runs": {"run1": {}}}),
+            encoding="utf-8",
+        )
+        self.assertEqual(aggregate_history.load_run_cache(cache_path, Path.cwd()), {})
+
+        self.assertEqual(aggregate_history.main([]), 0)
+        runs = aggregate_history.load_run_cache(cache_path, Path.cwd())
+        self.assertEqual(list(runs), ["run1"])
+        self.assertEqual(runs["run1"]["records"][0]["claim"], "note")
+
+    def test_parallel_parsing_matches_serial_output(self):
+        for idx in range(aggregate_history.PARALLEL_MIN_RUNS + 4):
+            self._write_run(f"run{idx:02d}", f"note number {idx}")
+        Path("artifacts/history/runs/run03/walkthrough.md").write_text(
+            "# Walkthrough\nHYP-0002: separate hypothesis\n", encoding="utf-8"
+        )
+
+        self.assertEqual(aggregate_history.main(["--no-cache", "--jobs", "1"]), 0)
+        serial = self._outputs()
+        self.assertEqual(aggregate_history.main(["--no-cache", "--jobs", "4"]), 0)
+        self.assertEqual(self._outputs(), serial)
+
+    def test_check_reports_first_differing_record(self):
+        self._write_run("run1", "note")
+        self._write_run("run2", "other")
+        self.assertEqual(aggregate_history.main([]), 0)
+        self.assertEqual(aggregate_history.main(["--check"]), 0)
+
+        history_path = Path("artifacts/history/history.ndjson")
+        lines = history_path.read_text(encoding="utf-8").splitlines(keepends=True)
+        history_path.write_text("".join(lines) + "not json\n", encoding="utf-8")
+
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            self.assertEqual(aggregate_history.main(["--check"]), 1)
+        self.assertIn(f"history.ndjson is out of date; first difference at line {len(lines) + 1}", stderr.getvalue())
+
+        # Same record, non-canonical encoding.
+        history_path.write_text(json.dumps(json.loads(lines[0])) + "\n", encoding="utf-8")
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            self.assertEqual(aggregate_history.main(["--check"]), 1)
+        self.assertIn("first difference at line 1 (expected hypothesis HYP-0001)", stderr.getvalue())
+
+    def test_line_index_tracks_written_and_appended_history(self):
+        self._write_run("run1", "note")
+        self.assertEqual(aggregate_history.main([]), 0)
+        history_path = Path("artifacts/history/history.ndjson")
+        with line_index.open_index(history_path) as index:
+            self.assertEqual(index.find("HYP-0001"), {"hypothesis": 1})
+
+        Path("artifacts/journal").mkdir(parents=True)
+        Path("artifacts/journal/run1.md").write_text("Journal one\n", encoding="utf-8")
+        self.assertEqual(aggregate_history.main(["--append"]), 0)
+        sidecar = line_index.index_path_for(history_path).read_bytes()
+        line_index.build_index(history_path)
+        self.assertEqual(line_index.index_path_for(history_path).read_bytes(), sidecar)
+        with line_index.open_index(history_path) as index:
+            self.assertEqual(json.loads(index.line(index.lookup("journal", "run1")))["timestamp"], "run1")
+
+        # --check names what the log currently holds at the first difference.
+        Path("artifacts/journal/run0.md").write_text("Journal zero\n", encoding="utf-8")
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            self.assertEqual(aggregate_history.main(["--check"]), 1)
+        self.assertIn("first difference at line 1 (expected journal run0, found hypothesis HYP-0001)", stderr.getvalue())
+
+    def test_check_names_the_first_differing_field_of_the_same_record(self):
+        self._write_run("run1", "note")
+        self.assertEqual(aggregate_history.main([]), 0)
+        history_path = Path("artifacts/history/history.ndjson")
+        record = json.loads(history_path.read_text(encoding="utf-8").splitlines()[0])
+        record["summary"] = "edited"
+        history_path.write_text(json.dumps(record) + "\n", encoding="utf-8")
+        line_index.build_index(history_path)
+
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            self.assertEqual(aggregate_history.main(["--check"]), 1)
+        self.assertIn("line 1 (expected hypothesis HYP-0001, found it with a different 'summary')", stderr.getvalue())
+
+    def test_append_mode_writes_deltas_and_compacts_to_snapshot(self):
+        self._write_run("run1", "note")
+        self._write_run("run2", "other")
+        Path("artifacts/journal").mkdir(parents=True)
+        Path("artifacts/journal/run1.md").write_text("Journal one\n", encoding="utf-8")
+        self.assertEqual(aggregate_history.main([]), 0)
+        history_path = Path("artifacts/history/history.ndjson")
+        snapshot_lines = history_path.read_text(encoding="utf-8").splitlines()
+
+        Path("artifacts/journal/run0.md").write_text("Journal zero\n", encoding="utf-8")
+        self.assertEqual(aggregate_history.main(["--append", "--check"]), 1)
+        self.assertEqual(aggregate_history.main(["--append"]), 0)
+        appended = history_path.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(appended[: len(snapshot_lines)], snapshot_lines)
+        self.assertEqual([json.loads(l)["timestamp"] for l in appended[len(snapshot_lines):]], ["run0"])
+        self.assertEqual(aggregate_history.main(["--append", "--check"]), 0)
+        self.assertEqual(aggregate_history.main(["--compact", "--check"]), 1)
+
+        self.assertEqual(aggregate_history.main(["--compact"]), 0)
+        compacted = history_path.read_bytes()
+        self.assertEqual(aggregate_history.main(["--compact", "--check"]), 0)
+        self.assertEqual(aggregate_history.main(["--check"]), 0)
+        self.assertEqual(aggregate_history.main([]), 0)
+        self.assertEqual(history_path.read_bytes(), compacted)
+
+    def test_compact_drops_records_whose_source_is_gone(self):
+        self._write_run("run1", "note")
+        Path("artifacts/journal").mkdir(parents=True)
+        Path("artifacts/journal/run1.md").write_text("Journal one\n", encoding="utf-8")
+        Path("artifacts/journal/run2.md").write_text("Journal two\n", encoding="utf-8")
+        self.assertEqual(aggregate_history.main([]), 0)
+        Path("artifacts/journal/run0.md").write_text("Journal zero\n", encoding="utf-8")
+        self.assertEqual(aggregate_history.main(["--append"]), 0)
+
+        Path("artifacts/journal/run2.md").unlink()
+        self.assertEqual(aggregate_history.main(["--append"]), 0)
+        history_path = Path("artifacts/history/history.ndjson")
+
+        def journals():
+            records = [json.loads(line) for line in history_path.read_text(encoding="utf-8").splitlines()]
+            return [r["timestamp"] for r in records if r["record_type"] == "journal"]
+
+        self.assertIn("run2", journals())
+        self.assertEqual(aggregate_history.main(["--compact", "--check"]), 1)
+        self.assertEqual(aggregate_history.main(["--compact"]), 0)
+        self.assertEqual(journals(), ["run0", "run1"])
+        compacted = history_path.read_bytes()
+        self.assertEqual(aggregate_history.main(["--no-cache"]), 0)
+        self.assertEqual(history_path.read_bytes(), compacted)
+
+    def test_append_mode_compacts_when_log_outgrows_snapshot(self):
+        self._write_run("run1", "note")
+        self.assertEqual(aggregate_history.main([]), 0)
+        history_path = Path("artifacts/history/history.ndjson")
+        self.assertEqual(len(history_path.read_text(encoding="utf-8").splitlines()), 1)
+
+        for claim in ("a longer note", "an even longer note"):
+            self._write_run("run1", claim)
+            self.assertEqual(aggregate_history.main(["--append"]), 0)
+
+        lines = history_path.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["claim"], "an even longer note")
+
+    def test_history_md_rows_are_memoized_per_run(self):
+        records = [
+            {"record_type": "hypothesis", "timestamp": "run1", "status": "finished", "summary": "a | b",
+             "evidence": ["docs/b.md", "artifacts/history/runs/run1/walkthrough.md"]},
+            {"record_type": "journal", "timestamp": "run2", "summary": "j", "evidence": ["artifacts/journal/run2.md"]},
+        ]
+        repo_root = Path.cwd()
+        history_dir = repo_root / "artifacts/history"
+        expected = aggregate_history.render_history_md(records, repo_root, history_dir)
+        self.assertEqual(
+            expected[-2],
+            "| run1 | run1 | FINISHED | a \\| b | [walkthrough.md](runs/run1/walkthrough.md), [b.md](../../docs/b.md) |",
+        )
+
+        rows = {}
+        self.assertEqual(aggregate_history.render_history_md(records, repo_root, history_dir, rows), expected)
+        self.assertEqual(len(rows), 2)
+
+        # Cached rows are reused verbatim; rows for changed runs are re-rendered and stale ones dropped.
+        rows = {key: f"cached {row}" for key, row in rows.items()}
+        records[0] = dict(records[0], status="blocked")
+        lines = aggregate_history.render_history_md(records, repo_root, history_dir, rows)
+        self.assertTrue(lines[-2].startswith("| run1 | run1 | BLOCKED |"))
+        self.assertTrue(lines[-1].startswith("cached | run2 |"))
+        self.assertEqual(len(rows), 2)
+
+    def test_index_flag_writes_current_sqlite_index(self):
+        import history_index
+
+        self._write_run("run1", "note")
+        self.assertEqual(aggregate_history.main(["--index"]), 0)
+        history_path = Path("artifacts/history/history.ndjson")
+        index_path = Path("artifacts/history/history.sqlite")
+        self.assertTrue(history_index.is_current(index_path, history_path))
+        with history_index.connect(index_path) as conn:
+            self.assertEqual(
+                [tuple(row) for row in conn.execute("SELECT id, claim FROM hypotheses")], [("HYP-0001", "note")]
+            )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,54 @@
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+from tools.cvr.bench import run_bench, workspace
+
+
+def _digest(root):
+    digest = hashlib.sha256()
+    for path in sorted(p for p in root.rglob("*") if p.is_file()):
+        digest.update(path.relative_to(root).as_posix().encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def test_generator_is_deterministic(tmp_path):
+    workspace.generate(tmp_path / "a", runs=6, seed=3)
+    workspace.generate(tmp_path / "b", runs=6, seed=3)
+    workspace.generate(tmp_path / "c", runs=6, seed=4)
+
+    assert _digest(tmp_path / "a") == _digest(tmp_path / "b")
+    assert _digest(tmp_path / "a") != _digest(tmp_path / "c")
+
+
+def test_generator_writes_a_full_workspace(tmp_path):
+    workspace.generate(tmp_path, runs=5, activity_lines=7)
+
+    runs = sorted(p.name for p in (tmp_path / "artifacts/history/runs").iterdir())
+    assert runs == [workspace.run_id(i) for i in range(5)]
+    for name in ("implementation_plan.json", "implementation_plan.md", "walkthrough.md", "post_verify_report.md"):
+        assert (tmp_path / "artifacts/history/runs" / runs[0] / name).exists()
+    assert len(list((tmp_path / "artifacts/journal").glob("*.md"))) == 5
+    assert "## Active Hypotheses" in (tmp_path / "AGENDA.md").read_text(encoding="utf-8")
+    activity = (tmp_path / "artifacts/agent_activity.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(activity) == 7 and json.loads(activity[0])["actor"] == "bench"
+
+
+def test_measure_reports_files_read_and_exit_status(tmp_path):
+    (tmp_path / "data.txt").write_text("x", encoding="utf-8")
+    script = "open('data.txt').read(); open('data.txt').read(); open('out.txt', 'w'); raise SystemExit(3)"
+
+    result = run_bench.measure([sys.executable, "-c", script], tmp_path, tmp_path / "cmd.log")
+
+    assert result["returncode"] == 3
+    assert result["files_read"] == 1
+    assert result["max_rss_kb"] > 0
+
+
+def test_find_regressions_flags_metrics_beyond_tolerance():
+    before = [{"scale": 10, "tool": "history_lint", "wall_s": 1.0, "max_rss_kb": 100, "files_read": 3}]
+    after = [{"scale": 10, "tool": "history_lint", "wall_s": 1.2, "max_rss_kb": 200, "files_read": 3}]
+
+    assert run_bench.find_regressions(after, before, 0.25) == ["history_lint @ 10 runs: max_rss_kb 100 -> 200"]
@@ -1,10 +1,13 @@
+import contextlib
+import io
 import unittest
 import tempfile
 import os
 from pathlib import Path
 import sys
 sys.path.append(os.path.abspath("tools/linters"))
-from content_lint import count_words, check_structure, check_word_count
+import content_lint
+from content_lint import count_words, check_structure, check_word_count, scan_lines
 
 class TestContentLint(unittest.TestCase):
     def test_count_words_ignores_code(self):
@@ -28,5 +31,64 @@ class TestContentLint(unittest.TestCase):
         self.assertTrue(check_word_count(p, short))
         self.assertFalse(check_word_count(p, long))
 
+    def test_count_words_skips_fenced_blocks_line_by_line(self):
+        text = "Intro words here\n```python\nx = 1  # not counted\n```\n~~~\nalso code\n~~~\nOutro `inline` text\n"
+        self.assertEqual(count_words(text), 5)
+
+    def test_scan_lines_stops_once_checks_pass(self):
+        lines = iter(["## Verification Plan", "one two three", "four five", "never read"])
+        scan = scan_lines(lines, min_words=7, sections=("## Verification Plan",))
+        self.assertTrue(scan.stopped_early)
+        self.assertEqual(scan.sections, {"## Verification Plan"})
+        self.assertEqual(list(lines), ["never read"])
+
+class TestIncrementalRuns(unittest.TestCase):
+    WALKTHROUGH = "## Changes\n## Verification Results\n" + "word " * 120
+    PLAN = "## Proposed Changes\n## Verification Plan\n" + "word " * 60
+
+    def setUp(self):
+        self.old_cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        for run_id in ("run-1", "run-2"):
+            run_dir = Path("artifacts/history/runs") / run_id
+            run_dir.mkdir(parents=True)
+            (run_dir / "walkthrough.md").write_text(self.WALKTHROUGH, encoding="utf-8")
+            (run_dir / "implementation_plan.md").write_text(self.PLAN, encoding="utf-8")
+        Path("artifacts/history/runs/run-1/closure.json").write_text("{}", encoding="utf-8")
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        self.tmp.cleanup()
+
+    def lint(self, *argv):
+        with contextlib.redirect_stdout(io.StringIO()) as out, contextlib.redirect_stderr(io.StringIO()):
+            rc = content_lint.main(list(argv))
+        return rc, out.getvalue()
+
+    def test_closed_runs_that_passed_are_skipped_until_they_change(self):
+        self.assertEqual(self.lint(), (0, "content_lint: OK\n"))
+        rc, out = self.lint()
+        self.assertEqual(rc, 0)
+        self.assertIn("1 closed run(s) unchanged", out)
+
+        Path("artifacts/history/runs/run-1/walkthrough.md").write_text("too short", encoding="utf-8")
+        rc, out = self.lint()
+        self.assertEqual(rc, 1)
+        self.assertIn("FAIL: artifacts/history/runs/run-1/walkthrough.md:", out)
+
+    def test_all_rechecks_and_since_limits_runs(self):
+        self.lint()
+        walkthrough = Path("artifacts/history/runs/run-1/walkthrough.md")
+        stat = walkthrough.stat()
+        # Same size and mtime: only --all reads the file again.
+        walkthrough.write_text(self.WALKTHROUGH.replace("## Changes", "## Chxnges"), encoding="utf-8")
+        os.utime(walkthrough, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(self.lint()[0], 0)
+        self.assertEqual(self.lint("--all")[0], 1)
+
+        self.assertEqual(self.lint("--since", "run-2")[0], 0)
+        self.assertEqual(self.lint("--since", "run-9")[0], 1)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,113 @@
+import json
+import os
+from pathlib import Path
+
+import cvr_query
+import history_index
+
+
+RECORDS = [
+    {
+        "record_type": "hypothesis",
+        "id": "HYP-0001",
+        "status": "blocked",
+        "summary": "cache stays warm",
+        "claim": "cache stays warm",
+        "timestamp": "2024-01-02_100000",
+        "first_seen_run": "2024-01-02_100000",
+        "last_seen_run": "2024-01-02_100000",
+        "evidence": ["docs/cache.md", "tests/test_cache.py"],
+    },
+    {
+        "record_type": "hypothesis",
+        "id": "HYP-0002",
+        "status": "finished",
+        "summary": "parser is linear",
+        "claim": "parser is linear",
+        "timestamp": "2024-02-10_090000",
+        "first_seen_run": "2024-02-10_090000",
+        "last_seen_run": "2024-02-10_090000",
+        "evidence": ["docs/cache.md"],
+    },
+    {
+        "record_type": "agenda",
+        "id": "AG-000001",
+        "agenda_id": "AG-000001",
+        "hypothesis_id": "HYP-0001",
+        "status": "in-progress",
+        "summary": "unblock cache",
+        "timestamp": "2024-01-02_100000",
+        "first_seen_run": "2024-01-02_100000",
+        "last_seen_run": "2024-01-02_100000",
+        "evidence": [],
+    },
+    {
+        "record_type": "journal",
+        "timestamp": "2024-01-15_120000",
+        "summary": "Journal entry for 2024-01-15_120000",
+        "evidence": ["artifacts/journal/2024-01-15_120000.md"],
+        "agenda_id": "AG-000000",
+        "hypothesis_id": "HYP-0000",
+    },
+]
+
+
+def _write_history(tmp_path, records):
+    path = tmp_path / "artifacts/history/history.ndjson"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(json.dumps(r) + "\n" for r in records), encoding="utf-8")
+    return path
+
+
+def _query(capsys, *argv):
+    assert cvr_query.main(["--json", *argv]) == 0
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_build_index_indexes_every_record_type(tmp_path):
+    db = tmp_path / "history.sqlite"
+    assert history_index.build_index(db, RECORDS) == 4
+
+    with history_index.connect(db) as conn:
+        assert [r["id"] for r in conn.execute("SELECT id FROM hypotheses WHERE status = 'blocked'")] == ["HYP-0001"]
+        assert conn.execute("SELECT hypothesis_id FROM agenda_items").fetchone()[0] == "HYP-0001"
+        assert conn.execute("SELECT path FROM journals").fetchone()[0] == "artifacts/journal/2024-01-15_120000.md"
+        assert conn.execute("SELECT COUNT(*) FROM evidence").fetchone()[0] == 4
+        plan = " ".join(r[-1] for r in conn.execute("EXPLAIN QUERY PLAN SELECT id FROM hypotheses WHERE status = 'x'"))
+    assert "hypotheses_status" in plan
+
+
+def test_query_answers_status_run_range_and_evidence(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    _write_history(tmp_path, RECORDS)
+
+    assert [r["id"] for r in _query(capsys, "hypotheses", "--status", "blocked")] == ["HYP-0001"]
+    assert Path("artifacts/history/history.sqlite").exists()
+    assert [r["run_id"] for r in _query(capsys, "runs", "--since", "2024-01-01", "--until", "2024-01-31")] == [
+        "2024-01-02_100000",
+        "2024-01-15_120000",
+    ]
+    assert [r["id"] for r in _query(capsys, "agenda", "--hypothesis", "HYP-0001")] == ["AG-000001"]
+    assert [r["record_id"] for r in _query(capsys, "evidence", "--path", "docs/cache.md")] == ["HYP-0001", "HYP-0002"]
+
+
+def test_query_rebuilds_stale_index_with_latest_record_state(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    history = _write_history(tmp_path, RECORDS)
+    assert _query(capsys, "hypotheses", "--status", "blocked")
+
+    unblocked = dict(RECORDS[0], status="finished")
+    with open(history, "a", encoding="utf-8") as f:
+        f.write(json.dumps(unblocked) + "\n")
+    st = history.stat()
+    os.utime(history, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert _query(capsys, "hypotheses", "--status", "blocked") == []
+    assert [r["id"] for r in _query(capsys, "hypotheses", "--status", "finished")] == ["HYP-0001", "HYP-0002"]
+
+
+def test_query_reports_missing_history(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+
+    assert cvr_query.main(["hypotheses"]) == 1
+    assert "history log not found" in capsys.readouterr().err
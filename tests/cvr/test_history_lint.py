@@ -0,0 +1,226 @@
+import json
+from pathlib import Path
+
+import history_lint
+
+
+def _record(**overrides):
+  record = {
+    "record_type": "hypothesis",
+    "id": "HYP-0001",
+    "agenda_id": "AG-000001",
+    "hypothesis_id": "HYP-0001",
+    "summary": "Claim",
+    "status": "finished",
+    "timestamp": "run1",
+    "evidence": ["artifacts/history/runs/run1/walkthrough.md"],
+  }
+  record.update(overrides)
+  return record
+
+
+def _write_ndjson(path: Path, records, raw_lines=()):
+  path.parent.mkdir(parents=True, exist_ok=True)
+  lines = [json.dumps(r, sort_keys=True) for r in records] + list(raw_lines)
+  path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_reports_line_numbers(tmp_path):
+  path = tmp_path / "history.ndjson"
+  _write_ndjson(path, [_record()], raw_lines=["", "{bad", json.dumps(_record(summary=""))])
+
+  errors, hyp_ids, agenda_ids = history_lint.lint_ndjson_file(path)
+
+  assert len(errors) == 3
+  assert f"{path}:2: blank line" in errors[0]
+  assert f"{path}:3: invalid JSON" in errors[1]
+  assert f"{path}:4: schema validation failed" in errors[2]
+  assert hyp_ids == {"HYP-0001"}
+  assert agenda_ids == {"AG-000001"}
+
+
+def test_appended_deltas_supersede_earlier_ids(tmp_path):
+  path = tmp_path / "history.ndjson"
+  _write_ndjson(path, [
+    _record(),
+    _record(record_type="agenda", id="AG-000002", agenda_id="AG-000002", hypothesis_id="HYP-0002"),
+    _record(record_type="agenda", id="AG-000002", agenda_id="AG-000002", hypothesis_id="HYP-0003"),
+  ])
+
+  errors, hyp_ids, agenda_ids = history_lint.lint_ndjson_file(path)
+
+  assert errors == []
+  assert hyp_ids == {"HYP-0001", "HYP-0003"}
+  assert agenda_ids == {"AG-000001", "AG-000002"}
+
+
+def test_main_cross_checks_agenda_state(monkeypatch, tmp_path, capsys):
+  monkeypatch.chdir(tmp_path)
+  _write_ndjson(Path("artifacts/history/history.ndjson"), [_record()])
+  state = {
+    "agenda_items": [{"id": "AG-000001", "status": "finished"}],
+    "hypotheses": [],
+  }
+  Path("artifacts/history/agenda_state.json").write_text(json.dumps(state), encoding="utf-8")
+
+  rc = history_lint.main()
+  captured = capsys.readouterr()
+
+  assert rc == 1
+  assert "missing hypotheses entry for HYP-0001" in captured.err
+
+  state["hypotheses"] = [{"id": "HYP-0001", "status": "finished"}]
+  Path("artifacts/history/agenda_state.json").write_text(json.dumps(state), encoding="utf-8")
+
+  assert history_lint.main() == 0
+  assert "history_lint: OK" in capsys.readouterr().out
+
+
+def _count_linted_lines(monkeypatch):
+  linted = []
+  original = history_lint.lint_line
+
+  def counting(path, lineno, line, latest_ids):
+    linted.append(lineno)
+    return original(path, lineno, line, latest_ids)
+
+  monkeypatch.setattr(history_lint, "lint_line", counting)
+  return linted
+
+
+def test_checkpoint_lints_only_the_appended_tail(monkeypatch, tmp_path):
+  path = tmp_path / "history.ndjson"
+  _write_ndjson(path, [_record(), _record(id="HYP-0002", hypothesis_id="HYP-0002", summary="")])
+  linted = _count_linted_lines(monkeypatch)
+  checkpoints = {}
+
+  first = history_lint.lint_ndjson_file(path, checkpoints)
+  with open(path, "a", encoding="utf-8") as f:
+    f.write(json.dumps(_record(id="HYP-0002", hypothesis_id="HYP-0003")) + "\n")
+  linted.clear()
+  second = history_lint.lint_ndjson_file(path, checkpoints)
+
+  assert linted == [3]
+  assert second[0] == first[0]  # the error on line 2 is carried over from the checkpoint
+  assert second == history_lint.lint_ndjson_file(path)
+  assert second[1] == {"HYP-0001", "HYP-0003"}
+
+  linted.clear()
+  assert history_lint.lint_ndjson_file(path, checkpoints) == second
+  assert linted == []
+
+
+def test_checkpoint_falls_back_to_full_lint_when_prefix_changes(monkeypatch, tmp_path):
+  path = tmp_path / "history.ndjson"
+  _write_ndjson(path, [_record(), _record(id="HYP-0002", hypothesis_id="HYP-0002")])
+  checkpoints = {}
+  history_lint.lint_ndjson_file(path, checkpoints)
+
+  _write_ndjson(path, [_record(summary=""), _record(id="HYP-0002", hypothesis_id="HYP-0002"), _record(id="HYP-0003")])
+  linted = _count_linted_lines(monkeypatch)
+  result = history_lint.lint_ndjson_file(path, checkpoints)
+
+  assert linted == [1, 2, 3]
+  assert result == history_lint.lint_ndjson_file(path)
+  assert f"{path}:1: schema validation failed" in result[0][0]
+
+
+def test_checkpoint_excludes_partial_last_line(monkeypatch, tmp_path):
+  path = tmp_path / "history.ndjson"
+  path.write_text(json.dumps(_record()) + "\n{\"record_type\"", encoding="utf-8")
+  checkpoints = {}
+  errors, _, _ = history_lint.lint_ndjson_file(path, checkpoints)
+  assert len(errors) == 1 and ":2: invalid JSON" in errors[0]
+
+  with open(path, "a", encoding="utf-8") as f:
+    f.write(': "journal", "timestamp": "r", "summary": "s", "evidence": ["docs/a.md"]}\n')
+  linted = _count_linted_lines(monkeypatch)
+
+  assert history_lint.lint_ndjson_file(path, checkpoints)[0] == []
+  assert linted == [2]
+
+
+def test_main_persists_checkpoints(monkeypatch, tmp_path, capsys):
+  monkeypatch.chdir(tmp_path)
+  _write_ndjson(Path("artifacts/history/history.ndjson"), [_record()])
+  state = {
+    "agenda_items": [{"id": "AG-000001", "status": "finished"}],
+    "hypotheses": [{"id": "HYP-0001", "status": "finished"}],
+  }
+  Path("artifacts/history/agenda_state.json").write_text(json.dumps(state), encoding="utf-8")
+
+  assert history_lint.main([]) == 0
+  assert Path("artifacts/cache/history_lint.json").exists()
+  linted = _count_linted_lines(monkeypatch)
+  assert history_lint.main([]) == 0
+  assert linted == []
+  assert history_lint.main(["--no-cache"]) == 0
+  assert linted == [1]
+
+
+def test_schema_change_discards_checkpoints(monkeypatch, tmp_path):
+  monkeypatch.chdir(tmp_path)
+  schema_dir = tmp_path / "schemas"
+  schema_dir.mkdir()
+  schema = json.loads((history_lint.schema_validation.SCHEMA_DIR / "history_schema.json").read_text(encoding="utf-8"))
+  (schema_dir / "history_schema.json").write_text(json.dumps(schema), encoding="utf-8")
+  monkeypatch.setattr(history_lint.schema_validation, "SCHEMA_DIR", schema_dir)
+  _write_ndjson(Path("artifacts/history/history.ndjson"), [_record()])
+  state = {
+    "agenda_items": [{"id": "AG-000001", "status": "finished"}],
+    "hypotheses": [{"id": "HYP-0001", "status": "finished"}],
+  }
+  Path("artifacts/history/agenda_state.json").write_text(json.dumps(state), encoding="utf-8")
+
+  assert history_lint.main([]) == 0
+  linted = _count_linted_lines(monkeypatch)
+  assert history_lint.main([]) == 0
+  assert linted == []
+
+  schema["description"] = "edited"
+  (schema_dir / "history_schema.json").write_text(json.dumps(schema), encoding="utf-8")
+  assert history_lint.main([]) == 0
+  assert linted == [1]
+
+
+def test_parallel_lint_matches_serial_output(monkeypatch, tmp_path):
+  path = tmp_path / "history.ndjson"
+  records = [_record(id=f"HYP-{i:04d}", hypothesis_id=f"HYP-{i % 7:04d}") for i in range(60)]
+  records[5] = _record(summary="")
+  records[40] = _record(id="HYP-0003", hypothesis_id="HYP-0099")  # supersedes an earlier record
+  _write_ndjson(path, records, raw_lines=["", "{bad", json.dumps(_record(id="HYP-0001", evidence=["/abs"]))])
+  with open(path, "ab") as f:
+    f.write(b'{"record_type": "journal"}\r\n{"partial": ')
+  monkeypatch.setattr(history_lint, "PARALLEL_MIN_BYTES", 1)
+  pooled = []
+  lint_parallel = history_lint.lint_parallel
+  monkeypatch.setattr(history_lint, "lint_parallel", lambda *args: pooled.append(args[2:4]) or lint_parallel(*args))
+
+  serial_checkpoints, parallel_checkpoints = {}, {}
+  serial = history_lint.lint_ndjson_file(path, serial_checkpoints)
+  parallel = history_lint.lint_ndjson_file(path, parallel_checkpoints, jobs=3)
+
+  assert parallel == serial
+  assert pooled and pooled[0][0] == 0
+  assert parallel_checkpoints == serial_checkpoints
+  assert history_lint.lint_ndjson_file(path, jobs=3) == serial
+
+
+def test_main_lints_large_logs_on_all_cpus_by_default(monkeypatch, tmp_path):
+  monkeypatch.chdir(tmp_path)
+  _write_ndjson(Path("artifacts/history/history.ndjson"), [_record(id=f"HYP-{i:04d}", hypothesis_id="HYP-0001") for i in range(20)])
+  state = {
+    "agenda_items": [{"id": "AG-000001", "status": "finished"}],
+    "hypotheses": [{"id": "HYP-0001", "status": "finished"}],
+  }
+  Path("artifacts/history/agenda_state.json").write_text(json.dumps(state), encoding="utf-8")
+  monkeypatch.setattr(history_lint.os, "cpu_count", lambda: 2)
+  monkeypatch.setattr(history_lint, "PARALLEL_MIN_BYTES", 1)
+  jobs = []
+  lint_parallel = history_lint.lint_parallel
+  monkeypatch.setattr(history_lint, "lint_parallel", lambda *args: jobs.append(args[5]) or lint_parallel(*args))
+
+  assert history_lint.main(["--no-cache"]) == 0
+  assert jobs == [2]
+  assert history_lint.main(["--no-cache", "--jobs", "1"]) == 0
+  assert jobs == [2]
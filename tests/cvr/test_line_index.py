@@ -0,0 +1,101 @@
+import json
+import os
+
+import cvr_show
+import line_index
+
+
+RECORDS = [
+    {"record_type": "hypothesis", "id": "HYP-0001", "status": "blocked", "timestamp": "2024-01-02_100000"},
+    {"record_type": "agenda", "id": "AG-000001", "status": "in-progress", "timestamp": "2024-01-02_100000"},
+    {"record_type": "journal", "timestamp": "2024-01-15_120000", "summary": "Journal ünïcode"},
+    {"record_type": "hypothesis", "id": "HYP-0001", "status": "finished", "timestamp": "2024-01-20_100000"},
+]
+
+
+def _write_history(tmp_path, lines):
+    path = tmp_path / "artifacts/history/history.ndjson"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes("".join(line + "\n" for line in lines).encode("utf-8"))
+    return path
+
+
+def test_index_gives_random_access_by_line_and_key(tmp_path):
+    lines = [json.dumps(r, ensure_ascii=False) for r in RECORDS]
+    path = _write_history(tmp_path, lines[:2] + ["", "not json"] + lines[2:])
+    assert line_index.build_index(path) == 6
+
+    with line_index.open_index(path) as index:
+        assert len(index) == 6
+        assert [index.line(n) for n in range(1, 7)] == lines[:2] + ["", "not json"] + lines[2:]
+        assert index.lookup("hypothesis", "HYP-0001") == 6
+        assert index.lookup("journal", "2024-01-15_120000") == 5
+        assert index.lookup("agenda", "HYP-0001") is None
+        assert index.find("AG-000001") == {"agenda": 2}
+
+
+def test_key_lookups_binary_search_the_mapped_key_table(tmp_path, monkeypatch):
+    records = [{"record_type": rtype, "id": record_id} for record_id in ("HYP-1", "HYP-10", "HYP-2", "ü-1")
+               for rtype in ("hypothesis", "agenda")]
+    path = _write_history(tmp_path, [json.dumps(r) for r in records])
+    line_index.build_index(path)
+    monkeypatch.setattr(line_index.LineIndex, "key_map", None)  # lookups never decode every key
+
+    with line_index.open_index(path) as index:
+        for lineno, record in enumerate(records, 1):
+            assert index.lookup(record["record_type"], record["id"]) == lineno
+        assert index.find("HYP-1") == {"agenda": 2, "hypothesis": 1}
+        assert index.find("ü-1") == {"agenda": 8, "hypothesis": 7}
+        assert index.find("HYP-") == {}
+        assert index.lookup("journal", "HYP-1") is None
+        assert index.lookup("agenda", "zzz") is None
+
+
+def test_index_is_stale_once_the_log_changes(tmp_path):
+    path = _write_history(tmp_path, [json.dumps(RECORDS[0])])
+    line_index.build_index(path)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(RECORDS[1]) + "\n")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert line_index.open_index(path) is None
+    with line_index.ensure_index(path) as index:
+        assert index.lookup("agenda", "AG-000001") == 2
+
+
+def test_builder_matches_a_full_scan(tmp_path):
+    path = tmp_path / "history.ndjson"
+    builder = line_index.IndexBuilder()
+    path.write_text("".join(line + "\n" for line in builder.track(RECORDS[:2])), encoding="utf-8")
+    builder.save(path)
+    sidecar = line_index.index_path_for(path).read_bytes()
+
+    resumed = line_index.IndexBuilder.resume(path)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("".join(line + "\n" for line in resumed.track(RECORDS[2:])))
+    resumed.save(path)
+    appended = line_index.index_path_for(path).read_bytes()
+
+    line_index.build_index(path)
+    assert line_index.index_path_for(path).read_bytes() == appended
+    assert sidecar != appended
+
+
+def test_show_prints_lines_and_latest_records(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    path = _write_history(tmp_path, [json.dumps(r) for r in RECORDS])
+
+    assert cvr_show.main(["2"]) == 0
+    assert json.loads(capsys.readouterr().out) == RECORDS[1]
+    assert cvr_show.main([f"{path}:1"]) == 0
+    assert json.loads(capsys.readouterr().out) == RECORDS[0]
+    assert cvr_show.main(["--id", "HYP-0001"]) == 0
+    captured = capsys.readouterr()
+    assert json.loads(captured.out) == RECORDS[3]
+    assert "history.ndjson:4: hypothesis" in captured.err
+
+    assert cvr_show.main(["9"]) == 1
+    assert "has 4 lines; no line 9" in capsys.readouterr().err
+    assert cvr_show.main(["--id", "HYP-0001", "--type", "agenda"]) == 1
+    assert "no record with id HYP-0001" in capsys.readouterr().err
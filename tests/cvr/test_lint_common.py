@@ -1,3 +1,5 @@
+import os
+import time
 from pathlib import Path
 
 import lint_common
@@ -35,3 +37,115 @@ def test_find_run_artifact(monkeypatch, tmp_path):
   assert found is not None
   assert found.name == "implementation_plan.json"
   assert target.samefile(found)
+
+
+def test_die_records_parsed_diagnostics(capsys):
+  lint_common.DIAGNOSTICS.clear()
+  assert lint_common.die("plan_lint", "runs/r1/implementation_plan.json: bad plan") == 1
+  lint_common.report("history_lint: ERROR: artifacts/history/history.ndjson:12: invalid JSON: x")
+  lint_common.die("agenda_lint", "missing required heading: ## Blockers")
+
+  assert capsys.readouterr().err.splitlines()[0] == "plan_lint: ERROR: runs/r1/implementation_plan.json: bad plan"
+  assert [(d["tool"], d["file"], d["line"]) for d in lint_common.DIAGNOSTICS] == [
+    ("plan_lint", "runs/r1/implementation_plan.json", None),
+    ("history_lint", "artifacts/history/history.ndjson", 12),
+    ("agenda_lint", None, None),
+  ]
+  assert lint_common.DIAGNOSTICS[2]["message"] == "missing required heading: ## Blockers"
+  assert lint_common.parse_diagnostic("agenda_lint: OK") is None
+  lint_common.DIAGNOSTICS.clear()
+
+
+def _age(root, seconds=60):
+  old = time.time() - seconds
+  for directory in [root, *(p for p in root.rglob("*") if p.is_dir())]:
+    os.utime(directory, (old, old))
+
+
+def test_run_artifact_index_orders_by_run_id_and_persists(monkeypatch, tmp_path):
+  runs = tmp_path / "runs"
+  for rel in ["2024-01-02_000000/walkthrough.md", "2024-01-02_000000/sub/walkthrough.md",
+              "2024-01-01_000000/walkthrough.md", "2024-01-01_000000/implementation_plan.json", "walkthrough.md"]:
+    (runs / rel).parent.mkdir(parents=True, exist_ok=True)
+    (runs / rel).write_text("x", encoding="utf-8")
+  _age(runs)
+  cache = tmp_path / "cache.json"
+  monkeypatch.setattr(lint_common, "_run_indexes", {})
+
+  index = lint_common.run_artifact_index(runs, cache)
+  assert index.run_ids() == ["2024-01-01_000000", "2024-01-02_000000"]
+  assert [p.relative_to(runs).as_posix() for p in index.find_all("walkthrough.md")] == [
+    "walkthrough.md", "2024-01-01_000000/walkthrough.md",
+    "2024-01-02_000000/walkthrough.md", "2024-01-02_000000/sub/walkthrough.md",
+  ]
+  assert index.latest("walkthrough.md") == runs / "2024-01-02_000000/walkthrough.md"
+  assert index.latest("implementation_plan.json") == runs / "2024-01-01_000000/implementation_plan.json"
+  assert index.latest("missing.md") is None
+  assert lint_common.run_artifact_index(runs, cache) is index
+
+  # A fresh process reuses the persisted index without walking the tree.
+  monkeypatch.setattr(lint_common, "_run_indexes", {})
+  build = lint_common.RunArtifactIndex.build
+  monkeypatch.setattr(lint_common.RunArtifactIndex, "build", None)
+  assert lint_common.run_artifact_index(runs, cache).files == index.files
+
+  # Adding a run anywhere in the tree makes both copies stale; the in-process copy
+  # is only re-checked on refresh.
+  monkeypatch.setattr(lint_common.RunArtifactIndex, "build", build)
+  (runs / "2024-01-03_000000").mkdir()
+  (runs / "2024-01-03_000000/implementation_plan.json").write_text("{}", encoding="utf-8")
+  memo = lint_common.run_artifact_index(runs, cache)
+  assert memo.latest("implementation_plan.json") == runs / "2024-01-01_000000/implementation_plan.json"
+  latest = lint_common.run_artifact_index(runs, cache, refresh=True).latest("implementation_plan.json")
+  assert latest == runs / "2024-01-03_000000/implementation_plan.json"
+  monkeypatch.setattr(lint_common, "_run_indexes", {})
+  assert lint_common.run_artifact_index(runs, cache).latest("implementation_plan.json") == latest
+
+
+def test_run_artifact_index_walks_a_fresh_tree_once_per_process(monkeypatch, tmp_path):
+  runs = tmp_path / "runs"
+  (runs / "2024-01-01_000000").mkdir(parents=True)
+  (runs / "2024-01-01_000000/walkthrough.md").write_text("x", encoding="utf-8")
+  cache = tmp_path / "cache.json"
+  monkeypatch.setattr(lint_common, "_run_indexes", {})
+  walks = []
+  build = lint_common.RunArtifactIndex.build
+  monkeypatch.setattr(lint_common.RunArtifactIndex, "build", classmethod(lambda cls, root: walks.append(root) or build(root)))
+
+  first = lint_common.run_artifact_index(runs, cache)
+  assert not first.settled()  # just written: too recent to trust from disk
+  assert all(lint_common.run_artifact_index(runs, cache) is first for _ in range(3))
+  assert walks == [runs]
+
+  # Re-walking an unchanged, still unsettled tree does not rewrite the cache.
+  monkeypatch.setattr(lint_common, "_run_indexes", {})
+  monkeypatch.setattr(lint_common.fscache, "save_cache", lambda *a: walks.append("saved"))
+  lint_common.run_artifact_index(runs, cache)
+  assert walks == [runs, runs]
+
+
+def test_path_scanner_reports_every_violation_and_skips_code():
+  text = (
+    "See file://tmp/x and /abs/one\n"
+    "Inline `/abs/in/code` and `file://in/code` ok...\n"
+    "```bash\n"
+    "cat /etc/hosts ...\n"
+    "```\n"
+    "Mention `file://` only; C:\\win\n"
+  )
+  found = [(v.kind, v.line, v.column) for v in lint_common.scan_paths(text)]
+  assert found == [
+    ("file_url", 1, 5),
+    ("absolute_path", 1, 22),
+    ("file_url", 2, 28),
+    ("truncation", 2, 46),
+    ("file_url", 6, 10),
+    ("absolute_path", 6, 25),
+  ]
+  unfiltered = lint_common.scan_paths(text, skip_code=False)
+  assert ("absolute_path", 4, 5) in [(v.kind, v.line, v.column) for v in unfiltered]
+  # A bare or backticked scheme is still a file URL, as with FILE_URL_RE.
+  for bare in ("file://", "see `file://`", "file:// x"):
+    assert lint_common.validate_paths(bare) == lint_common.PATH_MESSAGES["file_url"]
+  assert lint_common.validate_paths("a ... /b") == lint_common.PATH_MESSAGES["absolute_path"]
+  assert lint_common.parse_diagnostic("x_lint: ERROR: a.md:3:7: boom")["column"] == 7
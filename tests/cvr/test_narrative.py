@@ -0,0 +1,75 @@
+import narrative
+import ndjson_io
+
+
+def _expected(journal_dir):
+    """The narrative as originally built: everything joined in memory, then stripped."""
+    if not journal_dir.exists():
+        return ""
+    buffer = [narrative.HEADER]
+    for md_file in sorted(journal_dir.glob("*.md"), reverse=True):
+        buffer.append(f"\n## {md_file.stem}\n\n{md_file.read_text(encoding='utf-8')}\n")
+    return "\n".join(buffer).strip() + "\n"
+
+
+def _render(tmp_path, cache=True):
+    journal_dir = tmp_path / "artifacts/journal"
+    journals = narrative.journal_files(journal_dir) if journal_dir.exists() else None
+    out = tmp_path / "artifacts/history/deep-thoughts.md"
+    cache_path = tmp_path / "artifacts/cache/narrative.json" if cache else None
+    renderer = narrative.NarrativeRenderer(tmp_path, journals, out, cache_path)
+    with ndjson_io.atomic_writer(out) as f:
+        for piece in renderer.pieces():
+            f.write(piece)
+    renderer.save_cache()
+    assert out.read_text(encoding="utf-8") == _expected(journal_dir)
+    return renderer
+
+
+def _journal(tmp_path, name, text):
+    path = tmp_path / "artifacts/journal" / f"{name}.md"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_matches_in_memory_rendering_for_edge_cases(tmp_path):
+    _render(tmp_path)  # no journal directory
+    (tmp_path / "artifacts/journal").mkdir(parents=True)
+    _render(tmp_path)  # empty journal directory
+    _journal(tmp_path, "run-a", "# A\n\ntrailing blanks\n\n\n")
+    _journal(tmp_path, "run-b", "Unicode: café ✓\r\nwindows newline\n")
+    _render(tmp_path)
+
+
+def test_adding_a_journal_reads_only_that_journal(tmp_path):
+    for name in ("run-1", "run-2", "run-3"):
+        _journal(tmp_path, name, f"# {name}\n\nNotes for {name}.\n")
+    assert _render(tmp_path).sections_read == 3
+
+    _journal(tmp_path, "run-4", "# run-4\n\nNewest notes.\n")
+    assert _render(tmp_path).sections_read == 1
+    assert _render(tmp_path).sections_read == 0
+
+
+def test_rerenders_changed_journals_and_moved_final_section(tmp_path):
+    _journal(tmp_path, "run-2", "Second.\n\n")
+    _journal(tmp_path, "run-3", "Third.\n")
+    _render(tmp_path)
+
+    _journal(tmp_path, "run-3", "Third, revised at length.\n")
+    assert _render(tmp_path).sections_read == 1
+
+    # run-1 sorts last, so run-2 is no longer the right-stripped final section.
+    _journal(tmp_path, "run-1", "First.\n")
+    assert _render(tmp_path).sections_read == 2
+
+
+def test_ignores_cache_when_narrative_was_edited(tmp_path):
+    _journal(tmp_path, "run-1", "First.\n")
+    _render(tmp_path)
+    out = tmp_path / "artifacts/history/deep-thoughts.md"
+    out.write_text("hand edited\n", encoding="utf-8")
+
+    assert _render(tmp_path).sections_read == 1
+    assert _render(tmp_path, cache=False).sections_read == 1
@@ -0,0 +1,64 @@
+import json
+from pathlib import Path
+
+import pytest
+
+import ndjson_io
+
+
+def test_iter_lines_numbers_and_strips_terminators(tmp_path):
+    path = tmp_path / "h.ndjson"
+    path.write_bytes(b'{"a":1}\r\n\n{"b":2}')
+
+    assert list(ndjson_io.iter_lines(path)) == [(1, '{"a":1}'), (2, ""), (3, '{"b":2}')]
+
+
+def test_iter_records_skips_blank_and_invalid_lines(tmp_path):
+    path = tmp_path / "h.ndjson"
+    path.write_text('{"a":1}\n\nnot json\n{"b":2}\n', encoding="utf-8")
+
+    assert list(ndjson_io.iter_records(path)) == [{"a": 1}, {"b": 2}]
+    assert list(ndjson_io.iter_records(tmp_path / "missing.ndjson")) == []
+
+
+def test_write_records_is_canonical(tmp_path):
+    path = tmp_path / "out" / "h.ndjson"
+    records = [{"b": 1, "a": [2]}, {"c": "x"}]
+
+    assert ndjson_io.write_records(path, iter(records)) == 2
+    expected = "".join(json.dumps(r, sort_keys=True, separators=(",", ":")) + "\n" for r in records)
+    assert path.read_text(encoding="utf-8") == expected
+
+
+def test_atomic_writer_keeps_original_on_failure(tmp_path):
+    path = tmp_path / "h.ndjson"
+    path.write_text("original\n", encoding="utf-8")
+
+    def lines():
+        yield "partial"
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        ndjson_io.write_lines(path, lines())
+
+    assert path.read_text(encoding="utf-8") == "original\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["h.ndjson"]
+
+
+def test_first_difference_reports_first_mismatching_line(tmp_path):
+    path = tmp_path / "out.md"
+    path.write_text("a\nb\nc\n", encoding="utf-8")
+
+    assert ndjson_io.first_difference(path, ["a\nb", "\nc\n"]) is None
+    assert ndjson_io.first_difference(path, ["a\nX\nc\n"]) == 2
+    assert ndjson_io.first_difference(path, ["a\nb\nc"]) == 3
+    assert ndjson_io.first_difference(path, ["a\nb\nc\nd\n"]) == 4
+    assert ndjson_io.first_difference(path, ["a\n"]) == 2
+
+
+def test_first_difference_treats_missing_file_as_empty(tmp_path):
+    missing = tmp_path / "missing.ndjson"
+
+    assert ndjson_io.first_difference(missing, []) is None
+    assert ndjson_io.first_difference(missing, [""]) is None
+    assert ndjson_io.first_difference(missing, ["x\n"]) == 1
@@ -1,3 +1,4 @@
+import re
 from pathlib import Path
 
 import panic_style_lint
@@ -57,3 +58,52 @@ def test_compliant_workflows(monkeypatch, tmp_path, capsys):
 
   assert rc == 0
   assert "panic_style_lint: OK" in captured.out
+
+
+def test_reports_every_banned_phrase_with_location(monkeypatch, tmp_path, capsys):
+  monkeypatch.chdir(tmp_path)
+  wf_dir = Path(".agent/workflows")
+  wf_dir.mkdir(parents=True)
+  (wf_dir / "plan.md").write_text(
+    "Precondition: establish-intent\nStep one.\nThen PROCEED ANYWAY or skip check.\n", encoding="utf-8"
+  )
+
+  rc = panic_style_lint.main()
+  err = capsys.readouterr().err.splitlines()
+
+  assert rc == 1
+  assert err == [
+    "panic_style_lint: ERROR: .agent/workflows/plan.md:3:6: contains banned phrase 'proceed anyway' matching /\\bproceed anyway\\b/",
+    "panic_style_lint: ERROR: .agent/workflows/plan.md:3:24: contains banned phrase 'skip check' matching /\\bskip (the )?check\\b/",
+    "panic_style_lint: ERROR: .agent/workflows/plan.md: missing canonical intent question text",
+  ]
+
+
+def test_compiled_alternation_matches_where_any_pattern_does():
+  patterns = [r"\bab|cd", r"\bx?yz\b", r"\bask.*ok\b", r"\ba[bc]d\b", r"no-boundary", r"\b(ef|gh)\b"]
+  combined = panic_style_lint.compile_banned(patterns)
+  text = "cd ab yz xyz ask me ok acd no-boundary gh zab"
+  expected = sorted({m.start() for p in patterns for m in re.finditer(p, text)})
+  starts = []
+  pos = 0
+  while (m := combined.search(text, pos)) is not None:
+    starts.append(m.start())
+    pos = m.start() + 1
+  assert starts == expected
+
+
+def test_overlapping_banned_phrases_match_the_per_pattern_loop():
+  lines = [
+    "Ask them to override the gitignore; it is blocked by gitignore.",
+    "Options: override, override, or proceed anyway after gitignore blocks.",
+    "nothing to see here",
+  ]
+  for line in lines:
+    low = line.lower()
+    expected = sorted(
+      ((m.start() + 1, pattern, m.group()) for pattern in panic_style_lint.BANNED for m in re.finditer(pattern, low)),
+      key=lambda hit: (hit[0], panic_style_lint.BANNED.index(hit[1])),
+    )
+    assert list(panic_style_lint.find_banned(line)) == expected
+  reported = {pattern for _, pattern, _ in panic_style_lint.find_banned(lines[0])}
+  assert {r"\boverride\b", r"\boverride.*gitignore\b", r"\bask.*override.*gitignore\b"} <= reported
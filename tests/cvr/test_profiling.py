@@ -0,0 +1,72 @@
+import pstats
+import sys
+import tracemalloc
+
+import pytest
+
+from tools.cvr import profiling
+
+
+def test_parse_modes():
+    assert profiling.parse_modes(None) == frozenset()
+    assert profiling.parse_modes("0") == frozenset()
+    assert profiling.parse_modes("1") == {"cpu"}
+    assert profiling.parse_modes("mem, cpu") == {"cpu", "mem"}
+    with pytest.raises(ValueError, match="bogus"):
+        profiling.parse_modes("cpu,bogus")
+
+
+def test_take_flag_removes_profile_arguments():
+    argv = ["tool.py", "--profile", "--run-id", "r1", "--profile=mem"]
+    assert profiling.take_flag(argv) == "mem"
+    assert argv == ["tool.py", "--run-id", "r1"]
+    assert profiling.take_flag(argv) is None
+
+
+def test_profile_writes_pstats_snapshot_and_summary(tmp_path, capsys):
+    def busy():
+        return sorted(str(i) for i in range(5000))
+
+    with profiling.profile("demo", {"cpu", "mem"}, out_dir=tmp_path):
+        busy()
+
+    (pstats_file,) = tmp_path.glob("demo-*.pstats")
+    stats = pstats.Stats(str(pstats_file))
+    assert any(func[2] == "busy" for func in stats.stats)
+    (snapshot_file,) = tmp_path.glob("demo-*.tracemalloc")
+    assert tracemalloc.Snapshot.load(str(snapshot_file)).traces is not None
+    summary = next(tmp_path.glob("demo-*.txt")).read_text(encoding="utf-8")
+    assert "top 25 by cumulative time" in summary and "busy" in summary
+    assert "peak traced memory" in summary
+    assert not tracemalloc.is_tracing()
+    assert "profiling: wrote" in capsys.readouterr().err
+
+
+def test_profile_is_a_no_op_when_off_and_does_not_nest(tmp_path, monkeypatch):
+    monkeypatch.delenv(profiling.ENV, raising=False)
+    with profiling.profile("off", out_dir=tmp_path):
+        pass
+    assert list(tmp_path.iterdir()) == []
+
+    with profiling.profile("outer", {"cpu"}, out_dir=tmp_path):
+        with profiling.profile("inner", {"cpu"}, out_dir=tmp_path):
+            pass
+    assert [p.suffix for p in tmp_path.glob("inner-*")] == []
+    assert sorted(p.suffix for p in tmp_path.glob("outer-*")) == [".pstats", ".txt"]
+
+
+def test_run_main_honors_flag_and_environment(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling.paths, "PROFILE_DIR", tmp_path)
+    seen = []
+    monkeypatch.setattr(sys, "argv", ["tool.py", "--profile", "x"])
+    assert profiling.run_main("flagged", lambda: seen.append(list(sys.argv)) or 0) == 0
+    assert seen == [["tool.py", "x"]]
+    assert list(tmp_path.glob("flagged-*.pstats"))
+
+    monkeypatch.setattr(sys, "argv", ["tool.py"])
+    monkeypatch.setenv(profiling.ENV, "mem")
+    assert profiling.run_main("env", lambda: 3) == 3
+    assert list(tmp_path.glob("env-*.tracemalloc")) and not list(tmp_path.glob("env-*.pstats"))
+
+    monkeypatch.setenv(profiling.ENV, "nope")
+    assert profiling.run_main("bad", lambda: 0) == 2
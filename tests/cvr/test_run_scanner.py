@@ -0,0 +1,75 @@
+import os
+
+import run_scanner
+
+
+def test_scan_collects_all_fields_in_one_pass():
+    scan = run_scanner.scan_text(
+        "# Walkthrough\n"
+        "Run ID: 2024-01-01_120000-HYP-0003\n"
+        "Hypothesis: Caching speeds things up\n"
+        "- HYP-0002 - second claim\n"
+        "HYP-0001: first claim\n"
+        "Status: finished\n"
+        "See [log](artifacts/logs/run.log) and tools/cvr/journal.py\n"
+        "## Lessons Learned\n"
+        "- Measure first\n"
+        "### More lessons\n"
+        "- Cache carefully\n"
+        "## Next\n"
+        "- not a lesson\n"
+    )
+
+    assert scan.hyp_ids == ["HYP-0003", "HYP-0002", "HYP-0001"]
+    assert scan.id_claims == {"HYP-0002": "second claim", "HYP-0001": "first claim"}
+    assert scan.hypothesis == "Caching speeds things up"
+    assert scan.hypothesis_line == "Caching speeds things up"
+    assert scan.status == "finished"
+    assert scan.run_id == "2024-01-01_120000-HYP-0003"
+    assert scan.evidence == ["artifacts/logs/run.log", "artifacts/logs/run.log", "tools/cvr/journal.py"]
+    assert scan.lessons == ["Measure first", "Cache carefully"]
+
+
+def test_values_may_follow_on_the_next_line():
+    scan = run_scanner.scan_text("Hypothesis:\n\n  Claim below\nStatus:\n  blocked\n")
+
+    assert scan.hypothesis_line == ""
+    assert scan.hypothesis == "Claim below"
+    assert scan.status == "blocked"
+
+
+def test_run_id_may_follow_on_the_next_line():
+    scan = run_scanner.scan_text("Run ID:\n\n  2024-01-01_120000-HYP-0003\nRun ID: 2025-01-01_000000\n")
+
+    assert scan.run_id == "2024-01-01_120000-HYP-0003"
+
+
+def test_links_may_wrap_across_lines():
+    scan = run_scanner.scan_text(
+        "See the [full\nlog](artifacts/logs/run.log) and [a\n"
+        "report](artifacts/runs/r/post_verify_report.md), [not] a link\n"
+        "and [an](artifacts/x.md) [unclosed\n"
+    )
+
+    assert scan.evidence == [
+        "artifacts/logs/run.log",
+        "artifacts/logs/run.log",
+        "artifacts/runs/r/post_verify_report.md",
+        "artifacts/runs/r/post_verify_report.md",
+        "artifacts/x.md",
+        "artifacts/x.md",
+    ]
+
+
+def test_scan_file_reads_each_file_once(tmp_path):
+    path = tmp_path / "walkthrough.md"
+    path.write_text("## Lessons\n- one\n", encoding="utf-8")
+
+    first = run_scanner.scan_file(path)
+    assert run_scanner.scan_file(path) is first
+    assert first.lessons == ["one"]
+
+    path.write_text("## Lessons\n- one\n- two\n", encoding="utf-8")
+    os.utime(path, ns=(1, 1))
+    assert run_scanner.scan_file(path).lessons == ["one", "two"]
+    assert run_scanner.scan_file(tmp_path / "missing.md") is None
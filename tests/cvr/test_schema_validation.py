@@ -0,0 +1,122 @@
+import copy
+import json
+import random
+
+import jsonschema
+import pytest
+
+import schema_validation
+
+
+def _reference_message(name, instance):
+  try:
+    jsonschema.validate(instance=instance, schema=schema_validation.load_schema(name))
+  except jsonschema.ValidationError as exc:
+    return exc.message
+  return None
+
+
+HISTORY = {
+  "record_type": "hypothesis",
+  "id": "HYP-0001",
+  "hypothesis_id": "HYP-0001",
+  "agenda_id": "AG-000001",
+  "status": "finished",
+  "timestamp": "run1",
+  "summary": "ok",
+  "evidence": ["docs/a.md"],
+}
+
+PLAN = {
+  "meta": {"version": "1.0", "generated_at": "now", "operating_mode": "full-execution"},
+  "relevant_lessons": ["None."],
+  "items": [
+    {
+      "id": "HYP-0001",
+      "status": "proposed",
+      "hypothesis": "A sufficiently long hypothesis",
+      "scope": {"components": ["core"], "files": []},
+      "invariants": ["always"],
+      "tasks": [{"step": 1, "description": "do", "done_definition": "done"}],
+      "tests": {"unit": [], "integration": [], "build": []},
+      "evidence": {"required_artifacts": ["docs/a.md"]},
+    }
+  ],
+}
+
+ODD_VALUES = [None, True, 0, 1.5, -1, "", "x", "HYP-12", "AG-000001\n", [], ["x"], [1], {}, {"a": 1}]
+
+
+def _paths(obj, prefix=()):
+  yield prefix
+  if isinstance(obj, dict):
+    for key, value in obj.items():
+      yield from _paths(value, prefix + (key,))
+  elif isinstance(obj, list):
+    for idx, value in enumerate(obj):
+      yield from _paths(value, prefix + (idx,))
+
+
+def _mutations(base, rng, count):
+  locations = [p for p in _paths(base) if p]
+  for _ in range(count):
+    doc = copy.deepcopy(base)
+    loc = rng.choice(locations)
+    parent = doc
+    for step in loc[:-1]:
+      parent = parent[step]
+    action = rng.random()
+    if action < 0.2 and isinstance(parent, dict):
+      del parent[loc[-1]]
+    elif action < 0.3 and isinstance(parent, dict):
+      parent["unexpected"] = 1
+    else:
+      parent[loc[-1]] = copy.deepcopy(rng.choice(ODD_VALUES))
+    yield doc
+
+
+@pytest.mark.parametrize("name,base", [("history_schema.json", HISTORY), ("plan_schema.json", PLAN)])
+def test_messages_match_jsonschema_validate(name, base):
+  assert schema_validation.fast_path_for(name) is not None
+  rng = random.Random(0)
+  instances = [base, [], "x", None] + list(_mutations(base, rng, 150))
+  for instance in instances:
+    assert schema_validation.error_message(name, instance) == _reference_message(name, instance), json.dumps(instance)
+
+
+def test_fast_path_is_conservative_about_unsupported_keywords():
+  assert schema_validation.compile_predicate({"type": "object", "oneOf": [{}]}) is None
+  assert schema_validation.compile_predicate({"type": ["string", "null"]}) is None
+  predicate = schema_validation.compile_predicate({"type": "integer", "minimum": 1})
+  assert predicate(1) and predicate(2.0)
+  assert not predicate(True) and not predicate(0) and not predicate("1")
+
+
+@pytest.mark.parametrize("schema", [
+  {"properties": {"a": {"enum": ["x", "y"]}}},
+  {"type": "integer", "enum": ["x"]},
+  {"type": "object", "properties": {"a": {"type": "number", "enum": ["1"]}}},
+])
+def test_enum_fast_path_never_accepts_what_jsonschema_rejects(schema):
+  predicate = schema_validation.compile_predicate(schema)
+  assert predicate is not None
+  validator = jsonschema.validators.validator_for(schema)(schema)
+  for instance in ({"a": 5}, {"a": "x"}, {"a": "z"}, {"a": [1]}, {"a": True}, 3, "x", True, [], {}):
+    if predicate(instance):
+      assert validator.is_valid(instance), (schema, instance)
+
+
+def test_non_string_enum_falls_back_to_jsonschema():
+  assert schema_validation.compile_predicate({"enum": [1, "x"]}) is None
+  assert schema_validation.compile_predicate({"properties": {"a": {"enum": [[1]]}}}) is None
+
+
+def test_schemas_are_loaded_and_compiled_once():
+  assert schema_validation.load_schema("plan_schema.json") is schema_validation.load_schema("plan_schema.json")
+  assert schema_validation.validator_for("plan_schema.json") is schema_validation.validator_for("plan_schema.json")
+
+
+def test_generated_fast_path_is_plain_python():
+  source = schema_validation.generate_source(schema_validation.load_schema("history_schema.json"))
+  assert source.startswith("def validate(v0):")
+  assert "'record_type' not in v0" in source
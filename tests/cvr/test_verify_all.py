@@ -0,0 +1,242 @@
+import json
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+import verify_all
+from tools.cvr.bench import workspace
+
+
+def _log(name):
+    return Path(f"artifacts/logs/{name}.log").read_text(encoding="utf-8")
+
+
+def test_runs_linters_in_process_with_shell_log_format(tmp_path, monkeypatch, capsys):
+    workspace.generate(tmp_path, runs=3)
+    monkeypatch.chdir(tmp_path)
+
+    steps = [verify_all.linter("agenda_lint"), verify_all.linter("journal_lint")]
+    assert verify_all.run_all(steps) == 0
+
+    out = capsys.readouterr().out.splitlines()
+    ts = out[0].rsplit(" @ ", 1)[1]
+    assert out == [
+        f"==> agenda_lint @ {ts}",
+        "+ python3 tools/cvr/linters/agenda_lint.py",
+        "==> OK: agenda_lint",
+        f"==> journal_lint @ {ts}",
+        "+ python3 tools/cvr/linters/journal_lint.py",
+        "==> OK: journal_lint",
+        "verify_all: tools/test.sh not present/executable; skipping project tests",
+        "verify_all: OK",
+    ]
+    log = _log("agenda_lint").splitlines()
+    assert log[:2] == out[:2] and log[-1] == "==> OK: agenda_lint"
+    assert "agenda_lint: OK" in log
+
+
+def test_first_failing_step_stops_the_run_with_its_status(tmp_path, monkeypatch, capsys):
+    workspace.generate(tmp_path, runs=2)
+    monkeypatch.chdir(tmp_path)
+    Path("AGENDA.md").unlink()
+
+    steps = [verify_all.linter("agenda_lint"), verify_all.linter("journal_lint")]
+    assert verify_all.run_all(steps) == 1
+
+    out = capsys.readouterr().out
+    assert "==> OK: agenda_lint" not in out and "journal_lint" not in out
+    assert "AGENDA.md" in _log("agenda_lint")
+    assert "==> OK" not in _log("agenda_lint")
+    assert not Path("artifacts/logs/journal_lint.log").exists()
+
+
+def test_external_commands_and_skipped_steps(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    steps = [
+        verify_all.Step("skipped", (sys.executable, "-c", "raise SystemExit(9)"), when=lambda: False),
+        verify_all.Step("external", (sys.executable, "-c", "print('from child'); raise SystemExit(3)")),
+    ]
+
+    assert verify_all.run_all(steps) == 3
+    assert "from child" in _log("external")
+    assert not Path("artifacts/logs/skipped.log").exists()
+
+
+def test_structured_results_resolve_rules_and_survive_replay(tmp_path, monkeypatch, capsys):
+    workspace.generate(tmp_path, runs=2)
+    monkeypatch.chdir(tmp_path)
+    Path("AGENDA.md").write_text("# Agenda\n", encoding="utf-8")
+    steps = [
+        verify_all.linter("journal_lint"),
+        verify_all.linter("agenda_lint"),
+        verify_all.Step("external", (sys.executable, "-c", "print('shell_tool: ERROR: a/b.txt:7: broken')")),
+    ]
+
+    assert verify_all.run_all(steps, output_format="json") == 1
+    doc = json.loads(Path("artifacts/logs/verify_results.json").read_text(encoding="utf-8"))
+    assert doc["status"] == 1
+    assert [s["name"] for s in doc["steps"]] == ["journal_lint", "agenda_lint"]
+    journal, agenda = doc["steps"]
+    assert journal["status"] == 0 and journal["diagnostics"] == []
+    assert journal["wall_s"] > 0 and journal["cpu_s"] >= 0
+    (diagnostic,) = agenda["diagnostics"][:1]
+    assert diagnostic["tool"] == "agenda_lint"
+    assert diagnostic["rule_id"] == "AGENDA_MISSING_HEADING"
+    assert diagnostic["message"].startswith("missing required heading")
+
+    # Replayed results carry the same diagnostics.
+    assert verify_all.run_all(steps, output_format="sarif") == 1
+    sarif = json.loads(Path("artifacts/logs/verify_results.sarif").read_text(encoding="utf-8"))
+    assert sarif["version"] == "2.1.0"
+    run = sarif["runs"][1]
+    assert run["tool"]["driver"]["name"] == "agenda_lint"
+    assert run["invocations"][0]["properties"]["replayed"] is True
+    assert run["results"][0]["ruleId"] == "AGENDA_MISSING_HEADING"
+
+
+def test_failing_external_command_diagnostics_come_from_its_output(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    steps = [
+        verify_all.Step("external", (sys.executable, "-c", "print('shell_tool: ERROR: a/b.txt:7: broken'); raise SystemExit(2)")),
+        verify_all.Step("silent", (sys.executable, "-c", "raise SystemExit(3)")),
+    ]
+    assert verify_all.run_all(steps[:1], output_format="sarif", output=Path("out.sarif")) == 2
+    (result,) = json.loads(Path("out.sarif").read_text(encoding="utf-8"))["runs"][0]["results"]
+    assert result["ruleId"] == "shell_tool.unmatched"
+    assert result["message"]["text"] == "a/b.txt:7: broken"
+    assert result["locations"][0]["physicalLocation"] == {"artifactLocation": {"uri": "a/b.txt"}, "region": {"startLine": 7}}
+
+    assert verify_all.run_all(steps[1:], output_format="json") == 3
+    (step,) = json.loads(Path("artifacts/logs/verify_results.json").read_text(encoding="utf-8"))["steps"]
+    assert step["diagnostics"][0]["message"] == "exited with status 3"
+
+
+def test_parallel_run_prints_the_same_blocks_in_step_order(tmp_path, monkeypatch, capsys):
+    workspace.generate(tmp_path, runs=3)
+    monkeypatch.chdir(tmp_path)
+    slow = "import time; time.sleep(0.3); print('slow done')"
+    steps = [
+        verify_all.Step("slow", (sys.executable, "-c", slow)),
+        verify_all.linter("agenda_lint"),
+        verify_all.linter("journal_lint"),
+        verify_all.linter("history_lint", main_args=(), after=("agenda_lint", "journal_lint")),
+    ]
+
+    assert verify_all.run_all(steps, jobs=1) == 0
+    sequential = capsys.readouterr()
+    assert verify_all.run_all(steps, jobs=3) == 0
+    parallel = capsys.readouterr()
+
+    stamp = re.compile(r" @ \S+")
+    assert stamp.sub("", parallel.out) == stamp.sub("", sequential.out)
+    assert "slow done" in _log("slow")
+    assert "critical path" in parallel.err and "with 3 job(s)" in parallel.err
+
+
+def test_parallel_failure_stops_output_and_dependents(tmp_path, monkeypatch, capsys):
+    workspace.generate(tmp_path, runs=2)
+    monkeypatch.chdir(tmp_path)
+    Path("AGENDA.md").unlink()
+    steps = [
+        verify_all.linter("journal_lint"),
+        verify_all.linter("agenda_lint"),
+        verify_all.linter("history_lint", main_args=(), after=("agenda_lint",)),
+    ]
+
+    assert verify_all.run_all(steps, jobs=2) == 1
+    out = capsys.readouterr().out
+    assert "==> OK: journal_lint" in out and "==> agenda_lint" in out
+    assert "history_lint" not in out
+    assert not Path("artifacts/logs/history_lint.log").exists()
+
+
+def test_critical_path_follows_the_slowest_dependency_chain():
+    steps = [
+        verify_all.Step("a", ("a",)),
+        verify_all.Step("b", ("b",)),
+        verify_all.Step("c", ("c",), after=("a", "b")),
+        verify_all.Step("d", ("d",)),
+    ]
+    durations = {"a": 1.0, "b": 2.0, "c": 0.5, "d": 2.2}
+
+    assert verify_all.critical_path(steps, durations) == (2.5, ["b", "c"])
+    with pytest.raises(ValueError, match="step c must come after its dependency a"):
+        verify_all.check_order(steps[2:] + steps[:2])
+
+
+def test_unchanged_inputs_replay_the_cached_result(tmp_path, monkeypatch, capsys):
+    import agenda_lint
+
+    workspace.generate(tmp_path, runs=2)
+    monkeypatch.chdir(tmp_path)
+    steps = [verify_all.linter("agenda_lint")]
+    assert verify_all.run_all(steps) == 0
+    first_log = _log("agenda_lint")
+    capsys.readouterr()
+
+    monkeypatch.setattr(agenda_lint, "main", lambda: 5)
+    assert verify_all.run_all(steps) == 0
+    assert "(1 cached)" in capsys.readouterr().err
+    assert _log("agenda_lint") == first_log
+    assert verify_all.run_all(steps, use_cache=False) == 5
+
+    Path("AGENDA.md").write_text("# Agenda\n", encoding="utf-8")
+    monkeypatch.undo()
+    monkeypatch.chdir(tmp_path)
+    assert verify_all.run_all(steps) == 1
+    failure_log = _log("agenda_lint")
+    assert "missing required heading" in failure_log
+    assert verify_all.run_all(steps) == 1
+    assert "(1 cached)" in capsys.readouterr().err
+    assert _log("agenda_lint") == failure_log
+
+
+def test_declared_inputs_are_read_without_importing(tmp_path):
+    source = tmp_path / "demo_lint.py"
+    source.write_text('import does_not_exist\nINPUTS = ("AGENDA.md", "docs/*.md")\n', encoding="utf-8")
+
+    assert verify_all.declared_inputs(source) == ("AGENDA.md", "docs/*.md")
+    assert verify_all.declared_inputs(tmp_path / "missing.py") is None
+    for step in verify_all.STEPS:
+        if step.module:
+            assert verify_all.declared_inputs(verify_all.LINTERS_DIR / f"{step.module}.py"), step.name
+
+
+def test_watcher_maps_changed_paths_to_linters(tmp_path, monkeypatch):
+    workspace.generate(tmp_path, runs=2)
+    monkeypatch.chdir(tmp_path)
+    watcher = verify_all.Watcher(verify_all.STEPS)
+    assert watcher.poll() == ([], [])
+
+    with open("AGENDA.md", "a", encoding="utf-8") as f:
+        f.write("\n")
+    changed, affected = watcher.poll()
+    assert changed == ["AGENDA.md"]
+    assert [s.name for s in affected] == ["template_baseline_lint", "agenda_lint", "post_verify_lint"]
+
+    Path("artifacts/journal/new.md").write_text("x\n", encoding="utf-8")
+    run = Path("artifacts/history/runs/2030-01-01_000000")
+    run.mkdir()
+    (run / "walkthrough.md").write_text("x\n", encoding="utf-8")
+    changed, affected = watcher.poll()
+    assert changed == [
+        "artifacts/history/runs/2030-01-01_000000",
+        "artifacts/history/runs/2030-01-01_000000/walkthrough.md",
+        "artifacts/journal/new.md",
+    ]
+    assert [s.name for s in affected] == ["walkthrough_lint", "run_artifacts_lint", "journal_lint", "content_lint"]
+
+    Path("artifacts/journal/new.md").unlink()
+    assert [s.name for s in watcher.poll()[1]] == ["journal_lint"]
+
+
+def test_glob_regex_follows_path_glob_semantics():
+    pattern = verify_all.glob_regex("artifacts/history/runs/**/walkthrough.md")
+    assert pattern.match("artifacts/history/runs/walkthrough.md")
+    assert pattern.match("artifacts/history/runs/a/b/walkthrough.md")
+    assert not pattern.match("artifacts/history/runs/a/walkthrough.md.bak")
+    assert not verify_all.glob_regex("*.metadata.json").match("runs/x.metadata.json")
+    assert verify_all.static_root("artifacts/history/runs/*/walkthrough.md") == ("artifacts/history/runs", True)
+    assert verify_all.static_root("AGENDA.md") == (".", False)
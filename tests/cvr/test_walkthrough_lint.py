@@ -41,6 +41,17 @@ def test_walkthrough_path_bans(monkeypatch, tmp_path, capsys):
 
   assert rc == 1
   assert "walkthrough contains file:// URLs" in captured.err
+  errors = captured.err.splitlines()
+  assert len(errors) == 3
+  assert errors[1].endswith("walkthrough.md:3:1: walkthrough contains an absolute path; use repo-relative paths only")
+  assert "walkthrough.md:4:1: walkthrough contains '...'" in errors[2]
+
+
+def test_walkthrough_allows_paths_in_code(monkeypatch, tmp_path, capsys):
+  monkeypatch.chdir(tmp_path)
+  _write_run_walkthrough(tmp_path, "# WT\nRan `ls /tmp`\n```\n/abs/path ...\n```\n")
+
+  assert walkthrough_lint.main() == 0
 
 
 def test_walkthrough_banned_brain(monkeypatch, tmp_path, capsys):
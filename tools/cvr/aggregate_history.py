@@ -1,5 +1,9 @@
 #!/usr/bin/env python3
 import argparse
+import concurrent.futures
+import functools
+import hashlib
+import itertools
 import json
 import os
 import re
@@ -9,12 +13,24 @@ from typing import Dict, Iterable, List, Optional, Tuple
 
 # Import canonical paths - scripts run from repo root
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
-from tools.cvr import paths
+from tools.cvr import fscache, history_index, history_log, line_index, narrative, ndjson_io, paths, profiling, run_scanner
 
 DEFAULT_HISTORY_PATH = paths.HISTORY_NDJSON
 DEEP_THOUGHTS_PATH = paths.DEEP_THOUGHTS
 
-HEADER = "# Deep Thoughts: A Journal Timeline\n\n*(Reverse chronological order)*\n"
+# Per-run artifacts that feed collect_hypotheses(); their fingerprints key the run cache.
+RUN_ARTIFACTS = ("implementation_plan.json", "walkthrough.md", "post_verify_report.md")
+# Bump whenever the run parsers change so stale cached records are discarded.
+RUN_CACHE_VERSION = 2
+# Below this many runs to parse, process-pool startup costs more than it saves.
+PARALLEL_MIN_RUNS = 8
+# Bump whenever render_run_row() output changes so cached history.md rows are discarded.
+ROW_CACHE_VERSION = 1
+EVIDENCE_LINK_CACHE_SIZE = 1 << 16
+# In --append mode, compact automatically once superseded lines outnumber live records.
+COMPACT_RATIO = 1.0
+
+HEADER = narrative.HEADER
 
 
 def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
@@ -36,21 +52,55 @@ def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
         action="store_true",
         help="Do not write files; exit with non-zero status if output would change",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-parse every run directory and journal instead of reusing the caches under artifacts/cache/",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--append",
+        action="store_true",
+        help=(
+            "Append only new or changed records to the history log instead of rewriting it "
+            "(journals whose source disappears stay in the log until the next --compact or full run)"
+        ),
+    )
+    mode.add_argument(
+        "--compact",
+        action="store_true",
+        help=(
+            "Rewrite the history log as the canonical snapshot a full run would write, "
+            "folding appended delta records, and exit"
+        ),
+    )
+    parser.add_argument(
+        "--index",
+        action="store_true",
+        help="Also rebuild the SQLite query index next to the history log (see cvr_query.py)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=positive_int,
+        default=os.cpu_count() or 1,
+        help=(
+            "Worker processes used to parse run directories (default: CPU count; "
+            f"fewer than {PARALLEL_MIN_RUNS} changed runs are always parsed in this process)"
+        ),
+    )
     return parser.parse_args(argv)
 
 
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be >= 1")
+    return number
+
+
 def load_history(path: Path) -> List[Dict]:
-    if not path.exists():
-        return []
-    records: List[Dict] = []
-    for line in path.read_text(encoding="utf-8").splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        try:
-            records.append(json.loads(line))
-        except json.JSONDecodeError:
-            continue  # best effort
+    """Load the latest state of every record, resolving appended deltas."""
+    records, _ = history_log.load_resolved(path)
     return records
 
 
@@ -89,22 +139,19 @@ def normalize_evidence_entry(entry: str, repo_root: Path) -> Optional[str]:
     return f"{normalized}{anchor}"
 
 
-def extract_repo_paths_from_text(text: str, repo_root: Path) -> List[str]:
+def normalize_evidence_entries(entries: Iterable[str], repo_root: Path) -> List[str]:
     candidates = set()
-    link_pattern = re.compile(r"\[[^\]]*\]\(([^)]+)\)")
-    for match in link_pattern.finditer(text):
-        normalized = normalize_evidence_entry(match.group(1), repo_root)
-        if normalized:
-            candidates.add(normalized)
-
-    inline_pattern = re.compile(r"\b((?:docs|artifacts|tests|tools|src)/[^\s)]+)")
-    for match in inline_pattern.finditer(text):
-        normalized = normalize_evidence_entry(match.group(1), repo_root)
+    for entry in entries:
+        normalized = normalize_evidence_entry(entry, repo_root)
         if normalized:
             candidates.add(normalized)
     return sorted(candidates)
 
 
+def extract_repo_paths_from_text(text: str, repo_root: Path) -> List[str]:
+    return normalize_evidence_entries(run_scanner.scan_text(text).evidence, repo_root)
+
+
 def pick_first_seen(existing: Optional[str], new: Optional[str]) -> Optional[str]:
     if not existing or existing == "unknown":
         return new
@@ -214,93 +261,135 @@ def parse_plan(run_dir: Path, repo_root: Path) -> List[Dict]:
     return records
 
 
-def parse_id_claim_pairs_from_lines(lines: List[str]) -> Dict[str, str]:
-    pairs: Dict[str, str] = {}
-    pattern = re.compile(r"\b(HYP-[0-9]{4,})\b[^\n]*?[\:\-\u2013]\s*(.+)")
-    for line in lines:
-        match = pattern.search(line)
-        if match:
-            pairs[match.group(1)] = match.group(2).strip()
-    return pairs
-
-
 def parse_walkthrough(run_dir: Path, repo_root: Path) -> List[Dict]:
-    walkthrough_path = run_dir / "walkthrough.md"
-    if not walkthrough_path.exists():
-        return []
-    text = walkthrough_path.read_text(encoding="utf-8")
-    ids = sorted(set(re.findall(r"HYP-[0-9]{4,}", text)))
-    if not ids:
+    scan = run_scanner.scan_file(run_dir / "walkthrough.md")
+    if scan is None or not scan.hyp_ids:
         return []
-    lines = text.splitlines()
-    id_claim_map = parse_id_claim_pairs_from_lines(lines)
-    fallback_claim = None
-    for line in lines:
-        if "Hypothesis:" in line:
-            fallback_claim = line.split("Hypothesis:", 1)[1].strip()
-            break
-
-    evidence = extract_repo_paths_from_text(text, repo_root)
+    evidence = normalize_evidence_entries(scan.evidence, repo_root)
     run_name = run_dir.name
     records = []
-    for hyp_id in ids:
-        claim = id_claim_map.get(hyp_id, fallback_claim)
+    for hyp_id in sorted(scan.hyp_ids):
+        claim = scan.id_claims.get(hyp_id, scan.hypothesis_line)
         records.append(make_hypothesis_record(hyp_id, claim, None, run_name, evidence))
     return records
 
 
 def parse_post_verify_report(run_dir: Path, repo_root: Path) -> List[Dict]:
-    report_path = run_dir / "post_verify_report.md"
-    if not report_path.exists():
+    scan = run_scanner.scan_file(run_dir / "post_verify_report.md")
+    if scan is None:
         return []
-    text = report_path.read_text(encoding="utf-8")
     run_name = run_dir.name
 
-    # Match both old and new run ID formats:
-    # Old: YYYY-MM-DD_HHMMSS or YYYY-MM-DD_HHMMSS-HYP-####
-    # New: YYYY-MM-DD-HH-MM-SS or YYYY-MM-DD-HH-MM-SS-HYP-####
-    run_match = re.search(
-        r"Run ID:\s*([0-9]{4}-[0-9]{2}-[0-9]{2}[-_][0-9]{2}[-:]?[0-9]{2}[-:]?[0-9]{2}(?:-[A-Z]+-[0-9]{4,})?)",
-        text
-    )
     hyp_id = None
-    if run_match:
-        run_id = run_match.group(1)
-        # Extract hypothesis ID if present (works for both formats)
-        if "-HYP-" in run_id or "_HYP-" in run_id:
+    if scan.run_id:
+        # Extract hypothesis ID if present (works for both run ID formats)
+        if "-HYP-" in scan.run_id or "_HYP-" in scan.run_id:
             # Split on either - or _ before HYP
-            parts = re.split(r"[-_](?=HYP-)", run_id, maxsplit=1)
+            parts = re.split(r"[-_](?=HYP-)", scan.run_id, maxsplit=1)
             if len(parts) == 2:
                 hyp_id = parts[1]
-    if hyp_id is None:
-        m = re.search(r"(HYP-[0-9]{4,})", text)
-        if m:
-            hyp_id = m.group(1)
+    if hyp_id is None and scan.hyp_ids:
+        hyp_id = scan.hyp_ids[0]
     if hyp_id is None:
         return []
 
-    claim_match = re.search(r"Hypothesis:\s*(.+)", text)
-    claim = claim_match.group(1).strip() if claim_match else None
-    status_match = re.search(r"Status:\s*([A-Za-z\-]+)", text)
-    status = status_match.group(1).strip() if status_match else None
-    evidence = extract_repo_paths_from_text(text, repo_root)
-    return [make_hypothesis_record(hyp_id, claim, status, run_name, evidence)]
+    evidence = normalize_evidence_entries(scan.evidence, repo_root)
+    return [make_hypothesis_record(hyp_id, scan.hypothesis, scan.status, run_name, evidence)]
+
+
+def parse_run_dir(run_dir: Path, repo_root: Path) -> List[Dict]:
+    updates: List[Dict] = []
+    updates.extend(parse_plan(run_dir, repo_root))
+    updates.extend(parse_walkthrough(run_dir, repo_root))
+    updates.extend(parse_post_verify_report(run_dir, repo_root))
+    return updates
+
+
+def fingerprint_run(run_dir: Path, previous: Optional[Dict] = None) -> Dict[str, Optional[Dict]]:
+    previous = previous or {}
+    return {name: fscache.file_fingerprint(run_dir / name, previous.get(name)) for name in RUN_ARTIFACTS}
+
+
+def run_unchanged(cached: Dict[str, Optional[Dict]], current: Dict[str, Optional[Dict]]) -> bool:
+    return all(fscache.same_content(cached.get(name), current.get(name)) for name in RUN_ARTIFACTS)
+
+
+def parse_run_dirs(run_dirs: List[Path], repo_root: Path, jobs: int = 1) -> List[List[Dict]]:
+    """Parse run directories, fanning out to a process pool when worthwhile.
+
+    Results are returned in the order of ``run_dirs`` regardless of completion order.
+    """
+    if jobs <= 1 or len(run_dirs) < PARALLEL_MIN_RUNS:
+        return [parse_run_dir(run_dir, repo_root) for run_dir in run_dirs]
+    workers = min(jobs, len(run_dirs))
+    chunksize = max(1, len(run_dirs) // (workers * 4))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(parse_run_dir, run_dirs, itertools.repeat(repo_root), chunksize=chunksize))
+
 
+def load_run_cache(cache_path: Path, repo_root: Path) -> Dict:
+    data = fscache.load_cache(cache_path, RUN_CACHE_VERSION)
+    if data.get("repo_root") != str(repo_root):
+        return {}
+    return data.get("runs", {})
 
-def collect_hypotheses(runs_dir: Path, repo_root: Path) -> List[Dict]:
+
+def save_run_cache(cache_path: Path, repo_root: Path, runs: Dict) -> None:
+    fscache.save_cache(cache_path, RUN_CACHE_VERSION, {"repo_root": str(repo_root), "runs": runs})
+
+
+def load_row_cache(cache_path: Path, repo_root: Path, history_dir: Path) -> Dict[str, str]:
+    data = fscache.load_cache(cache_path, ROW_CACHE_VERSION)
+    if data.get("repo_root") != str(repo_root) or data.get("history_dir") != str(history_dir):
+        return {}
+    return data.get("rows", {})
+
+
+def save_row_cache(cache_path: Path, repo_root: Path, history_dir: Path, rows: Dict[str, str]) -> None:
+    fscache.save_cache(
+        cache_path, ROW_CACHE_VERSION, {"repo_root": str(repo_root), "history_dir": str(history_dir), "rows": rows}
+    )
+
+
+def collect_hypotheses(
+    runs_dir: Path, repo_root: Path, cache: Optional[Dict] = None, jobs: int = 1
+) -> List[Dict]:
+    """Merge hypothesis records from every run directory in sorted order.
+
+    ``cache`` maps run names to {"artifacts": fingerprints, "records": updates}.
+    Runs whose artifacts are unchanged are merged straight from it; the mapping is
+    rewritten in place to describe exactly the runs seen on this pass. Changed runs
+    are parsed on up to ``jobs`` processes and merged in sorted run order.
+    """
     records: Dict[str, Dict] = {}
     if not runs_dir.exists():
+        if cache is not None:
+            cache.clear()
         return []
-    for run_dir in sorted(p for p in runs_dir.iterdir() if p.is_dir()):
-        updates: List[Dict] = []
-        updates.extend(parse_plan(run_dir, repo_root))
-        updates.extend(parse_walkthrough(run_dir, repo_root))
-        updates.extend(parse_post_verify_report(run_dir, repo_root))
+    previous = cache or {}
+    run_dirs = sorted(p for p in runs_dir.iterdir() if p.is_dir())
+    fingerprints = {}
+    stale: List[Path] = []
+    for run_dir in run_dirs:
+        cached = previous.get(run_dir.name)
+        fingerprints[run_dir.name] = fingerprint_run(run_dir, cached.get("artifacts") if cached else None)
+        if not (cached and run_unchanged(cached.get("artifacts", {}), fingerprints[run_dir.name])):
+            stale.append(run_dir)
+    parsed = dict(zip((d.name for d in stale), parse_run_dirs(stale, repo_root, jobs)))
+
+    fresh: Dict[str, Dict] = {}
+    for run_dir in run_dirs:
+        name = run_dir.name
+        updates = parsed[name] if name in parsed else previous[name].get("records", [])
+        fresh[name] = {"artifacts": fingerprints[name], "records": updates}
         for rec in updates:
             hyp_id = rec.get("id")
             if not hyp_id:
                 continue
             records[hyp_id] = merge_hypothesis_records(records.get(hyp_id), rec)
+    if cache is not None:
+        cache.clear()
+        cache.update(fresh)
     return list(records.values())
 
 
@@ -343,25 +432,22 @@ def collect_agenda_records(agenda_path: Path, repo_root: Path) -> List[Dict]:
     return records
 
 
-def collect_journal_entries(repo_root: Path) -> Tuple[List[Dict], str]:
-    journal_dir = repo_root / "artifacts/journal"
+def collect_journal_entries(repo_root: Path) -> Tuple[List[Dict], Optional[List[Path]]]:
+    """Build journal records and list the journals for the narrative.
+
+    Journal content is not read here; see narrative.NarrativeRenderer. Returns
+    None instead of a file list when there is no journal directory.
+    """
+    journal_dir = repo_root / paths.JOURNAL_DIR
     if not journal_dir.exists():
-        return [], ""
+        return [], None
 
     records: List[Dict] = []
-    narrative_buffer: List[str] = [HEADER]
-    
     # Sort reverse-chrono for narrative
-    files = sorted(journal_dir.glob("*.md"), reverse=True)
-    
+    files = narrative.journal_files(journal_dir)
+
     for md_file in files:
         run_id = md_file.stem
-        content = md_file.read_text(encoding="utf-8")
-        
-        # 1. Add to narrative
-        narrative_buffer.append(f"\n## {run_id}\n\n{content}\n")
-        
-        # 2. Add to history records
         # Use filename as evidence
         rel_path = md_file.relative_to(repo_root).as_posix()
         summary = f"Journal entry for {run_id}"
@@ -376,7 +462,7 @@ def collect_journal_entries(repo_root: Path) -> Tuple[List[Dict], str]:
             "hypothesis_id": "HYP-0000"
         })
         
-    return records, "\n".join(narrative_buffer).strip() + "\n"
+    return records, files
 
 
 def merge_agenda_records(existing: Optional[Dict], new: Dict) -> Dict:
@@ -422,32 +508,70 @@ def merge_records(existing: List[Dict], new: List[Dict]) -> List[Dict]:
     )
 
 
-def main(argv: Optional[List[str]] = None) -> int:
-    args = parse_args(argv)
-    repo_root = Path.cwd()
-    history_path = args.output
-    narrative_path = args.narrative
+def describe_record(record: Dict) -> str:
+    ident = record.get("id") or record.get("timestamp") or "?"
+    return f"expected {record.get('record_type', 'record')} {ident}"
 
-    existing = load_history(history_path)
-    runs_dir = repo_root / paths.RUNS_DIR
-    
-    hyp_records = collect_hypotheses(runs_dir, repo_root)
-    agenda_records = collect_agenda_records(repo_root / paths.AGENDA_STATE, repo_root)
-    journal_records, narrative_text = collect_journal_entries(repo_root)
 
-    # Filter out existing journals from history so we can regenerate them fully
-    # (Journal entries are immutable per run ID, so we can just replace them)
-    existing_without_journals = [r for r in existing if r.get("record_type") != "journal"]
-    
-    # Merge existing (hyp/agenda) with new (hyp/agenda)
-    merged_core = merge_records(existing_without_journals, hyp_records + agenda_records)
-    
-    # Append journals (sorted by timestamp)
-    final_records = merged_core + journal_records
-    # Sort final records for output
-    final_records.sort(key=lambda r: r.get("timestamp", ""))
+def describe_existing_line(history_path: Path, lineno: int, expected: Optional[Dict] = None) -> str:
+    """What the current history log holds at ``lineno``, via its line index (empty if unavailable).
 
-    # Generate history.md content
+    When that is the ``expected`` record with other content, names the first
+    field (in sorted order) that differs instead of repeating the id.
+    """
+    index = line_index.open_index(history_path)
+    if index is None:
+        return ""
+    with index:
+        if lineno > len(index):
+            return ", found end of file"
+        try:
+            record = json.loads(index.line(lineno))
+        except ValueError:
+            return ", found invalid JSON"
+    if not isinstance(record, dict):
+        return ", found invalid JSON"
+    if expected is not None and history_log.record_key(record) == history_log.record_key(expected):
+        field = next((k for k in sorted(set(record) | set(expected)) if record.get(k) != expected.get(k)), None)
+        if field is None:
+            return ", found it with the same fields in a non-canonical encoding"
+        return f", found it with a different {field!r}"
+    ident = record.get("id") or record.get("timestamp") or "?"
+    return f", found {record.get('record_type', 'record')} {ident}"
+
+
+@functools.lru_cache(maxsize=EVIDENCE_LINK_CACHE_SIZE)
+def evidence_link(ev: str, repo_root: Path, history_dir: Path) -> str:
+    """Markdown link from artifacts/history/ to an evidence path."""
+    # Calculate relative path from artifacts/history/ to the evidence
+    try:
+        rel_ev = os.path.relpath(repo_root / ev, history_dir)
+    except Exception:
+        rel_ev = ev
+    return f"[{Path(ev).name}]({rel_ev})"
+
+
+def render_run_row(run_ts: str, run_info: Dict, repo_root: Path, history_dir: Path) -> str:
+    evidence_str = ", ".join(evidence_link(ev, repo_root, history_dir) for ev in run_info["evidence"])
+    safe_summary = run_info['summary'].replace("|", "\\|")
+    return f"| {run_ts} | {run_ts} | {run_info['status'].upper()} | {safe_summary} | {evidence_str} |"
+
+
+def row_key(run_ts: str, run_info: Dict) -> str:
+    """Fingerprint of everything a history.md row is rendered from."""
+    parts = [run_ts, run_info["status"], run_info["summary"], *run_info["evidence"]]
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def render_history_md(
+    final_records: List[Dict], repo_root: Path, history_dir: Path, row_cache: Optional[Dict[str, str]] = None
+) -> List[str]:
+    """Render the lines of history.md (without trailing newlines).
+
+    ``row_cache`` maps row fingerprints to rendered rows. Rows found there are
+    reused as-is; the mapping is rewritten in place to hold exactly the rows of
+    this table.
+    """
     history_lines = [
         "# Execution History",
         "",
@@ -472,74 +596,147 @@ def main(argv: Optional[List[str]] = None) -> int:
         elif rec.get("record_type") == "journal":
             runs_seen[ts]["evidence"].update(rec.get("evidence", []))
 
-    history_md_path = repo_root / paths.HISTORY_MD
-    history_dir = history_md_path.parent
-
+    previous = dict(row_cache) if row_cache else {}
+    if row_cache is not None:
+        row_cache.clear()
     for run_ts in sorted(runs_seen.keys()):
         run_info = runs_seen[run_ts]
-        
-        evidence_links = []
-        for ev in sorted(run_info["evidence"]):
-            # Calculate relative path from artifacts/history/ to the evidence
-            try:
-                ev_path = repo_root / ev
-                rel_ev = os.path.relpath(ev_path, history_dir)
-            except Exception:
-                rel_ev = ev
-            
-            name = Path(ev).name
-            evidence_links.append(f"[{name}]({rel_ev})")
-        
-        evidence_str = ", ".join(evidence_links)
-        safe_summary = run_info['summary'].replace("|", "\\|")
-        
-        history_lines.append(
-            f"| {run_ts} | {run_ts} | {run_info['status'].upper()} | {safe_summary} | {evidence_str} |"
-        )
+        run_info["evidence"] = sorted(run_info["evidence"])
+        if row_cache is None:
+            history_lines.append(render_run_row(run_ts, run_info, repo_root, history_dir))
+            continue
+        key = row_key(run_ts, run_info)
+        row = previous.get(key)
+        if row is None:
+            row = render_run_row(run_ts, run_info, repo_root, history_dir)
+        row_cache[key] = row
+        history_lines.append(row)
 
-    history_md_text = "\n".join(history_lines).strip() + "\n"
-    output_lines = [json.dumps(rec, sort_keys=True, separators=(",", ":")) for rec in final_records]
-    output_text = "\n".join(output_lines)
-    if output_lines:
-        output_text += "\n"
+    return history_lines
 
-    history_md_path = repo_root / paths.HISTORY_MD
+
+def write_index(history_path: Path, records: Optional[List[Dict]] = None) -> None:
+    """Rebuild the SQLite index from ``records`` (or the resolved history log)."""
+    if records is None:
+        records, _ = history_log.load_resolved(history_path)
+    index_path = history_index.index_path_for(history_path)
+    count = history_index.build_index(index_path, records, history_path)
+    print(f"Indexed {count} records in {index_path}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    repo_root = Path.cwd()
+    history_path = args.output
+    narrative_path = args.narrative
+
+    existing, superseded = history_log.load_resolved(history_path)
+    runs_dir = repo_root / paths.RUNS_DIR
+    cache_path = repo_root / paths.AGGREGATE_RUN_CACHE
+
+    run_cache = None if args.no_cache else load_run_cache(cache_path, repo_root)
+    hyp_records = collect_hypotheses(runs_dir, repo_root, run_cache, args.jobs)
+    agenda_records = collect_agenda_records(repo_root / paths.AGENDA_STATE, repo_root)
+    journal_records, journal_files = collect_journal_entries(repo_root)
+    narrative_cache = None if args.no_cache else repo_root / paths.NARRATIVE_CACHE
+    renderer = narrative.NarrativeRenderer(repo_root, journal_files, narrative_path, narrative_cache)
+
+    # Filter out existing journals from history so we can regenerate them fully
+    # (Journal entries are immutable per run ID, so we can just replace them)
+    existing_without_journals = [r for r in existing if r.get("record_type") != "journal"]
     
-    if args.check:
-        fail = False
-        if history_path.exists():
-            if history_path.read_text(encoding="utf-8") != output_text:
-                fail = True
-        elif output_lines:
-            fail = True
-            
-        if narrative_path.exists():
-            if narrative_path.read_text(encoding="utf-8") != narrative_text:
-                fail = True
-        elif narrative_text:
-            fail = True
-
-        if history_md_path.exists():
-            if history_md_path.read_text(encoding="utf-8") != history_md_text:
-                fail = True
-        elif history_md_text:
-            fail = True
-            
-        return 1 if fail else 0
-
-    history_path.parent.mkdir(parents=True, exist_ok=True)
-    history_path.write_text(output_text, encoding="utf-8")
+    # Merge existing (hyp/agenda) with new (hyp/agenda)
+    merged_core = merge_records(existing_without_journals, hyp_records + agenda_records)
     
-    narrative_path.parent.mkdir(parents=True, exist_ok=True)
-    narrative_path.write_text(narrative_text, encoding="utf-8")
+    # Append journals, then order everything by timestamp
+    final_records = history_log.canonical_order(merged_core + journal_records)
+
+    if args.compact:
+        # Rebuild from the freshly aggregated records, not just the resolved log,
+        # so records whose sources are gone drop out exactly as in a full run.
+        if args.check:
+            snapshot = (f"{ndjson_io.dumps(rec)}\n" for rec in final_records)
+            return 0 if ndjson_io.first_difference(history_path, snapshot) is None else 1
+        builder = line_index.IndexBuilder()
+        count = ndjson_io.write_lines(history_path, builder.track(final_records))
+        builder.save(history_path)
+        if run_cache is not None:
+            save_run_cache(cache_path, repo_root, run_cache)
+        print(f"Compacted {history_path} to {count} records")
+        if args.index:
+            write_index(history_path, final_records)
+        return 0
+
+    deltas = history_log.compute_deltas(existing, final_records) if args.append else []
+    if args.append and not args.check and superseded + len(deltas) > COMPACT_RATIO * len(final_records):
+        args.append = False  # the log has grown enough; write a compacted snapshot instead
 
-    history_md_path.write_text(history_md_text, encoding="utf-8")
+    history_md_path = repo_root / paths.HISTORY_MD
+    row_cache_path = repo_root / paths.HISTORY_ROW_CACHE
+    row_cache = None if args.no_cache else load_row_cache(row_cache_path, repo_root, history_md_path.parent)
+    cached_rows = set(row_cache or ())
+    history_md_lines = render_history_md(final_records, repo_root, history_md_path.parent, row_cache)
+
+    if args.check:
+        if deltas:
+            print(
+                f"aggregate_history: {history_path} is out of date; "
+                f"{len(deltas)} record(s) to append, first {describe_record(deltas[0])}",
+                file=sys.stderr,
+            )
+            return 1
+        outputs = [
+            (narrative_path, renderer.pieces()),
+            (history_md_path, (f"{line}\n" for line in history_md_lines)),
+        ]
+        if not args.append:
+            outputs.insert(0, (history_path, (f"{ndjson_io.dumps(rec)}\n" for rec in final_records)))
+        for path, chunks in outputs:
+            lineno = ndjson_io.first_difference(path, chunks)
+            if lineno is None:
+                continue
+            detail = ""
+            if path == history_path and lineno <= len(final_records):
+                detail = f" ({describe_record(final_records[lineno - 1])}{describe_existing_line(path, lineno, final_records[lineno - 1])})"
+            print(f"aggregate_history: {path} is out of date; first difference at line {lineno}{detail}", file=sys.stderr)
+            return 1
+        return 0
+
+    if args.append:
+        if deltas:
+            # Extend the line index with the appended lines rather than rescanning the log.
+            builder = line_index.IndexBuilder.resume(history_path)
+            history_log.append_records(history_path, deltas)
+            if builder is None:
+                line_index.build_index(history_path)
+            else:
+                for rec in deltas:
+                    builder.add(rec)
+                builder.save(history_path)
+        record_count = len(deltas)
+    else:
+        builder = line_index.IndexBuilder()
+        record_count = ndjson_io.write_lines(history_path, builder.track(final_records))
+        builder.save(history_path)
+    with ndjson_io.atomic_writer(narrative_path) as f:
+        for piece in renderer.pieces():
+            f.write(piece)
+    renderer.save_cache()
+    ndjson_io.write_lines(history_md_path, history_md_lines)
+
+    if run_cache is not None:
+        save_run_cache(cache_path, repo_root, run_cache)
+    if row_cache is not None and set(row_cache) != cached_rows:
+        save_row_cache(row_cache_path, repo_root, history_md_path.parent, row_cache)
+    if args.index:
+        write_index(history_path, final_records)
     
-    print(f"Wrote {len(output_lines)} records to {history_path}")
+    verb = "Appended" if args.append else "Wrote"
+    print(f"{verb} {record_count} records to {history_path}")
     print(f"Wrote narrative to {narrative_path}")
     print(f"Wrote history index to {history_md_path}")
     return 0
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(profiling.run_main("aggregate_history", main))
@@ -0,0 +1,45 @@
+"""Count files a benchmarked Python process reads (loaded via PYTHONPATH by run_bench.py).
+
+Every Python process started under the benchmark imports this module at startup.
+An audit hook records each distinct non-source file opened for reading under
+$CVR_BENCH_ROOT. At exit the process appends its count to $CVR_BENCH_AUDIT_LOG.
+Nothing happens when those variables are unset.
+"""
+
+import atexit
+import os
+import sys
+
+_LOG = os.environ.get("CVR_BENCH_AUDIT_LOG")
+_ROOT = os.environ.get("CVR_BENCH_ROOT")
+_WRITE_FLAGS = os.O_WRONLY | os.O_RDWR
+_SOURCE_SUFFIXES = (".py", ".pyc")
+
+if _LOG and _ROOT:
+    _root = os.path.join(os.path.abspath(_ROOT), "")
+    _seen = set()
+    _done = False
+
+    def _hook(event, args):
+        if event != "open" or _done:
+            return
+        path, mode, flags = args
+        if path is None or isinstance(path, int):
+            return
+        if mode is not None:
+            if any(c in mode for c in "wax+"):
+                return
+        elif flags & _WRITE_FLAGS:
+            return
+        path = os.path.abspath(os.fsdecode(path))
+        if path.startswith(_root) and not path.endswith(_SOURCE_SUFFIXES):
+            _seen.add(path)
+
+    def _flush():
+        global _done
+        _done = True
+        with open(_LOG, "a", encoding="utf-8") as f:
+            f.write(f"{len(_seen)}\n")
+
+    sys.addaudithook(_hook)
+    atexit.register(_flush)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""Scale benchmarks for the CVR tools.
+
+For each scale point, generates a synthetic workspace (see workspace.py) and runs
+each tool in it as a subprocess. For every tool it records:
+
+  wall_s       wall-clock seconds
+  max_rss_kb   peak resident set size of the tool and its waited-for children (os.wait4)
+  files_read   distinct non-source files opened for reading by Python processes
+               (an audit hook loaded through bench/audit/sitecustomize.py)
+  returncode   so a tool that falls over at scale is visible, not silently fast
+
+Usage:
+  python3 tools/cvr/bench/run_bench.py --scales 1000,10000 [--tools aggregate_history,history_lint]
+  python3 tools/cvr/bench/run_bench.py --baseline old.json   # exit 1 on regressions
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Import canonical paths - scripts run from repo root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
+from tools.cvr import paths
+from tools.cvr.bench import workspace
+
+BENCH_DIR = Path(__file__).resolve().parent
+AUDIT_DIR = BENCH_DIR / "audit"
+DEFAULT_OUTPUT = paths.TEST_RESULTS_DIR / "bench.json"
+DEFAULT_SCALES = "100,1000"
+
+# Run in this order against one workspace per scale. Each command runs with the
+# workspace as cwd; "tools/..." resolves through the links made by link_repo().
+TOOLS = {
+    "aggregate_history": ["python3", "tools/cvr/aggregate_history.py"],
+    "aggregate_history_warm": ["python3", "tools/cvr/aggregate_history.py"],
+    "history_lint": ["python3", "tools/cvr/linters/history_lint.py"],
+    "content_lint": ["python3", "tools/cvr/linters/content_lint.py"],
+    "verify_all": ["bash", "tools/verify_all.sh"],
+    "close_run": ["python3", "tools/cvr/close_run.py"],
+}
+# Metrics compared against --baseline; a rise beyond the tolerance is a regression.
+COMPARED_METRICS = ("wall_s", "max_rss_kb", "files_read")
+
+
+def parse_list(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def measure(argv: List[str], cwd: Path, log_path: Path) -> Dict:
+    """Run one command to completion and return its resource usage."""
+    audit_log = log_path.with_suffix(".audit")
+    audit_log.unlink(missing_ok=True)
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(AUDIT_DIR), env.get("PYTHONPATH")]))
+    env["CVR_BENCH_ROOT"] = str(cwd)
+    env["CVR_BENCH_AUDIT_LOG"] = str(audit_log)
+
+    with open(log_path, "wb") as log:
+        start = time.perf_counter()
+        proc = subprocess.Popen(argv, cwd=cwd, env=env, stdout=log, stderr=subprocess.STDOUT)
+        _, status, usage = os.wait4(proc.pid, 0)
+        wall = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+
+    files_read = 0
+    if audit_log.exists():
+        files_read = sum(int(line) for line in audit_log.read_text(encoding="utf-8").split())
+    return {
+        "wall_s": round(wall, 4),
+        "max_rss_kb": usage.ru_maxrss,
+        "files_read": files_read,
+        "returncode": proc.returncode,
+    }
+
+
+def bench_scale(runs: int, tools: List[str], workdir: Path, seed: int) -> List[Dict]:
+    root = workdir / f"runs-{runs}"
+    if root.exists():
+        shutil.rmtree(root)
+    root.mkdir(parents=True)
+    start = time.perf_counter()
+    workspace.generate(root, runs, seed)
+    workspace.link_repo(root)
+    print(f"[{runs} runs] generated workspace in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+    logs = workdir / "logs"
+    logs.mkdir(exist_ok=True)
+    results = []
+    for name in tools:
+        result = {"scale": runs, "tool": name}
+        result.update(measure(TOOLS[name], root, logs / f"{runs}-{name}.log"))
+        results.append(result)
+        print(
+            f"[{runs} runs] {name}: {result['wall_s']:.3f}s, {result['max_rss_kb']} KB, "
+            f"{result['files_read']} files, exit {result['returncode']}",
+            file=sys.stderr,
+        )
+    return results
+
+
+def find_regressions(results: List[Dict], baseline: List[Dict], tolerance: float) -> List[str]:
+    previous = {(r["scale"], r["tool"]): r for r in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get((result["scale"], result["tool"]))
+        if not before:
+            continue
+        for metric in COMPARED_METRICS:
+            if before.get(metric) and result[metric] > before[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{result['tool']} @ {result['scale']} runs: {metric} {before[metric]} -> {result[metric]}"
+                )
+    return regressions
+
+
+def format_table(results: List[Dict]) -> str:
+    rows = [("scale", "tool", "wall_s", "max_rss_kb", "files_read", "exit")]
+    rows += [
+        (str(r["scale"]), r["tool"], f"{r['wall_s']:.3f}", str(r["max_rss_kb"]), str(r["files_read"]), str(r["returncode"]))
+        for r in results
+    ]
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return "\n".join("  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() for row in rows)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark CVR tools on synthetic workspaces.")
+    parser.add_argument("--scales", default=DEFAULT_SCALES, help=f"Comma-separated run counts (default: {DEFAULT_SCALES})")
+    parser.add_argument("--tools", default=",".join(TOOLS), help="Comma-separated tools to run (default: all)")
+    parser.add_argument("--seed", type=int, default=0, help="Workspace generator seed (default: 0)")
+    parser.add_argument("--workdir", type=Path, help="Where to build workspaces (default: a temp dir, removed afterwards)")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="Results JSON (default: %(default)s)")
+    parser.add_argument("--baseline", type=Path, help="Earlier results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative increase vs baseline (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    tools = parse_list(args.tools)
+    unknown = [t for t in tools if t not in TOOLS]
+    if unknown:
+        print(f"run_bench: ERROR: unknown tool(s): {', '.join(unknown)}", file=sys.stderr)
+        return 1
+    scales = [int(s) for s in parse_list(args.scales)]
+
+    workdir = args.workdir or Path(tempfile.mkdtemp(prefix="cvr-bench-"))
+    try:
+        results = []
+        for runs in scales:
+            results.extend(bench_scale(runs, tools, workdir, args.seed))
+    finally:
+        if args.workdir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    print(format_table(results))
+    print(f"Wrote {len(results)} results to {args.output}")
+
+    if args.baseline:
+        regressions = find_regressions(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+        for line in regressions:
+            print(f"run_bench: REGRESSION: {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""Deterministic synthetic workspace generator for CVR scale benchmarks.
+
+Generates a workspace shaped like a long-lived ADK repo: N run directories
+(implementation plans, walkthroughs, post-verify reports), one journal per run,
+a large AGENDA.md and agenda_state.json, and a big agent_activity.jsonl. The
+same (runs, seed) always yields byte-identical files, so timings from different
+commits are comparable.
+
+Usage:
+  python3 tools/cvr/bench/workspace.py <dest> --runs 1000 [--seed 0] [--link-repo]
+"""
+
+import argparse
+import datetime
+import json
+import random
+import sys
+from pathlib import Path
+from typing import Optional
+
+# Import canonical paths - scripts run from repo root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
+from tools.cvr import paths
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+BASE_TIME = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+# Hypotheses recur across runs (one per RUNS_PER_HYPOTHESIS runs) so merging is exercised.
+RUNS_PER_HYPOTHESIS = 4
+ACTIVITY_LINES_PER_RUN = 10
+STATUSES = ("finished", "in-progress", "blocked", "not-started")
+WORDS = (
+    "cache invariant journal evidence ledger parser verify hypothesis agenda snapshot "
+    "regression latency throughput artifact workspace schema record stream index "
+    "compaction fingerprint determinism boundary fallback budget profile baseline"
+).split()
+# Top-level repo entries that are generated rather than linked by --link-repo.
+GENERATED_ENTRIES = {"artifacts", "AGENDA.md", ".git", "requests.jsonl"}
+
+
+def run_id(index: int) -> str:
+    return (BASE_TIME + datetime.timedelta(minutes=17 * index)).strftime("%Y-%m-%d_%H%M%S")
+
+
+def hypothesis_id(index: int) -> str:
+    return f"HYP-{index // RUNS_PER_HYPOTHESIS + 1:04d}"
+
+
+def prose(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+
+
+def write_run(root: Path, index: int, rng: random.Random) -> None:
+    name = run_id(index)
+    hyp = hypothesis_id(index)
+    run_dir = root / paths.RUNS_DIR / name
+    rel = (paths.RUNS_DIR / name).as_posix()
+    claim = prose(rng, 8)
+    status = rng.choice(STATUSES)
+
+    plan = {
+        "meta": {"version": "1.0", "generated_at": name, "operating_mode": "full-execution"},
+        "relevant_lessons": ["None."],
+        "items": [
+            {
+                "id": hyp,
+                "status": "proposed",
+                "hypothesis": claim,
+                "scope": {"components": ["core"], "files": [f"src/module_{index % 97}.py"]},
+                "invariants": [prose(rng, 6)],
+                "tasks": [{"step": 1, "description": prose(rng, 6), "done_definition": prose(rng, 4)}],
+                "tests": {"unit": ["tests/test_core.py"], "integration": [], "build": []},
+                "evidence": {"required_artifacts": [f"{rel}/walkthrough.md"]},
+            }
+        ],
+    }
+    write(run_dir / "implementation_plan.json", json.dumps(plan, indent=2) + "\n")
+    write(
+        run_dir / "implementation_plan.md",
+        f"# Implementation Plan\n\n## Proposed Changes\n\n{prose(rng, 60)}\n\n"
+        f"## Verification Plan\n\n{prose(rng, 30)}\n",
+    )
+    lessons = "\n".join(f"- {prose(rng, 10)}" for _ in range(3))
+    write(
+        run_dir / "walkthrough.md",
+        f"# Walkthrough\n\nHypothesis: {claim}\n\n{hyp}: {claim}\n\n## Changes\n\n{prose(rng, 80)}\n\n"
+        f"```\n{prose(rng, 20)}\n```\n\n## Verification Results\n\n{prose(rng, 60)}\n"
+        f"Evidence: [log]({rel}/post_verify_report.md) and artifacts/logs/verify_{index}.log\n\n"
+        f"## Lessons Learned\n\n{lessons}\n",
+    )
+    write(
+        run_dir / "post_verify_report.md",
+        f"# Post-Verify Report\n\nRun ID: {name}\nStatus: {status}\n\n## Completed items\n\n- {hyp}\n\n"
+        f"## Items still open\n\n- None.\n\n## Evidence\n\n- {rel}/walkthrough.md\n",
+    )
+    write(
+        root / paths.JOURNAL_DIR / f"{name}.md",
+        "### Deep Thoughts, by an Agent\n\n"
+        + "\n\n".join(prose(rng, 40) for _ in range(3))
+        + "\n\n*Editor’s note: This entry is a dramatized reconstruction of a deterministic decision "
+        "process, derived from run artifacts.*\n",
+    )
+
+
+def write_agenda(root: Path, items: int, hypothesis_count: int, rng: random.Random) -> None:
+    blocks = ["# Agenda\n\n**Status**: Active\n\n## Active Hypotheses\n"]
+    state = []
+    for index in range(items):
+        hyp = f"HYP-{index + 1:04d}"
+        status = rng.choice(STATUSES)
+        summary = prose(rng, 8)
+        evidence = f"{paths.RUNS_DIR.as_posix()}/{run_id(index * RUNS_PER_HYPOTHESIS)}/walkthrough.md"
+        blocks.append(f"- [ ] {hyp}: {summary}\n  - Status: {status}\n  - Evidence: {evidence}\n")
+        state.append(
+            {
+                "id": f"AG-{index + 1:06d}",
+                "hypothesis_id": hyp,
+                "summary": summary,
+                "status": status,
+                "first_seen_run": run_id(index * RUNS_PER_HYPOTHESIS),
+                "last_seen_run": run_id(index * RUNS_PER_HYPOTHESIS),
+                "evidence": [evidence],
+            }
+        )
+    blocks.append("## Blockers\n\n- None.\n")
+    blocks.append("## Deferred Risks\n\n- None.\n")
+    write(root / "AGENDA.md", "\n".join(blocks))
+    hypotheses = [
+        {"id": f"HYP-{n + 1:04d}", "status": rng.choice(STATUSES)}
+        for n in range(max(items, hypothesis_count))
+    ]
+    # aggregate_history reads "items"; history_lint cross-checks "agenda_items" and "hypotheses",
+    # including the AG-000000/HYP-0000 placeholders that journal records carry.
+    snapshot = {
+        "items": state,
+        "agenda_items": [{"id": "AG-000000", "status": "not-started"}] + state,
+        "hypotheses": [{"id": "HYP-0000", "status": "not-started"}] + hypotheses,
+    }
+    write(root / paths.AGENDA_STATE, json.dumps(snapshot, indent=2) + "\n")
+
+
+def write_activity(root: Path, lines: int, rng: random.Random) -> None:
+    path = root / paths.AGENT_ACTIVITY_LOG
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for index in range(lines):
+            entry = {
+                "ts": (BASE_TIME + datetime.timedelta(seconds=97 * index)).isoformat().replace("+00:00", "Z"),
+                "actor": "bench",
+                "intent": "verify",
+                "scope": "workspace",
+                "action": prose(rng, 5),
+                "result": "ok",
+                "mode": "normal",
+            }
+            f.write(json.dumps(entry) + "\n")
+
+
+def link_repo(root: Path, repo_root: Path = REPO_ROOT) -> None:
+    """Symlink the repo's tools, docs and templates into ``root`` so verify_all.sh can run there."""
+    for entry in sorted(repo_root.iterdir()):
+        if entry.name in GENERATED_ENTRIES:
+            continue
+        target = root / entry.name
+        if not target.exists():
+            target.symlink_to(entry.resolve())
+    agents = root / "AGENTS.md"
+    if not agents.exists():
+        write(agents, "# AGENTS\n\nSynthetic benchmark workspace.\n")  # required by template_baseline_lint
+    intent = root / paths.PROJECT_INTENT
+    if not intent.exists() and (repo_root / paths.PROJECT_INTENT).exists():
+        write(intent, (repo_root / paths.PROJECT_INTENT).read_text(encoding="utf-8"))
+
+
+def generate(
+    root: Path,
+    runs: int,
+    seed: int = 0,
+    agenda_items: Optional[int] = None,
+    activity_lines: Optional[int] = None,
+) -> None:
+    """Populate ``root`` with a synthetic workspace of ``runs`` runs."""
+    rng = random.Random(seed)
+    for index in range(runs):
+        write_run(root, index, rng)
+    if agenda_items is None:
+        agenda_items = max(1, runs // RUNS_PER_HYPOTHESIS)
+    hypothesis_count = (runs + RUNS_PER_HYPOTHESIS - 1) // RUNS_PER_HYPOTHESIS
+    write_agenda(root, agenda_items, hypothesis_count, rng)
+    write_activity(root, ACTIVITY_LINES_PER_RUN * runs if activity_lines is None else activity_lines, rng)
+    for name in (paths.LOGS_DIR, paths.TEST_RESULTS_DIR, paths.DIFFS_DIR):
+        (root / name).mkdir(parents=True, exist_ok=True)
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic CVR workspace.")
+    parser.add_argument("dest", type=Path, help="Directory to populate (created if missing)")
+    parser.add_argument("--runs", type=int, default=1000, help="Number of run directories (default: 1000)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--link-repo", action="store_true", help="Symlink repo tooling in so verify_all.sh can run")
+    args = parser.parse_args(argv)
+
+    args.dest.mkdir(parents=True, exist_ok=True)
+    if any(args.dest.iterdir()):
+        print(f"workspace: ERROR: {args.dest} is not empty", file=sys.stderr)
+        return 1
+    generate(args.dest, args.runs, args.seed)
+    if args.link_repo:
+        link_repo(args.dest)
+    print(f"Generated {args.runs} runs in {args.dest}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
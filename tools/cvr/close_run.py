@@ -7,7 +7,7 @@ from pathlib import Path
 
 # Import canonical paths - scripts run from repo root
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
-from tools.cvr import paths
+from tools.cvr import paths, profiling, run_scanner
 from typing import Optional
 
 from journal import emit_journal
@@ -27,28 +27,10 @@ def get_latest_run() -> Optional[Path]:
     return runs[-1] if runs else None
 
 def extract_lessons(run_dir: Path) -> list:
-    wt = run_dir / "walkthrough.md"
-    if not wt.exists():
-        return []
-    
-    content = wt.read_text(encoding="utf-8")
-    # Looking for a "Lessons Learned" section
-    # Simple extraction: all bullets under a header that contains "Lessons"
-    lines = content.splitlines()
-    lessons = []
-    in_lessons = False
-    
-    for line in lines:
-        if line.startswith("#") and "lessons" in line.lower():
-            in_lessons = True
-            continue
-        if in_lessons and line.startswith("#"):
-            in_lessons = False
-            break
-        if in_lessons and line.strip().startswith("- "):
-            lessons.append(line.strip()[2:])
-            
-    return lessons
+    # All bullets under the "Lessons Learned" header of the walkthrough.
+    # The scan is shared with emit_journal(), so the walkthrough is read once.
+    scan = run_scanner.scan_file(run_dir / "walkthrough.md")
+    return list(scan.lessons) if scan else []
 
 def update_global_lessons(lessons: list, run_name: str) -> int:
     """Append unique lessons to artifacts/history/lessons-learned.md.
@@ -144,4 +126,4 @@ def main() -> int:
     return 0
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(profiling.run_main("close_run", main))
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Query the history index without parsing the whole NDJSON log.
+
+Examples:
+  cvr_query.py hypotheses --status blocked
+  cvr_query.py agenda --hypothesis HYP-0001
+  cvr_query.py runs --since 2024-01-01 --until 2024-01-31
+  cvr_query.py evidence --id HYP-0001
+  cvr_query.py evidence --path docs/design.md
+
+The index (artifacts/history/history.sqlite) is rebuilt automatically when it is
+missing or older than the NDJSON log it was built from.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+# Import canonical paths - scripts run from repo root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+from tools.cvr import history_index, paths
+
+COLUMNS = {
+    "hypotheses": ("id", "status", "last_seen_run", "claim"),
+    "agenda": ("id", "status", "hypothesis_id", "last_seen_run", "summary"),
+    "journals": ("run_id", "path", "summary"),
+    "runs": ("run_id",),
+    "evidence": ("record_type", "record_id", "path"),
+}
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Query the CVR history index.")
+    parser.add_argument(
+        "--history",
+        type=Path,
+        default=paths.HISTORY_NDJSON,
+        help="History NDJSON the index mirrors (default: artifacts/history/history.ndjson)",
+    )
+    parser.add_argument("--json", action="store_true", help="Print one JSON object per row")
+    sub = parser.add_subparsers(dest="table", required=True)
+
+    for name in ("hypotheses", "agenda"):
+        p = sub.add_parser(name, help=f"List {name} (latest state)")
+        p.add_argument("--id", help="Only this id")
+        p.add_argument("--status", help="Only records with this status (e.g. blocked)")
+        p.add_argument("--run", help="Only records last seen in this run")
+        p.add_argument("--since", help="Only records last seen in runs >= this run id or date")
+        p.add_argument("--until", help="Only records last seen in runs <= this run id or date (prefix match)")
+        if name == "agenda":
+            p.add_argument("--hypothesis", help="Only agenda items for this hypothesis id")
+
+    for name in ("journals", "runs"):
+        p = sub.add_parser(name, help=f"List {name}")
+        p.add_argument("--since", help="Only runs >= this run id or date")
+        p.add_argument("--until", help="Only runs <= this run id or date (prefix match)")
+
+    p = sub.add_parser("evidence", help="List evidence pointers")
+    target = p.add_mutually_exclusive_group(required=True)
+    target.add_argument("--id", help="Evidence cited by this hypothesis/agenda id or journal run id")
+    target.add_argument("--path", help="Records citing this evidence path")
+    return parser.parse_args(argv)
+
+
+def build_query(args: argparse.Namespace):
+    params: List[str] = []
+    clauses: List[str] = []
+    if args.table in ("hypotheses", "agenda"):
+        table = "hypotheses" if args.table == "hypotheses" else "agenda_items"
+        for column, value in (("id", args.id), ("status", args.status), ("last_seen_run", args.run)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if args.table == "agenda" and args.hypothesis:
+            clauses.append("hypothesis_id = ?")
+            params.append(args.hypothesis)
+        clauses += history_index.run_range_clause("last_seen_run", args.since, args.until, params)
+        order = "last_seen_run, id"
+    elif args.table in ("journals", "runs"):
+        table = args.table
+        clauses += history_index.run_range_clause("run_id", args.since, args.until, params)
+        order = "run_id"
+    else:
+        table = "evidence"
+        column = "record_id" if args.id else "path"
+        clauses.append(f"{column} = ?")
+        params.append(args.id or args.path)
+        order = "record_type, record_id, path"
+
+    sql = f"SELECT {', '.join(COLUMNS[args.table])} FROM {table}"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    return f"{sql} ORDER BY {order}", params
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if not args.history.exists():
+        print(f"cvr_query: ERROR: history log not found: {args.history}", file=sys.stderr)
+        return 1
+    index_path = history_index.index_path_for(args.history)
+    history_index.ensure_index(index_path, args.history)
+
+    sql, params = build_query(args)
+    conn = history_index.connect(index_path)
+    try:
+        for row in conn.execute(sql, params):
+            if args.json:
+                print(json.dumps(dict(row), sort_keys=True))
+            else:
+                print("\t".join("" if value is None else str(value) for value in row))
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Print individual history records without reading the whole NDJSON log.
+
+Examples:
+  cvr_show.py 123456                                   # line 123456 of history.ndjson
+  cvr_show.py artifacts/history/history.ndjson:123456  # paste a history_lint location
+  cvr_show.py --id HYP-0001                            # latest state of a record
+  cvr_show.py --id 2024-01-01_000000 --type journal
+
+Lookups go through the line-offset sidecar (history.ndjson.idx, see
+line_index.py), which is rebuilt in one pass when it is missing or stale.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+# Import canonical paths - scripts run from repo root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+from tools.cvr import line_index, paths
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Show history records by line number or id.")
+    parser.add_argument(
+        "--history",
+        type=Path,
+        default=paths.HISTORY_NDJSON,
+        help="History NDJSON to read (default: artifacts/history/history.ndjson)",
+    )
+    parser.add_argument("--pretty", action="store_true", help="Indent JSON records")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("location", nargs="?", help="Line number, or PATH:LINE as printed by history_lint")
+    target.add_argument("--id", help="Show the latest record with this id (journals: run id)")
+    parser.add_argument("--type", dest="record_type", help="Record type for --id (hypothesis, agenda, journal)")
+    return parser.parse_args(argv)
+
+
+def parse_location(location: str, default_path: Path) -> Tuple[Path, int]:
+    path, sep, line = location.rpartition(":")
+    if not sep:
+        return default_path, int(location)
+    return Path(path), int(line)
+
+
+def format_line(text: str, pretty: bool) -> str:
+    if not pretty:
+        return text
+    try:
+        return json.dumps(json.loads(text), indent=2, sort_keys=True)
+    except ValueError:
+        return text
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    history_path = args.history
+    lineno = None
+    if args.location is not None:
+        try:
+            history_path, lineno = parse_location(args.location, args.history)
+        except ValueError:
+            print(f"cvr_show: ERROR: not a line number or PATH:LINE: {args.location}", file=sys.stderr)
+            return 1
+    if not history_path.exists():
+        print(f"cvr_show: ERROR: history log not found: {history_path}", file=sys.stderr)
+        return 1
+
+    with line_index.ensure_index(history_path) as index:
+        if lineno is not None:
+            if not 1 <= lineno <= len(index):
+                print(f"cvr_show: ERROR: {history_path} has {len(index)} lines; no line {lineno}", file=sys.stderr)
+                return 1
+            print(format_line(index.line(lineno), args.pretty))
+            return 0
+
+        if args.record_type:
+            found = index.lookup(args.record_type, args.id)
+            matches = {args.record_type: found} if found is not None else {}
+        else:
+            matches = index.find(args.id)
+        if not matches:
+            print(f"cvr_show: ERROR: no record with id {args.id} in {history_path}", file=sys.stderr)
+            return 1
+        for rtype, line in matches.items():
+            print(f"{history_path}:{line}: {rtype}", file=sys.stderr)
+            print(format_line(index.line(line), args.pretty))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
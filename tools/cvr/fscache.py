@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""File fingerprints and persisted JSON caches for incremental CVR tools.
+
+Caches live under artifacts/cache/ and hold derived data only. Every consumer
+MUST fall back to a full rebuild when a cache is missing, stale, or unreadable,
+so deleting the cache directory is always safe.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+CHUNK_SIZE = 1 << 20
+
+
+def hash_file(path: Path) -> str:
+    """Return the hex SHA-256 digest of a file, read in fixed-size chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path: Path, previous: Optional[Dict] = None) -> Optional[Dict]:
+    """Fingerprint a file as {"mtime_ns", "size", "sha256"}.
+
+    Returns None if the file does not exist. When ``previous`` has the same
+    mtime and size, its digest is reused and the file is not read.
+    """
+    try:
+        st = path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    if previous and previous.get("mtime_ns") == st.st_mtime_ns and previous.get("size") == st.st_size:
+        return dict(previous)
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": hash_file(path)}
+
+
+def same_content(a: Optional[Dict], b: Optional[Dict]) -> bool:
+    """True if two fingerprints describe the same content (or both are missing)."""
+    if a is None or b is None:
+        return a is None and b is None
+    return a.get("sha256") == b.get("sha256")
+
+
+def load_cache(path: Path, version: int) -> Dict:
+    """Load a JSON cache, returning {} if it is missing, corrupt, or from another version."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != version:
+        return {}
+    return data
+
+
+def save_cache(path: Path, version: int, data: Dict) -> None:
+    """Atomically write a JSON cache (temp file + rename)."""
+    payload = dict(data)
+    payload["version"] = version
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f, sort_keys=True, separators=(",", ":"))
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
@@ -11,7 +11,7 @@ from datetime import datetime, timezone
 
 # Import canonical paths
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
-from tools.cvr import paths
+from tools.cvr import paths, profiling
 
 
 def read_agentsignore(root: Path) -> list:
@@ -101,4 +101,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(profiling.run_main("generate_context_manifest", main))
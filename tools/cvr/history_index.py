@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""Optional SQLite index over artifacts/history/history.ndjson.
+
+The NDJSON log stays the source of truth. The index is a derived, disposable
+copy of its latest state with indexes on id, status and run, so questions like
+"which hypotheses are blocked" do not require parsing the whole history. It is
+written by `aggregate_history.py --index` and rebuilt on demand by cvr_query.py
+whenever it no longer matches the NDJSON file it was built from.
+"""
+
+import contextlib
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from tools.cvr import history_log
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE hypotheses (
+    id TEXT PRIMARY KEY,
+    status TEXT,
+    claim TEXT,
+    timestamp TEXT,
+    first_seen_run TEXT,
+    last_seen_run TEXT
+);
+CREATE TABLE agenda_items (
+    id TEXT PRIMARY KEY,
+    status TEXT,
+    summary TEXT,
+    hypothesis_id TEXT,
+    timestamp TEXT,
+    first_seen_run TEXT,
+    last_seen_run TEXT
+);
+CREATE TABLE journals (run_id TEXT PRIMARY KEY, summary TEXT, path TEXT);
+CREATE TABLE evidence (record_type TEXT NOT NULL, record_id TEXT NOT NULL, path TEXT NOT NULL);
+CREATE TABLE runs (run_id TEXT PRIMARY KEY);
+CREATE INDEX hypotheses_status ON hypotheses (status);
+CREATE INDEX hypotheses_last_seen_run ON hypotheses (last_seen_run);
+CREATE INDEX agenda_items_status ON agenda_items (status);
+CREATE INDEX agenda_items_last_seen_run ON agenda_items (last_seen_run);
+CREATE INDEX evidence_record ON evidence (record_id);
+CREATE INDEX evidence_path ON evidence (path);
+"""
+
+
+def index_path_for(history_path: Path) -> Path:
+    """The index lives next to the NDJSON log it mirrors (history.ndjson -> history.sqlite)."""
+    return history_path.with_suffix(".sqlite")
+
+
+def source_stamp(history_path: Path) -> Optional[str]:
+    """Identify the NDJSON file the index was built from (size and mtime)."""
+    try:
+        st = history_path.stat()
+    except FileNotFoundError:
+        return None
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+def _run_ids(record: Dict) -> Iterator[str]:
+    for key in ("timestamp", "first_seen_run", "last_seen_run"):
+        value = record.get(key)
+        if value and value != "unknown":
+            yield value
+
+
+def build_index(db_path: Path, records: Iterable[Dict], history_path: Optional[Path] = None) -> int:
+    """Write a fresh index for ``records`` (latest state). Returns the number of records indexed.
+
+    The database is built in a temp file and renamed into place, so readers never
+    see a half-built index.
+    """
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{db_path.name}.", suffix=".tmp", dir=db_path.parent)
+    os.close(fd)
+    count = 0
+    try:
+        with contextlib.closing(sqlite3.connect(tmp)) as conn:
+            conn.executescript(SCHEMA)
+            runs = set()
+            for rec in records:
+                rtype = rec.get("record_type")
+                if rtype == "hypothesis":
+                    record_id = rec.get("id")
+                    conn.execute(
+                        "INSERT OR REPLACE INTO hypotheses VALUES (?, ?, ?, ?, ?, ?)",
+                        (record_id, rec.get("status"), rec.get("claim") or rec.get("summary"), rec.get("timestamp"),
+                         rec.get("first_seen_run"), rec.get("last_seen_run")),
+                    )
+                elif rtype == "agenda":
+                    record_id = rec.get("id")
+                    conn.execute(
+                        "INSERT OR REPLACE INTO agenda_items VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (record_id, rec.get("status"), rec.get("summary"), rec.get("hypothesis_id"),
+                         rec.get("timestamp"), rec.get("first_seen_run"), rec.get("last_seen_run")),
+                    )
+                elif rtype == "journal":
+                    record_id = rec.get("timestamp")
+                    evidence = rec.get("evidence") or []
+                    conn.execute(
+                        "INSERT OR REPLACE INTO journals VALUES (?, ?, ?)",
+                        (record_id, rec.get("summary"), evidence[0] if evidence else None),
+                    )
+                else:
+                    continue
+                if not record_id:
+                    continue
+                count += 1
+                runs.update(_run_ids(rec))
+                conn.executemany(
+                    "INSERT INTO evidence VALUES (?, ?, ?)",
+                    ((rtype, record_id, ev) for ev in rec.get("evidence") or []),
+                )
+            conn.executemany("INSERT INTO runs VALUES (?)", ((run,) for run in sorted(runs)))
+            meta = {"schema_version": str(SCHEMA_VERSION)}
+            stamp = source_stamp(history_path) if history_path else None
+            if stamp:
+                meta["source"] = str(history_path)
+                meta["source_stamp"] = stamp
+            conn.executemany("INSERT INTO meta VALUES (?, ?)", meta.items())
+            conn.commit()
+        os.replace(tmp, db_path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+    return count
+
+
+def read_meta(db_path: Path) -> Dict[str, str]:
+    try:
+        with contextlib.closing(sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)) as conn:
+            return dict(conn.execute("SELECT key, value FROM meta"))
+    except sqlite3.Error:
+        return {}
+
+
+def is_current(db_path: Path, history_path: Path) -> bool:
+    meta = read_meta(db_path) if db_path.exists() else {}
+    return (
+        meta.get("schema_version") == str(SCHEMA_VERSION)
+        and meta.get("source_stamp") is not None
+        and meta.get("source_stamp") == source_stamp(history_path)
+    )
+
+
+def ensure_index(db_path: Path, history_path: Path) -> bool:
+    """Rebuild the index from the NDJSON log if it is missing or stale. Returns True if rebuilt."""
+    if is_current(db_path, history_path):
+        return False
+    records, _ = history_log.load_resolved(history_path)
+    build_index(db_path, records, history_path)
+    return True
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    """Open the index read-only with rows addressable by column name."""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def run_range_clause(column: str, since: Optional[str], until: Optional[str], params: List[str]) -> List[str]:
+    """SQL conditions selecting run ids in [since, until]; ``until`` matches by prefix (e.g. a date)."""
+    clauses = []
+    if since:
+        clauses.append(f"{column} >= ?")
+        params.append(since)
+    if until:
+        clauses.append(f"substr({column}, 1, length(?)) <= ?")
+        params.extend([until, until])
+    return clauses
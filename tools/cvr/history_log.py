@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Append-only semantics for artifacts/history/history.ndjson.
+
+The history file is either a canonical snapshot (one line per record, written by
+a full aggregation or by compaction) or a snapshot followed by appended delta
+records. A delta is the complete new state of one record, so readers resolve the
+latest state by keeping the last line seen for each record key.
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from tools.cvr import ndjson_io
+
+RecordKey = Tuple[Optional[str], Optional[str]]
+
+
+def record_key(record: Dict) -> RecordKey:
+    """Identity of a history record: journals are keyed by run, everything else by id."""
+    rtype = record.get("record_type")
+    if rtype == "journal":
+        return rtype, record.get("timestamp")
+    return rtype, record.get("id")
+
+
+def resolve_latest(records: Iterable[Dict]) -> Tuple[Dict[RecordKey, Dict], int]:
+    """Fold a record stream into its latest state (last record per key wins).
+
+    Returns the latest record per key and the number of records read.
+    """
+    latest: Dict[RecordKey, Dict] = {}
+    total = 0
+    for record in records:
+        latest[record_key(record)] = record
+        total += 1
+    return latest, total
+
+
+def load_resolved(path: Path) -> Tuple[List[Dict], int]:
+    """Return (latest records, number of superseded lines) for a history file."""
+    latest, total = resolve_latest(ndjson_io.iter_records(path))
+    return list(latest.values()), total - len(latest)
+
+
+def canonical_order(records: Iterable[Dict]) -> List[Dict]:
+    """Order records the way a full aggregation writes them.
+
+    Hypotheses and agenda items sort by (timestamp, id, record_type); journals follow
+    them, and a final stable sort groups everything by timestamp.
+    """
+    core = []
+    journals = []
+    for record in records:
+        (journals if record.get("record_type") == "journal" else core).append(record)
+    core.sort(key=lambda r: (r.get("timestamp", ""), r.get("id") or "", r.get("record_type") or ""))
+    journals.sort(key=lambda r: r.get("timestamp", ""))
+    ordered = core + journals
+    ordered.sort(key=lambda r: r.get("timestamp", ""))
+    return ordered
+
+
+def compute_deltas(resolved: Iterable[Dict], final_records: Iterable[Dict]) -> List[Dict]:
+    """Records in ``final_records`` that are new or differ from the resolved state."""
+    current = {record_key(rec): rec for rec in resolved}
+    return [rec for rec in final_records if current.get(record_key(rec)) != rec]
+
+
+def append_records(path: Path, records: List[Dict]) -> int:
+    """Append delta records to the history log. Returns the number appended."""
+    if not records:
+        return 0
+    path.parent.mkdir(parents=True, exist_ok=True)
+    needs_newline = False
+    if path.exists() and path.stat().st_size:
+        with open(path, "rb") as f:
+            f.seek(-1, 2)
+            needs_newline = f.read(1) != b"\n"
+    with open(path, "a", encoding="utf-8", newline="") as f:
+        if needs_newline:
+            f.write("\n")
+        for record in records:
+            f.write(ndjson_io.dumps(record))
+            f.write("\n")
+    return len(records)
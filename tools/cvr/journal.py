@@ -6,14 +6,13 @@ It is deterministic, post-hoc, and theatrical.
 """
 
 import json
-import re
 import sys
 from pathlib import Path
 from typing import Dict, List, Optional
 
 # Import canonical paths - scripts run from repo root
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
-from tools.cvr import paths
+from tools.cvr import paths, profiling, run_scanner
 
 HEADER = "### Deep Thoughts, by an Agent"
 DISCLAIMER = "*Editor’s note: This entry is a dramatized reconstruction of a deterministic decision process, derived from run artifacts.*"
@@ -47,34 +46,16 @@ def load_plan_summary(run_dir: Path) -> str:
 
 
 def extract_lessons(walkthrough_path: Path) -> List[str]:
-    if not walkthrough_path.exists():
-        return []
-    
-    content = walkthrough_path.read_text(encoding="utf-8")
-    lines = content.splitlines()
-    lessons: List[str] = []
-    in_lessons = False
-
-    for line in lines:
-        if line.startswith("#") and "lessons" in line.lower():
-            in_lessons = True
-            continue
-        if in_lessons and line.startswith("#"):
-            break
-        if in_lessons and line.strip().startswith("- "):
-            lessons.append(line.strip()[2:])
-
-    return lessons
+    scan = run_scanner.scan_file(walkthrough_path)
+    return list(scan.lessons) if scan else []
 
 
 def load_outcome(run_dir: Path) -> str:
-    report_path = run_dir / "post_verify_report.md"
-    if not report_path.exists():
+    scan = run_scanner.scan_file(run_dir / "post_verify_report.md")
+    if scan is None:
         return "The run concluded without a final report."
     
-    text = report_path.read_text(encoding="utf-8")
-    status_match = re.search(r"Status:\s*([A-Za-z\-]+)", text)
-    status = status_match.group(1).strip() if status_match else "unknown"
+    status = scan.status or "unknown"
     
     return f"The run finished with status '{status}'."
 
@@ -159,4 +140,4 @@ def main(argv: Optional[List[str]] = None) -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(profiling.run_main("journal", main))
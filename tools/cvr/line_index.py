@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""Line-offset sidecar for random access into NDJSON history logs.
+
+history.ndjson.idx holds, next to the log it describes:
+
+  header   magic, format version, source size and mtime_ns, line count, key count,
+           key pool length
+  offsets  array('Q') of line_count + 1 byte offsets (start of each line, then end of file)
+  keys     key_count fixed-width KEY entries (pool offset, key length, lineno), sorted
+           by key; one per (record_type, id), pointing at the latest line for it
+  pool     the keys, each b"<id>\\0<record_type>" in UTF-8
+
+Both files are memory-mapped, so fetching line N or the latest state of
+("hypothesis", "HYP-0001") reads one record instead of the whole log: a line is
+two offsets, and a key is a binary search over the key table that touches
+O(log n) entries, with nothing parsed up front. Keys sort by id first, so all
+record types of one id are adjacent. Numbers are stored in native byte order;
+like the SQLite index the sidecar is derived, machine-local data. It is written
+by aggregate_history.py (from the lines it writes, without re-reading them) and
+rebuilt in one pass by cvr_show.py whenever the log's size or mtime no longer
+match the header.
+"""
+
+import bisect
+import contextlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from tools.cvr import history_log, ndjson_io
+
+MAGIC = b"CVRLIDX\n"
+FORMAT_VERSION = 2
+# magic, version, source size, source mtime_ns, line count, key count, key pool bytes
+HEADER = struct.Struct("=8sQQQQQQ")
+# Key table entry: offset of the key in the pool, key length, line number.
+KEY = struct.Struct("=QIQ")
+
+KeyMap = Dict[str, Dict[str, int]]
+
+
+def index_path_for(ndjson_path: Path) -> Path:
+    """The sidecar lives next to its log (history.ndjson -> history.ndjson.idx)."""
+    return ndjson_path.with_name(ndjson_path.name + ".idx")
+
+
+class IndexBuilder:
+    """Accumulate line offsets and record keys for lines as they are written."""
+
+    def __init__(self, offsets: Optional[array] = None, keys: Optional[KeyMap] = None) -> None:
+        self.offsets = offsets if offsets is not None else array("Q", [0])
+        self.keys: KeyMap = keys if keys is not None else {}
+
+    @classmethod
+    def resume(cls, ndjson_path: Path) -> Optional["IndexBuilder"]:
+        """A builder seeded from a current sidecar, for appending to the log; None if there is none."""
+        index = open_index(ndjson_path)
+        if index is None:
+            return None
+        with index:
+            return cls(array("Q", index.offsets), index.key_map())
+
+    @property
+    def size(self) -> int:
+        return self.offsets[-1]
+
+    def add_line(self, line: str, record: Optional[Dict]) -> None:
+        """Record one line (without its newline) and the record parsed from it, if any."""
+        self.offsets.append(self.size + len(line.encode("utf-8")) + 1)
+        if isinstance(record, dict):
+            rtype, record_id = history_log.record_key(record)
+            if rtype is not None and record_id is not None:
+                self.keys.setdefault(str(rtype), {})[str(record_id)] = len(self.offsets) - 1
+
+    def add(self, record: Dict) -> str:
+        """Record the canonical line for ``record`` and return it."""
+        line = ndjson_io.dumps(record)
+        self.add_line(line, record)
+        return line
+
+    def track(self, records: Iterable[Dict]) -> Iterator[str]:
+        """Yield the canonical line for each record, indexing it on the way out."""
+        for record in records:
+            yield self.add(record)
+
+    def save(self, ndjson_path: Path) -> None:
+        """Write the sidecar for ``ndjson_path``, which must now hold exactly the tracked lines.
+
+        Falls back to a full scan if it does not (e.g. append_records() had to
+        terminate a partial last line first).
+        """
+        st = ndjson_path.stat()
+        if st.st_size != self.size:
+            build_index(ndjson_path)
+            return
+        write_sidecar(index_path_for(ndjson_path), st, self.offsets, self.keys)
+
+
+def scan(ndjson_path: Path) -> IndexBuilder:
+    """Index every line of ``ndjson_path`` in a single pass."""
+    builder = IndexBuilder()
+    with open(ndjson_path, "rb") as f:
+        for raw in f:
+            builder.offsets.append(builder.size + len(raw))
+            try:
+                record = json.loads(raw)
+            except ValueError:
+                continue  # blank or invalid lines are indexed by number only
+            if isinstance(record, dict):
+                rtype, record_id = history_log.record_key(record)
+                if rtype is not None and record_id is not None:
+                    builder.keys.setdefault(str(rtype), {})[str(record_id)] = len(builder.offsets) - 1
+    return builder
+
+
+def build_index(ndjson_path: Path) -> int:
+    """Rebuild the sidecar for ``ndjson_path`` from scratch. Returns the number of lines."""
+    st = ndjson_path.stat()
+    builder = scan(ndjson_path)
+    write_sidecar(index_path_for(ndjson_path), st, builder.offsets, builder.keys)
+    return len(builder.offsets) - 1
+
+
+def encode_key(record_type: str, record_id: str) -> bytes:
+    return f"{record_id}\0{record_type}".encode("utf-8")
+
+
+def write_sidecar(idx_path: Path, st: os.stat_result, offsets: array, keys: KeyMap) -> None:
+    entries = sorted(
+        (encode_key(rtype, record_id), lineno) for rtype, ids in keys.items() for record_id, lineno in ids.items()
+    )
+    table = bytearray()
+    pool = bytearray()
+    for key, lineno in entries:
+        table += KEY.pack(len(pool), len(key), lineno)
+        pool += key
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, st.st_size, st.st_mtime_ns, len(offsets) - 1, len(entries), len(pool)
+    )
+    idx_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{idx_path.name}.", suffix=".tmp", dir=idx_path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            offsets.tofile(f)
+            f.write(table)
+            f.write(pool)
+        os.replace(tmp, idx_path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+
+class LineIndex:
+    """A memory-mapped sidecar plus the log it indexes. Use as a context manager."""
+
+    def __init__(self, ndjson_path: Path, idx_map: mmap.mmap, line_count: int, key_count: int) -> None:
+        self.path = ndjson_path
+        self._idx_map = idx_map
+        end = HEADER.size + 8 * (line_count + 1)
+        self.offsets = memoryview(idx_map)[HEADER.size:end].cast("Q")
+        self._table = end
+        self._key_count = key_count
+        self._pool = end + KEY.size * key_count
+        self._source = None
+        size = self.offsets[-1]
+        if size:
+            with open(ndjson_path, "rb") as f:
+                self._source = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __enter__(self) -> "LineIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.offsets.release()
+        self._idx_map.close()
+        if self._source is not None:
+            self._source.close()
+
+    def raw_line(self, lineno: int) -> bytes:
+        """Bytes of 1-based line ``lineno``, including its terminator."""
+        if not 1 <= lineno <= len(self):
+            raise IndexError(f"line {lineno} out of range (1-{len(self)})")
+        return self._source[self.offsets[lineno - 1]:self.offsets[lineno]]
+
+    def line(self, lineno: int) -> str:
+        """Text of 1-based line ``lineno`` without its terminator."""
+        return ndjson_io.decode_line(self.raw_line(lineno))
+
+    def _entry(self, i: int) -> Tuple[bytes, int]:
+        """Key bytes and line number of key table entry ``i``."""
+        offset, length, lineno = KEY.unpack_from(self._idx_map, self._table + KEY.size * i)
+        start = self._pool + offset
+        return self._idx_map[start:start + length], lineno
+
+    def _bisect(self, key: bytes) -> int:
+        """Index of the first key table entry not less than ``key``."""
+        return bisect.bisect_left(range(self._key_count), key, key=lambda i: self._entry(i)[0])
+
+    def key_map(self) -> KeyMap:
+        """Every key, decoded; O(keys), for rewriting the sidecar (lookups do not need it)."""
+        keys: KeyMap = {}
+        for i in range(self._key_count):
+            key, lineno = self._entry(i)
+            record_id, _, rtype = key.decode("utf-8").partition("\0")
+            keys.setdefault(rtype, {})[record_id] = lineno
+        return keys
+
+    def lookup(self, record_type: str, record_id: str) -> Optional[int]:
+        """Line number of the latest record with this key, or None."""
+        key = encode_key(record_type, record_id)
+        i = self._bisect(key)
+        if i < self._key_count:
+            found, lineno = self._entry(i)
+            if found == key:
+                return lineno
+        return None
+
+    def find(self, record_id: str) -> Dict[str, int]:
+        """Latest line per record type for ``record_id`` (ids are usually unique across types)."""
+        prefix = encode_key("", record_id)
+        found: Dict[str, int] = {}
+        i = self._bisect(prefix)
+        while i < self._key_count:
+            key, lineno = self._entry(i)
+            if not key.startswith(prefix):
+                break
+            found[key[len(prefix):].decode("utf-8")] = lineno
+            i += 1
+        return found
+
+
+def open_index(ndjson_path: Path) -> Optional[LineIndex]:
+    """Map the sidecar for ``ndjson_path`` if it is current; None if missing, unreadable or stale."""
+    try:
+        st = ndjson_path.stat()
+        with open(index_path_for(ndjson_path), "rb") as f:
+            idx_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        magic, version, size, mtime_ns, line_count, key_count, pool_bytes = HEADER.unpack_from(idx_map)
+    except struct.error:
+        idx_map.close()
+        return None
+    expected_len = HEADER.size + 8 * (line_count + 1) + KEY.size * key_count + pool_bytes
+    if (magic, version, size, mtime_ns) != (MAGIC, FORMAT_VERSION, st.st_size, st.st_mtime_ns) or len(idx_map) != expected_len:
+        idx_map.close()
+        return None
+    return LineIndex(ndjson_path, idx_map, line_count, key_count)
+
+
+def ensure_index(ndjson_path: Path) -> LineIndex:
+    """Open the sidecar for ``ndjson_path``, rebuilding it first if it is missing or stale."""
+    index = open_index(ndjson_path)
+    if index is None:
+        build_index(ndjson_path)
+        index = open_index(ndjson_path)
+    if index is None:
+        raise RuntimeError(f"{ndjson_path} changed while it was being indexed")
+    return index
@@ -3,10 +3,13 @@ import re
 import sys
 from pathlib import Path
 from lint_common import die
+from tools.cvr import profiling
 
 REQUIRED_HEADINGS = ["## Active Hypotheses", "## Blockers", "## Deferred Risks"]
 VALID_STATUSES = {"finished", "in-progress", "blocked", "not-started", "unknown"}
 
+INPUTS = ("AGENDA.md",)
+
 def main() -> int:
   p = Path("AGENDA.md")
   if not p.exists():
@@ -56,4 +59,4 @@ def main() -> int:
   return 0
 
 if __name__ == "__main__":
-  raise SystemExit(main())
+  raise SystemExit(profiling.run_main("agenda_lint", main))
@@ -1,13 +1,14 @@
 #!/usr/bin/env python3
-import re
+import argparse
 import sys
+from dataclasses import dataclass, field
 from pathlib import Path
 
 # Import canonical paths
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
-from tools.cvr import paths
-from typing import List, Tuple
-from lint_common import die
+from tools.cvr import fscache, paths, profiling
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from lint_common import die, iter_markdown_lines, record, run_artifact_index, strip_code_spans
 
 # Minimum word counts for key artifacts
 MIN_WORDS = {
@@ -21,37 +22,139 @@ REQUIRED_SECTIONS = {
     "implementation_plan.md": ["## Proposed Changes", "## Verification Plan"],
 }
 
+# Bump when the shape of the cache below changes.
+CACHE_VERSION = 1
+
+INPUTS = (
+    "walkthrough.md",
+    "implementation_plan.md",
+    "artifacts/history/runs/*/walkthrough.md",
+    "artifacts/history/runs/*/implementation_plan.md",
+)
+
+@dataclass
+class ContentScan:
+    """Words outside code and required sections seen, from one pass over a document."""
+
+    words: int = 0
+    sections: Set[str] = field(default_factory=set)
+    # True if the scan stopped before the end because every check had passed.
+    stopped_early: bool = False
+
+
+def scan_lines(lines: Iterable[str], min_words: Optional[int] = None, sections: Sequence[str] = ()) -> ContentScan:
+    """Count words outside fenced blocks and inline code, and find ``sections``, in one pass.
+
+    Sections are matched as substrings of any line, code included, as before.
+    With ``min_words``, stops reading once the count reaches it and every section
+    has been seen; ``words`` is then only a lower bound.
+    """
+    scan = ContentScan()
+    missing = list(sections)
+    for _, line, fenced in iter_markdown_lines(lines):
+        if missing:
+            missing = [section for section in missing if section not in line]
+        if not fenced:
+            scan.words += len(strip_code_spans(line).split())
+        if min_words is not None and scan.words >= min_words and not missing:
+            scan.stopped_early = True
+            break
+    scan.sections = set(sections) - set(missing)
+    return scan
+
+
+def scan_for(path: Path, lines: Iterable[str]) -> ContentScan:
+    """Scan ``lines`` of ``path`` for exactly the checks its file name needs."""
+    return scan_lines(lines, MIN_WORDS.get(path.name), REQUIRED_SECTIONS.get(path.name, ()))
+
+
+def scan_file(path: Path) -> ContentScan:
+    """Stream ``path`` through scan_for() without reading it into memory."""
+    with open(path, encoding="utf-8") as f:
+        return scan_for(path, (line.rstrip("\r\n") for line in f))
+
+
 def count_words(text: str) -> int:
     """Count words in text, ignoring code blocks."""
-    # Remove code blocks
-    text = re.sub(r"```.*?```", "", text, flags=re.DOTALL)
-    # Remove inline code
-    text = re.sub(r"`[^`]+`", "", text)
-    # Simple split by whitespace
-    return len(text.split())
+    return scan_lines(text.splitlines()).words
+
+
+def structure_errors(path: Path, scan: ContentScan) -> List[str]:
+    return [
+        f"missing required section: '{section}'"
+        for section in REQUIRED_SECTIONS.get(path.name, ())
+        if section not in scan.sections
+    ]
+
+
+def word_count_errors(path: Path, scan: ContentScan) -> List[str]:
+    min_count = MIN_WORDS.get(path.name)
+    if min_count is not None and scan.words < min_count:
+        return [f"word count {scan.words} < minimum {min_count}"]
+    return []
+
 
 def check_structure(path: Path, text: str) -> List[str]:
     """Check if file has required sections."""
-    errors = []
-    filename = path.name
-    if filename in REQUIRED_SECTIONS:
-        for section in REQUIRED_SECTIONS[filename]:
-            if section not in text:
-                errors.append(f"missing required section: '{section}'")
-    return errors
+    return structure_errors(path, scan_for(path, text.splitlines()))
 
 def check_word_count(path: Path, text: str) -> List[str]:
     """Check if file satisfies minimum word count."""
-    errors = []
-    filename = path.name
-    if filename in MIN_WORDS:
-        count = count_words(text)
-        min_count = MIN_WORDS[filename]
-        if count < min_count:
-            errors.append(f"word count {count} < minimum {min_count}")
-    return errors
-
-def main() -> int:
+    return word_count_errors(path, scan_for(path, text.splitlines()))
+
+def rules_key() -> Dict:
+    """The checks a cached pass was made against; a change invalidates every entry."""
+    return {"min_words": MIN_WORDS, "sections": REQUIRED_SECTIONS}
+
+
+def load_passed_runs(cache_path: Path) -> Dict[str, Dict]:
+    """Closed runs that passed on an earlier run of the linter, keyed by run ID."""
+    data = fscache.load_cache(cache_path, CACHE_VERSION)
+    if data.get("rules") != rules_key():
+        return {}
+    return data.get("runs", {})
+
+
+def save_passed_runs(cache_path: Path, runs: Dict[str, Dict]) -> None:
+    fscache.save_cache(cache_path, CACHE_VERSION, {"rules": rules_key(), "runs": runs})
+
+
+def run_fingerprint(run_dir: Path, previous: Optional[Dict] = None) -> Optional[Dict]:
+    """Fingerprints of a run's closure.json and checked artifacts, or None while the run is open.
+
+    Digests in ``previous`` are reused for files whose mtime and size still match.
+    """
+    previous = previous or {}
+    closure = fscache.file_fingerprint(run_dir / "closure.json", previous.get("closure.json"))
+    if closure is None:
+        return None
+    fingerprint = {"closure.json": closure}
+    for name in MIN_WORDS:
+        fingerprint[name] = fscache.file_fingerprint(run_dir / name, previous.get(name))
+    return fingerprint
+
+
+def unchanged(fingerprint: Optional[Dict], recorded: Optional[Dict]) -> bool:
+    if fingerprint is None or recorded is None or fingerprint.keys() != recorded.keys():
+        return False
+    return all(fscache.same_content(fingerprint[name], recorded[name]) for name in fingerprint)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check word counts and required sections of walkthroughs and plans.")
+    scope = parser.add_mutually_exclusive_group()
+    scope.add_argument(
+        "--all",
+        action="store_true",
+        help="Re-check every run, including closed runs unchanged since they last passed",
+    )
+    scope.add_argument(
+        "--since",
+        metavar="RUN_ID",
+        help="Check only runs from RUN_ID on (in run-ID order), plus the root artifacts",
+    )
+    args = parser.parse_args([] if argv is None else argv)
+
     # Scan for relevant markdown files in current dir and artifacts/history/runs
     files_to_check = []
     
@@ -60,40 +163,70 @@ def main() -> int:
         p = Path(name)
         if p.exists():
             files_to_check.append(p)
-            
-    # Check artifacts in runs
-    if paths.RUNS_DIR.exists():
-        for run_dir in paths.RUNS_DIR.iterdir():
-            if run_dir.is_dir():
-                for name in MIN_WORDS.keys():
-                    p = run_dir / name
-                    if p.exists():
-                        files_to_check.append(p)
-
-    if not files_to_check:
+
+    # Check artifacts in runs. A closed run (one with closure.json) whose files
+    # hash the same as when it last passed is skipped unless --all is given.
+    run_ids = run_artifact_index().run_ids() if paths.RUNS_DIR.is_dir() else []
+    if args.since is not None:
+        if args.since not in run_ids:
+            return die("content_lint", f"--since: no run named {args.since!r} under {paths.RUNS_DIR}")
+        run_ids = [run_id for run_id in run_ids if run_id >= args.since]
+    passed = load_passed_runs(paths.CONTENT_LINT_CACHE)
+    fingerprints: Dict[str, Optional[Dict]] = {}
+    skipped = 0
+    for run_id in run_ids:
+        run_dir = paths.RUNS_DIR / run_id
+        fingerprints[run_id] = run_fingerprint(run_dir, passed.get(run_id))
+        if not args.all and unchanged(fingerprints[run_id], passed.get(run_id)):
+            skipped += 1
+            continue
+        for name in MIN_WORDS.keys():
+            p = run_dir / name
+            if p.exists():
+                files_to_check.append(p)
+
+    if not files_to_check and not skipped:
         print("content_lint: no relevant artifacts found to check")
         return 0
 
     failed = False
+    failed_runs: Set[str] = set()
     for p in files_to_check:
         try:
-            text = p.read_text(encoding="utf-8")
+            scan = scan_file(p)
         except Exception as e:
             print(f"content_lint: failed to read {p}: {e}")
+            record("content_lint", f"failed to read {p}: {e}", file=p.as_posix())
             failed = True
+            failed_runs.add(p.parent.name)
             continue
 
-        errors = check_structure(p, text) + check_word_count(p, text)
+        errors = structure_errors(p, scan) + word_count_errors(p, scan)
         
         if errors:
             print(f"FAIL: {p}: {', '.join(errors)}")
+            for error in errors:
+                record("content_lint", error, file=p.as_posix())
             failed = True
+            failed_runs.add(p.parent.name)
+
+    # Remember closed runs that pass now; runs outside --since keep their entries.
+    for run_id, fingerprint in fingerprints.items():
+        if fingerprint is not None and run_id not in failed_runs:
+            passed[run_id] = fingerprint
+        else:
+            passed.pop(run_id, None)
+    current = set(run_artifact_index().run_ids()) if paths.RUNS_DIR.is_dir() else set()
+    save_passed_runs(paths.CONTENT_LINT_CACHE, {k: v for k, v in passed.items() if k in current})
 
     if failed:
         return die("content_lint", "content checks failed")
 
-    print("content_lint: OK")
+    if skipped:
+        print(f"content_lint: OK ({skipped} closed run(s) unchanged since they last passed; --all re-checks them)")
+    else:
+        print("content_lint: OK")
     return 0
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(profiling.run_main("content_lint", lambda: main(sys.argv[1:])))
@@ -5,9 +5,11 @@ from pathlib import Path
 
 # Import canonical paths
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
-from tools.cvr import paths
+from tools.cvr import paths, profiling
 from lint_common import die
 
+INPUTS = ("artifacts/logs/context_manifest.md",)
+
 def main() -> int:
   p = paths.CONTEXT_MANIFEST
   if not p.exists():
@@ -34,4 +36,4 @@ def main() -> int:
   return 0
 
 if __name__ == "__main__":
-  raise SystemExit(main())
+  raise SystemExit(profiling.run_main("context_manifest_lint", main))
@@ -4,9 +4,11 @@ from pathlib import Path
 
 # Import canonical paths
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
-from tools.cvr import paths
+from tools.cvr import paths, profiling
 from lint_common import die
 
+INPUTS = ("artifacts/test_results/*lint*.log",)
+
 
 def main() -> int:
   bad = []
@@ -24,4 +26,4 @@ def main() -> int:
   return 0
 
 if __name__ == "__main__":
-  raise SystemExit(main())
+  raise SystemExit(profiling.run_main("evidence_location_lint", main))
@@ -8,26 +8,40 @@ If the history directory is absent, it exits successfully with a warning.
 
 from __future__ import annotations
 
+import argparse
+import concurrent.futures
+import hashlib
 import json
+import os
 import re
 import sys
 from pathlib import Path
-from typing import List, Set, Tuple
-
-import jsonschema
+from typing import BinaryIO, Dict, List, Optional, Set, Tuple
 
 # Import canonical paths
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
-from tools.cvr import paths
+from tools.cvr import fscache, history_log, ndjson_io, paths, profiling
+
+import lint_common
+from lint_common import report, validate_paths
+import schema_validation
+
+HISTORY_SCHEMA = "history_schema.json"
 
-from lint_common import validate_paths
 
 def load_history_schema() -> dict:
-  schema_path = Path(__file__).parent.parent / "schemas/history_schema.json"
-  return json.loads(schema_path.read_text(encoding="utf-8"))
+  return schema_validation.load_schema(HISTORY_SCHEMA)
 
 
 HISTORY_DIR = paths.HISTORY_DIR
+INPUTS = ("artifacts/history", "artifacts/history/*.ndjson", "artifacts/history/agenda_state.json")
+# Bump when the checkpoint format changes. Changes to what lint_line() reports are
+# caught by rules_digest() instead.
+CHECKPOINT_VERSION = 1
+# Unvalidated ranges smaller than this are linted serially; pool startup would cost more.
+PARALLEL_MIN_BYTES = 8 << 20
+# Chunks per worker, so one slow chunk does not leave other workers idle.
+CHUNKS_PER_JOB = 4
 REQUIRED_ENTRY_KEYS = {"agenda_id", "hypothesis_id", "timestamp", "summary", "evidence"}
 HYP_RE = re.compile(r"^HYP-\d{4}$")
 AG_RE = re.compile(r"^AG-\d{6}$")
@@ -58,48 +72,273 @@ def validate_evidence_paths(paths: object, ctx: str) -> List[str]:
   return errors
 
 
-def lint_ndjson_file(path: Path) -> Tuple[List[str], Set[str], Set[str]]:
-  errors: List[str] = []
-  hyp_ids: Set[str] = set()
-  agenda_ids: Set[str] = set()
+LatestIds = Dict[history_log.RecordKey, Tuple[object, object]]
 
-  lines = path.read_text(encoding="utf-8").splitlines()
-  if not lines:
-    # Allow empty NDJSON files during initialization
-    return errors, hyp_ids, agenda_ids
 
-  schema = load_history_schema()
-  for lineno, line in enumerate(lines, start=1):
-    if not line.strip():
-      errors.append(format_error(f"{path}:{lineno}: blank line not allowed in NDJSON"))
-      continue
-    try:
-      entry = json.loads(line)
-    except json.JSONDecodeError as exc:
-      errors.append(format_error(f"{path}:{lineno}: invalid JSON: {exc}"))
-      continue
+def lint_line(path: Path, lineno: int, line: str, latest_ids: LatestIds) -> List[str]:
+  """Validate one NDJSON line and record the ids of its entry in ``latest_ids``.
 
-    try:
-      jsonschema.validate(instance=entry, schema=schema)
-    except jsonschema.ValidationError as exc:
-      errors.append(format_error(f"{path}:{lineno}: schema validation failed: {exc.message}"))
-      continue
+  The result depends only on the line's content (and its position), which is
+  what lets checkpoints and chunked linting reuse it.
+  """
+  if not line.strip():
+    return [format_error(f"{path}:{lineno}: blank line not allowed in NDJSON")]
+  try:
+    entry = json.loads(line)
+  except json.JSONDecodeError as exc:
+    return [format_error(f"{path}:{lineno}: invalid JSON: {exc}")]
+
+  schema_error = schema_validation.error_message(HISTORY_SCHEMA, entry)
+  if schema_error is not None:
+    return [format_error(f"{path}:{lineno}: schema validation failed: {schema_error}")]
+
+  rtype = entry["record_type"]
+
+  # Evidence paths still need custom check (against repo root etc)
+  errors = validate_evidence_paths(entry.get("evidence"), f"{path}:{lineno}")
+
+  # ID tracking for cross-check
+  if rtype != "journal":
+    key = history_log.record_key(entry)
+    if key[1] is None:
+      key = (None, f"line {lineno}")  # no identity, so nothing can supersede it
+    latest_ids[key] = (entry.get("agenda_id"), entry.get("hypothesis_id"))
+  return errors
 
-    rtype = entry["record_type"]
 
-    # Evidence paths still need custom check (against repo root etc)
-    errors.extend(validate_evidence_paths(entry.get("evidence"), f"{path}:{lineno}"))
+def collected_ids(latest_ids: LatestIds) -> Tuple[Set[str], Set[str]]:
+  agenda_ids = {agenda_id for agenda_id, _ in latest_ids.values() if agenda_id}
+  hyp_ids = {hypothesis_id for _, hypothesis_id in latest_ids.values() if hypothesis_id}
+  return hyp_ids, agenda_ids
 
-    # ID tracking for cross-check
-    if rtype != "journal":
-      agenda_id = entry.get("agenda_id")
-      hypothesis_id = entry.get("hypothesis_id")
-      if agenda_id: agenda_ids.add(agenda_id)
-      if hypothesis_id: hyp_ids.add(hypothesis_id)
 
+def lint_ndjson_file(
+  path: Path, checkpoints: Optional[Dict[str, Dict]] = None, jobs: int = 1
+) -> Tuple[List[str], Set[str], Set[str]]:
+  """Validate every line; collect ids from the latest state of each record.
+
+  History logs may carry appended delta records, so a later line for the same
+  record key supersedes earlier ones for the agenda_state cross-check.
+
+  ``checkpoints`` maps file paths to the lint state after the last complete line
+  validated on a previous run. If the file still starts with exactly the
+  checkpointed bytes (same SHA-256), only the new tail is validated; otherwise the
+  file is linted in full. The entry for ``path`` is updated in place.
+
+  With ``jobs`` > 1, a large unvalidated range is split at line boundaries and
+  linted on a process pool; results are merged in line order, so the output is
+  identical to the serial linter's.
+  """
+  key = str(path)
+  checkpoint = checkpoints.get(key) if checkpoints is not None else None
+  errors: List[str] = []
+  latest_ids: LatestIds = {}
+  offset = 0
+  lineno = 0
+  digest = hashlib.sha256()
+  saved = checkpoints is None
+  unchanged = False
+
+  # Empty NDJSON files are allowed during initialization (the loop never runs).
+  with open(path, "rb") as f:
+    st = os.fstat(f.fileno())
+    if checkpoint and checkpoint_unchanged(checkpoint, st):
+      errors = list(checkpoint["errors"])
+      latest_ids = checkpoint_ids(checkpoint)
+      saved = unchanged = True
+      f.seek(checkpoint["offset"])
+    elif checkpoint and prefix_matches(f, checkpoint, digest):
+      errors = list(checkpoint["errors"])
+      latest_ids = checkpoint_ids(checkpoint)
+      offset = checkpoint["offset"]
+      lineno = checkpoint["lineno"]
+    else:
+      f.seek(0)
+      digest = hashlib.sha256()
+
+    if jobs > 1 and not unchanged:
+      complete_end = complete_lines_end(f, st.st_size)
+      if complete_end - offset >= PARALLEL_MIN_BYTES:
+        lineno = lint_parallel(path, f, offset, complete_end, lineno, jobs, digest, errors, latest_ids)
+        offset = complete_end
+      f.seek(offset)
+
+    for raw in f:
+      lineno += 1
+      if not raw.endswith(b"\n") and not saved:
+        # A partial last line may still grow, so checkpoint just before it.
+        save_checkpoint(checkpoints, key, st, offset, lineno - 1, digest, errors, latest_ids, complete=False)
+        saved = True
+      errors.extend(lint_line(path, lineno, ndjson_io.decode_line(raw), latest_ids))
+      digest.update(raw)
+      offset += len(raw)
+
+  if not saved:
+    save_checkpoint(checkpoints, key, st, offset, lineno, digest, errors, latest_ids, complete=True)
+  hyp_ids, agenda_ids = collected_ids(latest_ids)
   return errors, hyp_ids, agenda_ids
 
 
+def complete_lines_end(f: BinaryIO, size: int) -> int:
+  """Offset just past the last newline in ``f`` (0 if there is none)."""
+  end = size
+  while end > 0:
+    start = max(0, end - (1 << 16))
+    f.seek(start)
+    block = f.read(end - start)
+    idx = block.rfind(b"\n")
+    if idx >= 0:
+      return start + idx + 1
+    end = start
+  return 0
+
+
+def split_at_lines(f: BinaryIO, start: int, end: int, parts: int) -> List[int]:
+  """Boundaries (including ``start`` and ``end``) splitting [start, end) into about ``parts`` line-aligned ranges."""
+  bounds = [start]
+  step = (end - start) / parts
+  for i in range(1, parts):
+    f.seek(int(start + i * step) - 1)
+    f.readline()  # advance to the start of the next line
+    pos = f.tell()
+    if bounds[-1] < pos < end:
+      bounds.append(pos)
+  bounds.append(end)
+  return bounds
+
+
+def lint_chunk(path: Path, start: int, end: int, first_lineno: int) -> Tuple[List[str], List]:
+  """Lint the complete lines in [start, end) of ``path``; runs in a worker process."""
+  errors: List[str] = []
+  latest_ids: LatestIds = {}
+  with open(path, "rb") as f:
+    f.seek(start)
+    pos = start
+    lineno = first_lineno
+    for raw in f:
+      errors.extend(lint_line(path, lineno, ndjson_io.decode_line(raw), latest_ids))
+      lineno += 1
+      pos += len(raw)
+      if pos >= end:
+        break
+  return errors, list(latest_ids.items())
+
+
+def lint_parallel(
+  path: Path,
+  f: BinaryIO,
+  start: int,
+  end: int,
+  lineno: int,
+  jobs: int,
+  digest: "hashlib._Hash",
+  errors: List[str],
+  latest_ids: LatestIds,
+) -> int:
+  """Lint [start, end) of ``f`` (complete lines only) on ``jobs`` processes.
+
+  Line numbers for each chunk are counted up front (while hashing the range for
+  the checkpoint), so workers report the same messages as the serial linter.
+  Returns the line number of the last line linted.
+  """
+  bounds = split_at_lines(f, start, end, jobs * CHUNKS_PER_JOB)
+  tasks = []
+  f.seek(start)
+  for chunk_start, chunk_end in zip(bounds, bounds[1:]):
+    tasks.append((path, chunk_start, chunk_end, lineno + 1))
+    remaining = chunk_end - chunk_start
+    while remaining:
+      block = f.read(min(remaining, 1 << 20))
+      digest.update(block)
+      lineno += block.count(b"\n")
+      remaining -= len(block)
+
+  with concurrent.futures.ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+    for chunk_errors, chunk_ids in pool.map(lint_chunk, *zip(*tasks)):
+      errors.extend(chunk_errors)
+      latest_ids.update(chunk_ids)  # later chunks supersede earlier ones, as in file order
+  return lineno
+
+
+def checkpoint_unchanged(checkpoint: Dict, st: os.stat_result) -> bool:
+  """True if the file is exactly as it was when fully checkpointed (no hashing needed)."""
+  return (
+    checkpoint.get("complete") is True
+    and checkpoint.get("size") == st.st_size
+    and checkpoint.get("mtime_ns") == st.st_mtime_ns
+  )
+
+
+def prefix_matches(f: BinaryIO, checkpoint: Dict, digest: "hashlib._Hash") -> bool:
+  """Hash the checkpointed prefix of ``f`` into ``digest``; True if it is unchanged."""
+  remaining = checkpoint.get("offset", 0)
+  if remaining > os.fstat(f.fileno()).st_size:
+    return False  # truncated or rewritten
+  while remaining:
+    chunk = f.read(min(remaining, 1 << 20))
+    if not chunk:
+      return False
+    digest.update(chunk)
+    remaining -= len(chunk)
+  return digest.hexdigest() == checkpoint.get("prefix_sha256")
+
+
+def checkpoint_ids(checkpoint: Dict) -> LatestIds:
+  return {(rtype, ident): (agenda_id, hyp_id) for rtype, ident, agenda_id, hyp_id in checkpoint["latest_ids"]}
+
+
+def save_checkpoint(
+  checkpoints: Dict[str, Dict],
+  key: str,
+  st: os.stat_result,
+  offset: int,
+  lineno: int,
+  digest: "hashlib._Hash",
+  errors: List[str],
+  latest_ids: LatestIds,
+  complete: bool,
+) -> None:
+  checkpoints[key] = {
+    "complete": complete,
+    "offset": offset,
+    "lineno": lineno,
+    "size": st.st_size,
+    "mtime_ns": st.st_mtime_ns,
+    "prefix_sha256": digest.hexdigest(),
+    "errors": list(errors),
+    "latest_ids": [[rtype, ident, agenda_id, hyp_id] for (rtype, ident), (agenda_id, hyp_id) in latest_ids.items()],
+  }
+
+
+def rule_sources() -> List[Path]:
+  """Files that decide what lint_line() reports: the history schema and the linting code."""
+  return [
+    schema_validation.SCHEMA_DIR / HISTORY_SCHEMA,
+    Path(__file__).resolve(),
+    Path(lint_common.__file__).resolve(),
+    Path(schema_validation.__file__).resolve(),
+  ]
+
+
+def rules_digest() -> str:
+  """SHA-256 over rule_sources(); checkpoints made under other rules are discarded."""
+  digest = hashlib.sha256()
+  for source in rule_sources():
+    digest.update(f"{source.name}\0{fscache.hash_file(source)}\0".encode("utf-8"))
+  return digest.hexdigest()
+
+
+def load_checkpoints(cache_path: Path) -> Dict[str, Dict]:
+  data = fscache.load_cache(cache_path, CHECKPOINT_VERSION)
+  if data.get("rules") != rules_digest():
+    return {}
+  return data.get("files", {})
+
+
+def save_checkpoints(cache_path: Path, checkpoints: Dict[str, Dict]) -> None:
+  fscache.save_cache(cache_path, CHECKPOINT_VERSION, {"rules": rules_digest(), "files": checkpoints})
+
+
 def lint_agenda_state(path: Path, hist_hypotheses: Set[str], hist_agenda: Set[str]) -> List[str]:
   errors: List[str] = []
   try:
@@ -185,7 +424,31 @@ def collect_history_files() -> List[Path]:
   return sorted(HISTORY_DIR.glob("*.ndjson"))
 
 
-def main() -> int:
+def positive_int(value: str) -> int:
+  number = int(value)
+  if number < 1:
+    raise argparse.ArgumentTypeError("must be >= 1")
+  return number
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+  parser = argparse.ArgumentParser(description="Lint history NDJSON logs and agenda_state.json.")
+  parser.add_argument(
+    "--no-cache",
+    action="store_true",
+    help="Lint every line instead of resuming from artifacts/cache/history_lint.json",
+  )
+  parser.add_argument(
+    "--jobs",
+    type=positive_int,
+    default=os.cpu_count() or 1,
+    help=(
+      "Worker processes for linting large files (default: CPU count; "
+      f"less than {PARALLEL_MIN_BYTES >> 20} MiB of unvalidated lines is always linted in this process)"
+    ),
+  )
+  args = parser.parse_args([] if argv is None else argv)
+
   if not HISTORY_DIR.exists():
     print("history_lint: history directory not found; skipping")
     return 0
@@ -194,13 +457,19 @@ def main() -> int:
   all_errors: List[str] = []
   hyp_ids: Set[str] = set()
   agenda_ids: Set[str] = set()
+  checkpoints = None if args.no_cache else load_checkpoints(paths.HISTORY_LINT_CACHE)
+  history_files = collect_history_files()
 
-  for ndjson_file in collect_history_files():
-    errors, hyp_set, ag_set = lint_ndjson_file(ndjson_file)
+  for ndjson_file in history_files:
+    errors, hyp_set, ag_set = lint_ndjson_file(ndjson_file, checkpoints, args.jobs)
     all_errors.extend(errors)
     hyp_ids.update(hyp_set)
     agenda_ids.update(ag_set)
 
+  if checkpoints is not None:
+    current = {str(p) for p in history_files}
+    save_checkpoints(paths.HISTORY_LINT_CACHE, {k: v for k, v in checkpoints.items() if k in current})
+
   agenda_state = HISTORY_DIR / "agenda_state.json"
   if agenda_state.exists():
     all_errors.extend(lint_agenda_state(agenda_state, hyp_ids, agenda_ids))
@@ -209,7 +478,7 @@ def main() -> int:
 
   if all_errors:
     for err in all_errors:
-      print(err, file=sys.stderr)
+      report(err)
     return 1
 
   print("history_lint: OK")
@@ -217,4 +486,4 @@ def main() -> int:
 
 
 if __name__ == "__main__":
-  raise SystemExit(main())
+  raise SystemExit(profiling.run_main("history_lint", lambda: main(sys.argv[1:])))
@@ -5,12 +5,14 @@ from pathlib import Path
 
 # Import canonical paths
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
-from tools.cvr import paths
+from tools.cvr import paths, profiling
 
 from lint_common import die
 
 ALLOWED = {"software", "writing", "research", "art", "mixed", "unknown"}
 
+INPUTS = ("artifacts/intent/project_intent.md",)
+
 def parse_frontmatter(txt: str) -> dict[str, str]:
   # Minimal YAML frontmatter parser for key: value pairs and lists.
   m = re.match(r"(?s)\A---\s*\n(.*?)\n---\s*\n", txt)
@@ -63,4 +65,4 @@ def main() -> int:
   return 0
 
 if __name__ == "__main__":
-  raise SystemExit(main())
+  raise SystemExit(profiling.run_main("intent_lint", main))
@@ -6,8 +6,8 @@ from pathlib import Path
 
 # Import canonical paths
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
-from tools.cvr import paths
-from typing import List
+from tools.cvr import paths, profiling
+from typing import List, Optional
 
 """Lint journal artifacts for policy compliance.
 
@@ -17,14 +17,17 @@ Enforces:
 - Path hygiene (no absolute paths or file URLs)
 """
 
-from lint_common import validate_paths
+from lint_common import iter_path_violations, parse_diagnostic, record
 
 HEADER_REQ = "### Deep Thoughts, by an Agent"
 DISCLAIMER_REQ = "*Editor’s note: This entry is a dramatized reconstruction of a deterministic decision process, derived from run artifacts.*"
 
+INPUTS = ("artifacts/journal", "artifacts/journal/*.md")
 
-def format_error(path: Path, msg: str) -> str:
-    return f"journal_lint: ERROR: {path.name}: {msg}"
+
+def format_error(path: Path, msg: str, line: Optional[int] = None, column: Optional[int] = None) -> str:
+    where = path.name if line is None else f"{path.name}:{line}:{column}"
+    return f"journal_lint: ERROR: {where}: {msg}"
 
 
 def lint_file(path: Path) -> List[str]:
@@ -53,9 +56,8 @@ def lint_file(path: Path) -> List[str]:
         errors.append(format_error(path, "missing required editor disclaimer"))
 
     # 3. Path Safety
-    path_error = validate_paths(text)
-    if path_error:
-        errors.append(format_error(path, path_error))
+    for violation in iter_path_violations(text):
+        errors.append(format_error(path, violation.message, violation.line, violation.column))
     
     return errors
 
@@ -70,7 +72,18 @@ def main() -> int:
     all_errors: List[str] = []
     
     for journal_file in sorted(journal_dir.glob("*.md")):
-        all_errors.extend(lint_file(journal_file))
+        errors = lint_file(journal_file)
+        for err in errors:
+            # Messages name the file only; record the repo-relative path.
+            diagnostic = parse_diagnostic(err)
+            record(
+                "journal_lint",
+                diagnostic["message"],
+                file=journal_file.as_posix(),
+                line=diagnostic["line"],
+                column=diagnostic["column"],
+            )
+        all_errors.extend(errors)
 
     if all_errors:
         for err in all_errors:
@@ -82,4 +95,4 @@ def main() -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(profiling.run_main("journal_lint", main))
@@ -1,25 +1,20 @@
 #!/usr/bin/env python3
 import sys
-import re
 from pathlib import Path
 
 # Import canonical paths
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
-from tools.cvr import paths
+from tools.cvr import paths, profiling
 
-from lint_common import die, ABS_PATH_RE, TRUNC_RE
+from lint_common import die, report_path_violations
 
-# Match actual file:// URLs (file:// followed by non-whitespace/non-backtick chars)
-FILE_URL_PATTERN = re.compile(r"file://[^\s`]+")
+INPUTS = ("artifacts/history/lessons-learned.md",)
 
-
-def strip_backtick_content(text: str) -> str:
-  """Remove content within backticks to avoid false positives from examples."""
-  # Remove inline code (single backticks)
-  text = re.sub(r"`[^`]*`", "", text)
-  # Remove code blocks (triple backticks)
-  text = re.sub(r"```[^`]*```", "", text, flags=re.DOTALL)
-  return text
+PATH_MESSAGES = {
+  "file_url": "lessons-learned.md contains file://; use repo-relative paths only",
+  "absolute_path": "lessons-learned.md appears to contain an absolute path; use repo-relative paths only",
+  "truncation": "lessons-learned.md contains '...'; do not truncate evidence pointers",
+}
 
 
 def main() -> int:
@@ -35,21 +30,13 @@ def main() -> int:
   if "- Evidence:" not in txt:
     return die("lessons_lint", "missing Evidence field in template or entries")
 
-  if FILE_URL_PATTERN.search(txt):
-    return die("lessons_lint", "lessons-learned.md contains file://; use repo-relative paths only")
-
-  # Strip backtick content before checking for patterns that might appear in documentation
-  txt_no_code = strip_backtick_content(txt)
-
-  if ABS_PATH_RE.search(txt_no_code):
-    return die("lessons_lint", "lessons-learned.md appears to contain an absolute path; use repo-relative paths only")
-
-  if TRUNC_RE.search(txt_no_code):
-    return die("lessons_lint", "lessons-learned.md contains '...'; do not truncate evidence pointers")
+  # Absolute paths and '...' inside code are examples in the documentation, not evidence.
+  if report_path_violations("lessons_lint", p, txt, PATH_MESSAGES):
+    return 1
 
   print("lessons_lint: OK")
   return 0
 
 if __name__ == "__main__":
-  raise SystemExit(main())
+  raise SystemExit(profiling.run_main("lessons_lint", main))
 
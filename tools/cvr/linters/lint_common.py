@@ -2,29 +2,71 @@
 """Shared utilities for lint scripts.
 
 This module consolidates common functionality used across multiple lint scripts:
-- Error handling (die function)
+- Error handling (die function) and the diagnostics sink behind it
 - Regex patterns for path validation
-- File-finding utilities
-- Path validation functions
+- File-finding utilities (the run artifact index)
+- Path validation functions and the single-pass path hygiene scanner
 """
+import os
 import re
 import sys
+import time
 from pathlib import Path
 
 # Import canonical paths
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
-from tools.cvr import paths
-from typing import Optional
+from tools.cvr import fscache, paths
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 
 # Common regex patterns for validation
 ABS_PATH_RE = re.compile(r"(^|\s)(/|[A-Za-z]:\\)")
 TRUNC_RE = re.compile(r"\.\.\.")
 FILE_URL_RE = re.compile(r"file://")
+# "tool: ERROR: [file[:line[:column]]: ]message"; a file is one token with a "." or "/", followed by a colon.
+DIAGNOSTIC_RE = re.compile(
+  r"(?P<tool>\w+): ERROR: (?P<message>(?:(?P<file>[^\s:]*[./][^\s:]*?)"
+  r"(?::(?P<line>\d+)(?::(?P<column>\d+))?)?: )?.*)",
+  re.S,
+)
+
+# Every diagnostic reported in this process, in order, as dicts with tool, message,
+# file and line (None when unknown). verify_all.py drains it after each linter for
+# its structured (JSON/SARIF) results.
+DIAGNOSTICS: List[Dict] = []
+
+
+def record(
+  tool: str, msg: str, file: Optional[str] = None, line: Optional[int] = None, column: Optional[int] = None
+) -> None:
+  """Add a diagnostic to DIAGNOSTICS without printing anything."""
+  DIAGNOSTICS.append({"tool": tool, "message": msg, "file": file, "line": line, "column": column})
+
+
+def parse_diagnostic(text: str) -> Optional[Dict]:
+  """Split a "tool: ERROR: ..." line into a diagnostic dict; None for other text.
+
+  The message keeps any leading location, exactly as printed, so it still
+  matches the DiagnosticDB rules written against the free-text output.
+  """
+  m = DIAGNOSTIC_RE.fullmatch(text.strip())
+  if m is None:
+    return None
+  line, column = (int(m.group(k)) if m.group(k) else None for k in ("line", "column"))
+  return {"tool": m.group("tool"), "message": m.group("message"), "file": m.group("file"), "line": line, "column": column}
+
+
+def report(text: str) -> None:
+  """Print a "tool: ERROR: ..." line to stderr and record it as a diagnostic."""
+  print(text, file=sys.stderr)
+  diagnostic = parse_diagnostic(text)
+  if diagnostic is not None:
+    DIAGNOSTICS.append(diagnostic)
 
 
 def die(script_name: str, msg: str) -> int:
-  """Print error message to stderr and return exit code 1.
+  """Print error message to stderr, record it, and return exit code 1.
   
   Args:
     script_name: Name of the calling script (for error prefix)
@@ -33,10 +75,147 @@ def die(script_name: str, msg: str) -> int:
   Returns:
     Exit code 1
   """
-  print(f"{script_name}: ERROR: {msg}", file=sys.stderr)
+  report(f"{script_name}: ERROR: {msg}")
   return 1
 
 
+# Bump when the persisted run artifact index changes shape.
+RUN_INDEX_VERSION = 1
+# Directory mtimes can be coarser than the time between two writes, so a
+# directory modified this close to (or after) the walk may have changed unseen.
+RACY_MTIME_NS = 1_000_000_000
+
+
+def _mtime_ns(path: Path) -> int:
+  try:
+    return path.stat().st_mtime_ns
+  except OSError:
+    return -1
+
+
+def _run_of(rel: str) -> str:
+  """The run id (top-level directory) of a path relative to the runs tree; "" for loose files."""
+  return rel.split("/", 1)[0] if "/" in rel else ""
+
+
+class RunArtifactIndex:
+  """Files under the runs tree by name, each list in run-ID order.
+
+  Built by one os.scandir() walk (symlinked directories are not followed, as with
+  Path.rglob). Run ids sort by directory name, which is chronological for the
+  YYYY-MM-DD_HHMMSS ids close_run and journal already order runs by; within a
+  run, files come before subdirectories. The mtime of every directory walked is
+  recorded, so is_current() notices files added, removed or renamed anywhere in
+  the tree by stat-ing directories instead of listing them again. An index with
+  a directory modified within RACY_MTIME_NS of the walk is not settled() and is
+  never trusted from disk.
+  """
+
+  def __init__(self, root: Path, files: Dict[str, List[str]], dirs: Dict[str, int], built_ns: int) -> None:
+    self.root = root
+    # File name -> paths relative to root, in run-ID order.
+    self.files = files
+    # Directory relative to root ("" for root itself) -> mtime_ns; -1 if root is missing.
+    self.dirs = dirs
+    # Wall clock when the walk started.
+    self.built_ns = built_ns
+
+  @classmethod
+  def build(cls, root: Path) -> "RunArtifactIndex":
+    built_ns = time.time_ns()
+    files: Dict[str, List[str]] = {}
+    dirs: Dict[str, int] = {"": _mtime_ns(root)}
+
+    def walk(directory: Path, prefix: str) -> None:
+      try:
+        entries = sorted(os.scandir(directory), key=lambda e: e.name)
+      except OSError:
+        return
+      subdirs = []
+      for entry in entries:
+        try:
+          if entry.is_dir(follow_symlinks=False):
+            subdirs.append(entry)
+          elif entry.is_file():
+            files.setdefault(entry.name, []).append(prefix + entry.name)
+        except OSError:
+          continue
+      for entry in subdirs:
+        rel = prefix + entry.name
+        dirs[rel] = _mtime_ns(Path(entry.path))
+        walk(Path(entry.path), rel + "/")
+
+    if dirs[""] != -1:
+      walk(root, "")
+    return cls(root, files, dirs, built_ns)
+
+  def settled(self) -> bool:
+    """True if no directory was modified within RACY_MTIME_NS of the walk."""
+    racy = self.built_ns - RACY_MTIME_NS
+    return all(mtime < racy for mtime in self.dirs.values())
+
+  def is_current(self) -> bool:
+    return self.settled() and all(
+      _mtime_ns(self.root / rel if rel else self.root) == mtime for rel, mtime in self.dirs.items()
+    )
+
+  def run_ids(self) -> List[str]:
+    """Run directories, in run-ID order."""
+    return [rel for rel in self.dirs if rel and "/" not in rel]
+
+  def find_all(self, filename: str) -> List[Path]:
+    """Every file named ``filename`` under the runs tree, in run-ID order."""
+    return [self.root / rel for rel in self.files.get(filename, ())]
+
+  def latest(self, filename: str) -> Optional[Path]:
+    """``filename`` from the latest run that has one (the shallowest copy in that run), or None."""
+    found = self.files.get(filename)
+    if not found:
+      return None
+    run = _run_of(found[-1])
+    return self.root / next(rel for rel in found if _run_of(rel) == run)
+
+  def to_json(self) -> Dict:
+    return {"root": os.path.abspath(self.root), "files": self.files, "dirs": self.dirs, "built_ns": self.built_ns}
+
+
+# Indexes built or loaded in this process, by absolute runs directory.
+_run_indexes: Dict[str, RunArtifactIndex] = {}
+
+
+def run_artifact_index(
+  runs_dir: Optional[Path] = None, cache_path: Optional[Path] = paths.RUN_ARTIFACT_INDEX, refresh: bool = False
+) -> RunArtifactIndex:
+  """The artifact index for ``runs_dir`` (default artifacts/history/runs/).
+
+  Memoized per process: once built or loaded, the index is trusted for the rest
+  of the process (unless the tree was missing). ``refresh`` re-checks it against
+  the filesystem first, for long-lived processes such as verify_all --watch. The copy persisted to
+  ``cache_path`` (None to skip) is reused only while every recorded directory
+  mtime still matches, and is rewritten only when a rebuild has something new
+  to record.
+  """
+  root = paths.RUNS_DIR if runs_dir is None else runs_dir
+  key = os.path.abspath(root)
+  previous = _run_indexes.get(key)
+  # A missing tree costs one stat to re-check, so it is never trusted blindly.
+  if previous is not None and (previous.is_current() if refresh or previous.dirs[""] == -1 else True):
+    return previous
+  if previous is None and cache_path is not None:
+    data = fscache.load_cache(cache_path, RUN_INDEX_VERSION)
+    if data.get("root") == key:
+      previous = RunArtifactIndex(root, data["files"], data["dirs"], data["built_ns"])
+      if previous.is_current():
+        _run_indexes[key] = previous
+        return previous
+  index = _run_indexes[key] = RunArtifactIndex.build(root)
+  # An unchanged tree that is still unsettled would not be trusted from disk either.
+  unchanged = previous is not None and previous.files == index.files and previous.dirs == index.dirs
+  if cache_path is not None and index.dirs[""] != -1 and not (unchanged and not index.settled()):
+    fscache.save_cache(cache_path, RUN_INDEX_VERSION, index.to_json())
+  return index
+
+
 def find_run_artifact(filename: str) -> Optional[Path]:
   """Find a file under artifacts/history/runs/ hierarchy.
   
@@ -44,15 +223,9 @@ def find_run_artifact(filename: str) -> Optional[Path]:
     filename: Name of the file to find
     
   Returns:
-    Path to the first matching file, or None if not found
+    Path to the matching file from the latest run that has one, or None if not found
   """
-  runs = paths.RUNS_DIR
-  if not runs.exists():
-    return None
-  for p in runs.rglob(filename):
-    if p.is_file():
-      return p
-  return None
+  return run_artifact_index().latest(filename)
 
 
 def validate_no_file_urls(text: str) -> Optional[str]:
@@ -97,6 +270,122 @@ def validate_no_truncation(text: str) -> Optional[str]:
   return None
 
 
+# Path hygiene problems in priority order, with the validate_no_* message for each.
+PATH_MESSAGES = {
+  "file_url": "contains file://; use repo-relative paths only",
+  "absolute_path": "appears to contain an absolute path; use repo-relative paths only",
+  "truncation": "contains '...'; do not truncate evidence pointers",
+}
+# FILE_URL_RE, ABS_PATH_RE and TRUNC_RE as one alternation.
+PATH_HYGIENE_RE = re.compile(r"(?P<file_url>file://)|(?<!\S)(?P<absolute_path>/|[A-Za-z]:\\)|(?P<truncation>\.\.\.)")
+# A fence opens with 3+ backticks (no backticks after them on the line) or 3+ tildes.
+FENCE_RE = re.compile(r" {0,3}(`{3,}(?=[^`]*$)|~{3,})")
+BACKTICKS_RE = re.compile(r"`+")
+
+
+@dataclass(frozen=True)
+class PathViolation:
+  """One path hygiene problem: its kind (a PATH_MESSAGES key) and 1-based position."""
+
+  kind: str
+  line: int
+  column: int
+
+  @property
+  def message(self) -> str:
+    return PATH_MESSAGES[self.kind]
+
+
+def code_spans(line: str) -> List[Tuple[int, int]]:
+  """[start, end) ranges of inline code: a backtick run up to the next run of the same length."""
+  spans = []
+  runs = list(BACKTICKS_RE.finditer(line))
+  i = 0
+  while i < len(runs):
+    closer = next((j for j in range(i + 1, len(runs)) if len(runs[j].group()) == len(runs[i].group())), None)
+    if closer is None:
+      i += 1
+      continue
+    spans.append((runs[i].start(), runs[closer].end()))
+    i = closer + 1
+  return spans
+
+
+def iter_markdown_lines(lines: Iterable[str]) -> Iterator[Tuple[int, str, bool]]:
+  """Yield (1-based line number, line, inside a fenced code block) for each line.
+
+  The fence delimiter lines themselves count as inside. A block closes at a
+  fence of the same character at least as long as the one that opened it.
+  """
+  fence = None  # the opening fence marker while inside a fenced block
+  for lineno, line in enumerate(lines, 1):
+    m = FENCE_RE.match(line)
+    if fence is None:
+      if m:
+        fence = m.group(1)
+        yield lineno, line, True
+        continue
+    elif m and m.group(1)[0] == fence[0] and len(m.group(1)) >= len(fence):
+      fence = None
+      yield lineno, line, True
+      continue
+    yield lineno, line, fence is not None
+
+
+def strip_code_spans(line: str) -> str:
+  """``line`` with its inline code spans removed."""
+  if "`" not in line:
+    return line
+  pieces = []
+  pos = 0
+  for start, end in code_spans(line):
+    pieces.append(line[pos:start])
+    pos = end
+  pieces.append(line[pos:])
+  return "".join(pieces)
+
+
+def iter_path_violations(text: str, skip_code: bool = True) -> Iterator[PathViolation]:
+  """Yield every path hygiene violation in ``text`` in document order, in one pass.
+
+  With ``skip_code`` (markdown documents), absolute paths and '...' inside fenced
+  code blocks and inline code are allowed, since they are examples rather than
+  evidence pointers; file URLs are flagged everywhere.
+  """
+  for lineno, line, fenced in iter_markdown_lines(text.splitlines()):
+    spans = None
+    for m in PATH_HYGIENE_RE.finditer(line):
+      kind = m.lastgroup
+      if skip_code and kind != "file_url":
+        if fenced:
+          continue
+        if spans is None:
+          spans = code_spans(line) if "`" in line else []
+        if any(start <= m.start() < end for start, end in spans):
+          continue
+      yield PathViolation(kind, lineno, m.start() + 1)
+
+
+def scan_paths(text: str, skip_code: bool = True) -> List[PathViolation]:
+  """Every path hygiene violation in ``text`` (see iter_path_violations)."""
+  return list(iter_path_violations(text, skip_code))
+
+
+def report_path_violations(
+  tool: str, path: Path, text: str, messages: Optional[Dict[str, str]] = None, skip_code: bool = True
+) -> int:
+  """Report each violation in ``path``'s ``text`` as "tool: ERROR: path:line:col: message".
+
+  ``messages`` overrides the PATH_MESSAGES text per kind. Returns the number reported.
+  """
+  count = 0
+  for violation in iter_path_violations(text, skip_code):
+    message = (messages or PATH_MESSAGES)[violation.kind]
+    report(f"{tool}: ERROR: {path.as_posix()}:{violation.line}:{violation.column}: {message}")
+    count += 1
+  return count
+
+
 def validate_paths(text: str) -> Optional[str]:
   """Run all path validation checks.
   
@@ -104,10 +393,12 @@ def validate_paths(text: str) -> Optional[str]:
     text: Text to validate
     
   Returns:
-    First error message encountered, or None if all validations pass
+    The message for the highest-priority problem found (file URL, then absolute
+    path, then truncation), or None if all validations pass
   """
-  for validator in [validate_no_file_urls, validate_no_absolute_paths, validate_no_truncation]:
-    error = validator(text)
-    if error:
-      return error
-  return None
+  # Evidence strings are short and almost always clean: two substring tests and
+  # one anchored regex reject them faster than the combined alternation can.
+  if "file://" not in text and "..." not in text and ABS_PATH_RE.search(text) is None:
+    return None
+  found = {m.lastgroup for m in PATH_HYGIENE_RE.finditer(text)}
+  return next((message for kind, message in PATH_MESSAGES.items() if kind in found), None)
@@ -2,6 +2,10 @@
 import re
 import sys
 from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Pattern, Tuple
+
+from lint_common import die, report
+from tools.cvr import profiling
 
 CANON_Q = "What are you trying to produce in this repo (software, book, research notes, something else), and what does 'done' look like for the first milestone?"
 
@@ -19,35 +23,129 @@ BANNED = [
   r"\bask.*override.*gitignore\b",
 ]
 
-def die(msg: str) -> int:
-  print(f"panic_style_lint: ERROR: {msg}", file=sys.stderr)
-  return 1
+INPUTS = (".agent/workflows", ".agent/workflows/*.md")
+
+
+def has_top_level_bar(pattern: str) -> bool:
+  """True if ``pattern`` is an alternation outside any group or character class."""
+  depth = 0
+  in_class = False
+  i = 0
+  while i < len(pattern):
+    c = pattern[i]
+    if c == "\\":
+      i += 2
+      continue
+    if in_class:
+      in_class = c != "]"
+    elif c == "[":
+      in_class = True
+    elif c == "(":
+      depth += 1
+    elif c == ")":
+      depth -= 1
+    elif c == "|" and depth == 0:
+      return True
+    i += 1
+  return False
+
+
+def leading_literal(pattern: str) -> Optional[str]:
+  """The literal first character after a leading \\b, or None if it cannot be factored out."""
+  m = re.match(r"\\b([a-z0-9])(?![?*+{])", pattern)
+  if m is None or has_top_level_bar(pattern):
+    return None
+  return m.group(1)
+
+
+def compile_banned(patterns: List[str]) -> Pattern:
+  """All ``patterns`` as one regex; a match starts wherever some pattern matches.
+
+  Patterns of the form \\b<letter>... are grouped by that letter behind a single
+  \\b, so at each position the engine tests one character per group instead of
+  every pattern; the rest are tried whole. Which patterns matched is worked out
+  per hit (see find_banned), which keeps the alternation free of capture
+  groups; those would stop the engine from skipping branches on their first character.
+  """
+  by_first: Dict[str, List[str]] = {}
+  rest = []
+  for pattern in patterns:
+    first = leading_literal(pattern)
+    if first is None:
+      rest.append(f"(?:{pattern})")
+    else:
+      by_first.setdefault(first, []).append(f"(?:{pattern[3:]})")
+  branches = [re.escape(first) + "(?:" + "|".join(tails) + ")" for first, tails in by_first.items()]
+  if branches:
+    rest.insert(0, r"\b(?:" + "|".join(branches) + ")")
+  return re.compile("|".join(rest) or r"(?!)")
+
+
+BANNED_RE = compile_banned(BANNED)
+BANNED_RES = [re.compile(pattern) for pattern in BANNED]
+
+
+def find_banned(line: str) -> Iterator[Tuple[int, str, str]]:
+  """Yield (1-based column, pattern, matched text) for every banned phrase in ``line``.
+
+  Reports exactly what re.finditer() of each BANNED pattern on its own would, in
+  column order: BANNED_RE only finds the positions where some pattern starts, and
+  every pattern is tried at each of them, so a phrase inside or overlapping
+  another match is still reported. Matching is case-insensitive; the patterns
+  never span lines, as before.
+  """
+  low = line.lower()
+  # Where each pattern's last reported match ended; like finditer, no match of a
+  # pattern starts inside its previous one.
+  resume = [0] * len(BANNED_RES)
+  m = BANNED_RE.search(low)
+  while m is not None:
+    pos = m.start()
+    for i, pattern in enumerate(BANNED_RES):
+      if pos < resume[i]:
+        continue
+      hit = pattern.match(low, pos)
+      if hit:
+        resume[i] = max(hit.end(), pos + 1)
+        yield pos + 1, pattern.pattern, hit.group()
+    m = BANNED_RE.search(low, pos + 1)
+
+
+def lint_workflow(path: Path) -> List[str]:
+  """Errors for one workflow file, from a single pass over its lines."""
+  errors = []
+  needs_question = path.name != "establish-intent.md"
+  precondition = intent_ref = question = False
+  with open(path, encoding="utf-8") as f:
+    for lineno, line in enumerate(f, 1):
+      line = line.rstrip("\r\n")
+      for column, pattern, text in find_banned(line):
+        errors.append(f"{path.as_posix()}:{lineno}:{column}: contains banned phrase {text!r} matching /{pattern}/")
+      if needs_question:
+        precondition = precondition or "Precondition:" in line
+        intent_ref = intent_ref or "establish-intent" in line
+        question = question or CANON_Q in line
+  if precondition and intent_ref and not question:
+    errors.append(f"{path.as_posix()}: missing canonical intent question text")
+  return errors
+
 
 def main() -> int:
   wf_dir = Path(".agent/workflows")
   if not wf_dir.exists():
-    return die("missing .agent/workflows directory")
+    return die("panic_style_lint", "missing .agent/workflows directory")
 
   bad = []
   for p in sorted(wf_dir.glob("*.md")):
-    txt = p.read_text(encoding="utf-8")
-    low = txt.lower()
-
-    for pat in BANNED:
-      if re.search(pat, low):
-        bad.append(f"{p.as_posix()} contains banned phrase matching /{pat}/")
-        break
-
-    if p.name != "establish-intent.md":
-      if "Precondition:" in txt and "establish-intent" in txt:
-        if CANON_Q not in txt:
-          bad.append(f"{p.as_posix()} missing canonical intent question text")
+    bad.extend(lint_workflow(p))
 
+  for error in bad:
+    report(f"panic_style_lint: ERROR: {error}")
   if bad:
-    return die("; ".join(bad))
+    return 1
 
   print("panic_style_lint: OK")
   return 0
 
 if __name__ == "__main__":
-  raise SystemExit(main())
+  raise SystemExit(profiling.run_main("panic_style_lint", main))
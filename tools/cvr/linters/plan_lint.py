@@ -3,6 +3,7 @@ import json
 import sys
 from pathlib import Path
 from lint_common import die, find_run_artifact
+from tools.cvr import profiling
 
 def load(path: Path) -> dict:
   try:
@@ -12,18 +13,18 @@ def load(path: Path) -> dict:
   except Exception as e:
     raise ValueError(str(e))
 
-import jsonschema
+import schema_validation
+
+PLAN_SCHEMA = "plan_schema.json"
+INPUTS = ("implementation_plan.json", "artifacts/history/runs/**/implementation_plan.json")
 
 def load_schema() -> dict:
-  schema_path = Path(__file__).parent.parent / "schemas/plan_schema.json"
-  return json.loads(schema_path.read_text(encoding="utf-8"))
+  return schema_validation.load_schema(PLAN_SCHEMA)
 
 def lint_obj(obj: object) -> None:
-  schema = load_schema()
-  try:
-    jsonschema.validate(instance=obj, schema=schema)
-  except jsonschema.ValidationError as e:
-    raise ValueError(f"schema validation failed: {e.message}")
+  error = schema_validation.error_message(PLAN_SCHEMA, obj)
+  if error is not None:
+    raise ValueError(f"schema validation failed: {error}")
 
 
 def main(argv: list[str]) -> int:
@@ -52,4 +53,4 @@ def main(argv: list[str]) -> int:
   return 0
 
 if __name__ == "__main__":
-  raise SystemExit(main(sys.argv))
+  raise SystemExit(profiling.run_main("plan_lint", lambda: main(sys.argv)))
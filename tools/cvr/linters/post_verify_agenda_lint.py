@@ -5,7 +5,7 @@ from pathlib import Path
 
 # Import canonical paths
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
-from tools.cvr import paths
+from tools.cvr import paths, profiling
 from lint_common import die
 
 
@@ -64,4 +64,4 @@ def main() -> int:
   return 0
 
 if __name__ == "__main__":
-  raise SystemExit(main())
+  raise SystemExit(profiling.run_main("post_verify_agenda_lint", main))
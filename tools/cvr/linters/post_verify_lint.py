@@ -4,9 +4,17 @@ from pathlib import Path
 
 # Import canonical paths
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
-from tools.cvr import paths
+from tools.cvr import paths, profiling
 import subprocess
-from lint_common import die, ABS_PATH_RE, TRUNC_RE
+from lint_common import die, report_path_violations
+
+INPUTS = ("artifacts/logs/post_verify_report.md", "tools/post_verify_agenda_lint.py", "AGENDA.md")
+
+PATH_MESSAGES = {
+  "file_url": "post_verify_report.md contains file://; use repo-relative paths only",
+  "absolute_path": "post_verify_report.md appears to contain an absolute path; use repo-relative paths only",
+  "truncation": "post_verify_report.md contains '...'; do not truncate evidence pointers",
+}
 
 
 def main() -> int:
@@ -25,12 +33,8 @@ def main() -> int:
   if missing:
     return die("post_verify_lint", f"post_verify_report.md missing required headings: {', '.join(missing)}")
 
-  if "file://" in txt:
-    return die("post_verify_lint", "post_verify_report.md contains file://; use repo-relative paths only")
-  if ABS_PATH_RE.search(txt):
-    return die("post_verify_lint", "post_verify_report.md appears to contain an absolute path; use repo-relative paths only")
-  if TRUNC_RE.search(txt):
-    return die("post_verify_lint", "post_verify_report.md contains '...'; do not truncate evidence pointers")
+  if report_path_violations("post_verify_lint", report, txt, PATH_MESSAGES):
+    return 1
 
   # Cross-check with AGENDA status
   helper = Path("tools/post_verify_agenda_lint.py")
@@ -44,4 +48,4 @@ def main() -> int:
   return 0
 
 if __name__ == "__main__":
-  raise SystemExit(main())
+  raise SystemExit(profiling.run_main("post_verify_lint", main))
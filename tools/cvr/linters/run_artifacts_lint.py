@@ -4,8 +4,19 @@ from pathlib import Path
 
 # Import canonical paths
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
-from tools.cvr import paths
-from lint_common import die, find_run_artifact
+from tools.cvr import profiling
+from lint_common import die, run_artifact_index
+
+INPUTS = (
+  "implementation_plan.md",
+  "implementation_plan.json",
+  "walkthrough.md",
+  "*.resolved*",
+  "*.metadata.json",
+  "artifacts/history/runs/*",
+  "artifacts/history/runs/**/implementation_plan.json",
+  "artifacts/history/runs/**/walkthrough.md",
+)
 
 
 def main() -> int:
@@ -23,23 +34,16 @@ def main() -> int:
   if bad:
     return die("run_artifacts_lint", "root contains forbidden execution artifacts: " + ", ".join(sorted(set(bad))))
 
-  # Check if there are any run directories
-  runs_dir = paths.RUNS_DIR
-  has_runs = False
-  if runs_dir.exists():
-    for child in runs_dir.iterdir():
-      if child.is_dir():
-        has_runs = True
-        break
-  
-  if not has_runs:
+  # Check if there are any run directories (one walk of the runs tree answers every question below)
+  index = run_artifact_index()
+  if not index.run_ids():
     # No runs verify, so we are good (hygiene already checked)
     print("run_artifacts_lint: OK (no runs)")
     return 0
 
   # Require at least one run folder with these artifacts if runs exist.
-  plan = find_run_artifact("implementation_plan.json")
-  w = find_run_artifact("walkthrough.md")
+  plan = index.latest("implementation_plan.json")
+  w = index.latest("walkthrough.md")
   if plan is None:
     return die("run_artifacts_lint", "runs exist but no artifacts/history/runs/**/implementation_plan.json found")
   if w is None:
@@ -51,4 +55,4 @@ def main() -> int:
   return 0
 
 if __name__ == "__main__":
-  raise SystemExit(main())
+  raise SystemExit(profiling.run_main("run_artifacts_lint", main))
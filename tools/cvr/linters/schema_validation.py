@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""Compiled, cached JSON Schema validation shared by the linters.
+
+jsonschema.validate() re-checks the schema and builds a new validator on every
+call. Here each schema under tools/cvr/schemas/ is loaded, checked and compiled
+once per process. On top of that, schemas that only use a simple keyword subset
+(types, required, properties, enum, pattern, lengths, items) are compiled into a
+plain-Python predicate that accepts valid instances quickly. Only instances the
+predicate rejects go through jsonschema, which produces the error message, so
+messages are exactly those of jsonschema.validate().
+"""
+
+import functools
+import json
+import re
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import jsonschema
+
+SCHEMA_DIR = Path(__file__).resolve().parent.parent / "schemas"
+
+Predicate = Callable[[object], bool]
+
+# Keywords that never affect validity.
+ANNOTATIONS = {"$schema", "$id", "title", "description", "default", "examples", "$comment", "format"}
+
+
+@functools.lru_cache(maxsize=None)
+def load_schema(name: str) -> dict:
+  """Load a schema from tools/cvr/schemas/ (once per process). Do not mutate the result."""
+  return json.loads((SCHEMA_DIR / name).read_text(encoding="utf-8"))
+
+
+@functools.lru_cache(maxsize=None)
+def validator_for(name: str) -> jsonschema.protocols.Validator:
+  """The checked, compiled jsonschema validator for a schema."""
+  schema = load_schema(name)
+  cls = jsonschema.validators.validator_for(schema)
+  cls.check_schema(schema)
+  return cls(schema)
+
+
+@functools.lru_cache(maxsize=None)
+def fast_path_for(name: str) -> Optional[Predicate]:
+  """A plain-Python validity predicate for a schema, or None if it uses unsupported keywords."""
+  return compile_predicate(load_schema(name))
+
+
+def error_message(name: str, instance: object) -> Optional[str]:
+  """Return the message jsonschema.validate() would raise for ``instance``, or None if valid."""
+  predicate = fast_path_for(name)
+  if predicate is not None and predicate(instance):
+    return None
+  error = jsonschema.exceptions.best_match(validator_for(name).iter_errors(instance))
+  return error.message if error is not None else None
+
+
+def _is_integer(value: object) -> bool:
+  if isinstance(value, bool):
+    return False
+  return isinstance(value, int) or (isinstance(value, float) and value.is_integer())
+
+
+def _is_number(value: object) -> bool:
+  return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+# Python expression testing each JSON type, and the type a guard must check before a keyword applies
+# (None: the keyword applies to instances of every type).
+TYPE_EXPRS = {
+  "object": "isinstance({v}, dict)",
+  "array": "isinstance({v}, list)",
+  "string": "isinstance({v}, str)",
+  "integer": "_is_integer({v})",
+  "number": "_is_number({v})",
+  "boolean": "isinstance({v}, bool)",
+  "null": "{v} is None",
+}
+KEYWORD_TYPES = {
+  "enum": None,
+  "required": "object",
+  "properties": "object",
+  "additionalProperties": "object",
+  "items": "array",
+  "minItems": "array",
+  "maxItems": "array",
+  "minLength": "string",
+  "maxLength": "string",
+  "minimum": "number",
+  "maximum": "number",
+  "pattern": "string",
+}
+
+
+class _Unsupported(Exception):
+  pass
+
+
+class _Generator:
+  """Emit the source of a predicate function for the supported keyword subset."""
+
+  def __init__(self) -> None:
+    self.lines = ["def validate(v0):"]
+    self.constants: Dict[str, object] = {"_is_integer": _is_integer, "_is_number": _is_number, "_MISSING": object()}
+    self.counter = 0
+
+  def constant(self, value: object) -> str:
+    name = f"c{len(self.constants)}"
+    self.constants[name] = value
+    return name
+
+  def emit(self, depth: int, line: str) -> None:
+    self.lines.append("  " * depth + line)
+
+  def schema(self, schema: object, var: str, depth: int) -> None:
+    if schema is True or schema == {}:
+      return
+    if not isinstance(schema, dict):
+      raise _Unsupported(schema)
+    known = None
+    declared = schema.get("type")
+    if declared is not None:
+      if not isinstance(declared, str) or declared not in TYPE_EXPRS:
+        raise _Unsupported(declared)
+      self.emit(depth, f"if not {TYPE_EXPRS[declared].format(v=var)}: return False")
+      known = declared
+    for keyword, value in schema.items():
+      if keyword in ANNOTATIONS or keyword == "type":
+        continue
+      if keyword not in KEYWORD_TYPES:
+        raise _Unsupported(keyword)
+      applies = KEYWORD_TYPES[keyword]
+      if applies is None:
+        self.keyword(keyword, value, schema, var, depth)
+      elif known is None or (known != applies and not (applies == "number" and known == "integer")):
+        if known is not None:
+          continue  # the keyword cannot apply to an instance of the declared type
+        self.emit(depth, f"if {TYPE_EXPRS[applies].format(v=var)}:")
+        self.keyword(keyword, value, schema, var, depth + 1)
+      else:
+        self.keyword(keyword, value, schema, var, depth)
+
+  def keyword(self, keyword: str, value: object, schema: dict, var: str, depth: int) -> None:
+    if keyword == "enum":
+      # Only string enums: a non-string instance can never equal a member, and
+      # set membership would mishandle unhashable values and 1 == True.
+      if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise _Unsupported(keyword)
+      self.emit(depth, f"if not isinstance({var}, str) or {var} not in {self.constant(frozenset(value))}: return False")
+    elif keyword == "required":
+      for key in value:
+        self.emit(depth, f"if {key!r} not in {var}: return False")
+    elif keyword == "properties":
+      for key, sub in value.items():
+        self.counter += 1
+        child = f"v{self.counter}"
+        self.emit(depth, f"{child} = {var}.get({key!r}, _MISSING)")
+        self.emit(depth, f"if {child} is not _MISSING:")
+        self.emit(depth + 1, "pass")
+        self.schema(sub, child, depth + 1)
+    elif keyword == "additionalProperties":
+      if value is True:
+        return
+      if value is not False or "patternProperties" in schema:
+        raise _Unsupported(keyword)
+      known = frozenset(schema.get("properties", {}))
+      self.emit(depth, f"if not {self.constant(known)}.issuperset({var}): return False")
+    elif keyword == "items":
+      if not isinstance(value, (dict, bool)):
+        raise _Unsupported(keyword)  # tuple validation
+      self.counter += 1
+      child = f"v{self.counter}"
+      self.emit(depth, f"for {child} in {var}:")
+      self.emit(depth + 1, "pass")
+      self.schema(value, child, depth + 1)
+    elif keyword in ("minItems", "maxItems", "minLength", "maxLength"):
+      if not _is_integer(value):
+        raise _Unsupported(keyword)
+      op = "<" if keyword.startswith("min") else ">"
+      self.emit(depth, f"if len({var}) {op} {int(value)}: return False")
+    elif keyword in ("minimum", "maximum"):
+      if not _is_number(value):
+        raise _Unsupported(keyword)
+      op = "<" if keyword == "minimum" else ">"
+      self.emit(depth, f"if {var} {op} {self.constant(value)}: return False")
+    elif keyword == "pattern":
+      self.emit(depth, f"if {self.constant(re.compile(value))}.search({var}) is None: return False")
+
+  def source(self) -> str:
+    return "\n".join(self.lines + ["  return True", ""])
+
+
+def _generate(schema: object) -> Optional[_Generator]:
+  generator = _Generator()
+  try:
+    generator.schema(schema, "v0", 1)
+  except _Unsupported:
+    return None
+  return generator
+
+
+def generate_source(schema: object) -> Optional[str]:
+  """Python source of the fast-path predicate for ``schema``, or None if unsupported."""
+  generator = _generate(schema)
+  return generator.source() if generator else None
+
+
+def compile_predicate(schema: object) -> Optional[Predicate]:
+  """Compile the supported draft-07 keyword subset into a predicate; None if unsupported.
+
+  The predicate MUST never accept an instance jsonschema would reject; anything
+  outside the subset makes the whole schema fall back to jsonschema.
+  """
+  generator = _generate(schema)
+  if generator is None:
+    return None
+  namespace = dict(generator.constants)
+  exec(compile(generator.source(), "<schema fast path>", "exec"), namespace)
+  return namespace["validate"]
@@ -4,16 +4,15 @@ from pathlib import Path
 
 # Import canonical paths
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
-from tools.cvr import paths
+from tools.cvr import paths, profiling
+from lint_common import die
 
-def die(msg: str) -> int:
-  print(f"template_baseline_lint: ERROR: {msg}", file=sys.stderr)
-  return 1
+INPUTS = ("requirements-verify.txt", "requirements.txt", "flake.nix", ".gitignore", ".agentsignore", "AGENTS.md", "AGENDA.md", ".agent", "artifacts/intent")
 
 def main() -> int:
   req_ok = any(Path(p).exists() for p in ["requirements-verify.txt", "requirements.txt", "flake.nix"])
   if not req_ok:
-    return die("missing verification requirements file: requirements-verify.txt, requirements.txt, or flake.nix")
+    return die("template_baseline_lint", "missing verification requirements file: requirements-verify.txt, requirements.txt, or flake.nix")
 
   required = [
     Path(".gitignore"),
@@ -25,10 +24,10 @@ def main() -> int:
   ]
   missing = [str(p) for p in required if not p.exists()]
   if missing:
-    return die("missing required template files/dirs: " + ", ".join(missing))
+    return die("template_baseline_lint", "missing required template files/dirs: " + ", ".join(missing))
 
   print("template_baseline_lint: OK")
   return 0
 
 if __name__ == "__main__":
-  raise SystemExit(main())
+  raise SystemExit(profiling.run_main("template_baseline_lint", main))
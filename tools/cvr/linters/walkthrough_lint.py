@@ -2,7 +2,16 @@
 import re
 import sys
 from pathlib import Path
-from lint_common import die, FILE_URL_RE, ABS_PATH_RE, TRUNC_RE, find_run_artifact
+from lint_common import die, find_run_artifact, report_path_violations
+from tools.cvr import profiling
+
+INPUTS = ("walkthrough.md", "artifacts/history/runs/**/walkthrough.md")
+
+PATH_MESSAGES = {
+  "file_url": "walkthrough contains file:// URLs; use repo-relative paths only",
+  "absolute_path": "walkthrough contains an absolute path; use repo-relative paths only",
+  "truncation": "walkthrough contains '...'; do not truncate evidence pointers",
+}
 
 def find_walkthrough() -> Path | None:
   root = Path("walkthrough.md")
@@ -22,12 +31,8 @@ def main() -> int:
 
   txt = p.read_text(encoding="utf-8")
 
-  if FILE_URL_RE.search(txt):
-    return die("walkthrough_lint", "walkthrough contains file:// URLs; use repo-relative paths only")
-  if ABS_PATH_RE.search(txt):
-    return die("walkthrough_lint", "walkthrough contains an absolute path; use repo-relative paths only")
-  if TRUNC_RE.search(txt):
-    return die("walkthrough_lint", "walkthrough contains '...'; do not truncate evidence pointers")
+  if report_path_violations("walkthrough_lint", p, txt, PATH_MESSAGES):
+    return 1
   if re.search(r"Artifacts\s*\(Brain\)", txt, flags=re.IGNORECASE):
     return die("walkthrough_lint", "walkthrough contains 'Artifacts (Brain)'; workspace artifacts only")
 
@@ -35,4 +40,4 @@ def main() -> int:
   return 0
 
 if __name__ == "__main__":
-  raise SystemExit(main())
+  raise SystemExit(profiling.run_main("walkthrough_lint", main))
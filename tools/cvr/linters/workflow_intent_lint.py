@@ -2,9 +2,10 @@
 import sys
 from pathlib import Path
 
-def die(msg: str) -> int:
-  print(f"workflow_intent_lint: ERROR: {msg}", file=sys.stderr)
-  return 1
+from lint_common import die
+from tools.cvr import profiling
+
+INPUTS = (".agent/workflows", ".agent/workflows/*.md")
 
 def workflow_requires_intent(txt: str) -> bool:
   # Accept either:
@@ -15,7 +16,7 @@ def workflow_requires_intent(txt: str) -> bool:
 def main() -> int:
   wf_dir = Path(".agent/workflows")
   if not wf_dir.exists():
-    return die("missing .agent/workflows directory")
+    return die("workflow_intent_lint", "missing .agent/workflows directory")
 
   bad = []
   for p in sorted(wf_dir.glob("*.md")):
@@ -26,10 +27,10 @@ def main() -> int:
       bad.append(p.as_posix())
 
   if bad:
-    return die("workflows missing intent requirement (must mention artifacts/intent/project_intent.md): " + ", ".join(bad))
+    return die("workflow_intent_lint", "workflows missing intent requirement (must mention artifacts/intent/project_intent.md): " + ", ".join(bad))
 
   print("workflow_intent_lint: OK")
   return 0
 
 if __name__ == "__main__":
-  raise SystemExit(main())
+  raise SystemExit(profiling.run_main("workflow_intent_lint", main))
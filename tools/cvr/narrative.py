@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Incremental rendering of artifacts/history/deep-thoughts.md.
+
+The narrative is the header followed by one section per journal, newest first.
+Rendering streams section by section, so memory is bounded by the largest single
+journal rather than by the whole narrative. A cache under artifacts/cache/ records
+each journal's content fingerprint and the byte range its section occupies in the
+previously written narrative. Unchanged sections are copied from that file
+instead of re-reading their journal, so adding one journal reads only that
+journal (plus one sequential pass over the old narrative).
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from tools.cvr import fscache
+
+HEADER = "# Deep Thoughts: A Journal Timeline\n\n*(Reverse chronological order)*\n"
+CACHE_VERSION = 1
+
+
+def journal_files(journal_dir: Path) -> List[Path]:
+    """Journals in narrative (reverse chronological) order."""
+    return sorted(journal_dir.glob("*.md"), reverse=True)
+
+
+def render_section(md_file: Path, last: bool) -> str:
+    """Render one journal's section, including the separator that precedes it.
+
+    The narrative as a whole is right-stripped, which only ever affects the final
+    section, so that one is rendered with ``last=True``.
+    """
+    content = md_file.read_text(encoding="utf-8")
+    section = f"\n\n## {md_file.stem}\n\n{content}\n"
+    return section.rstrip() + "\n" if last else section
+
+
+class NarrativeRenderer:
+    """Produce the narrative as a stream of pieces, reusing cached sections.
+
+    Iterate ``pieces()`` exactly once; afterwards ``save_cache()`` records where
+    each section landed so the next run can reuse it.
+    """
+
+    def __init__(self, repo_root: Path, journals: Optional[List[Path]], narrative_path: Path, cache_path: Optional[Path]):
+        self.repo_root = repo_root
+        self.journals = journals
+        self.narrative_path = narrative_path
+        self.cache_path = cache_path
+        self.entries: Dict[str, Dict] = {}
+        self.sections_read = 0
+        self._previous = self._load_previous() if cache_path else {}
+
+    def _load_previous(self) -> Dict[str, Dict]:
+        data = fscache.load_cache(self.cache_path, CACHE_VERSION)
+        narrative = data.get("narrative") or {}
+        try:
+            st = self.narrative_path.stat()
+        except (FileNotFoundError, NotADirectoryError):
+            return {}
+        if (
+            narrative.get("path") != str(self.narrative_path)
+            or narrative.get("size") != st.st_size
+            or narrative.get("mtime_ns") != st.st_mtime_ns
+        ):
+            return {}  # the narrative changed since we recorded its layout
+        return data.get("journals") or {}
+
+    def pieces(self) -> Iterator[str]:
+        if self.journals is None:
+            return  # no journal directory: empty narrative
+        if not self.journals:
+            yield HEADER.rstrip() + "\n"
+            return
+        yield HEADER
+        offset = len(HEADER.encode("utf-8"))
+        previous_file = open(self.narrative_path, "rb") if self._previous else None
+        try:
+            for index, md_file in enumerate(self.journals):
+                last = index == len(self.journals) - 1
+                key = md_file.relative_to(self.repo_root).as_posix()
+                cached = self._previous.get(key)
+                fingerprint = fscache.file_fingerprint(md_file, cached)
+                section = None
+                if previous_file and cached and cached.get("last") == last and fscache.same_content(cached, fingerprint):
+                    previous_file.seek(cached["offset"])
+                    data = previous_file.read(cached["length"])
+                    if len(data) == cached["length"]:
+                        section = data.decode("utf-8")
+                if section is None:
+                    section = render_section(md_file, last)
+                    self.sections_read += 1
+                length = len(section.encode("utf-8"))
+                self.entries[key] = dict(fingerprint, offset=offset, length=length, last=last)
+                offset += length
+                yield section
+        finally:
+            if previous_file:
+                previous_file.close()
+
+    def save_cache(self) -> None:
+        """Record the layout of the narrative that was just written from ``pieces()``."""
+        if not self.cache_path:
+            return
+        st = os.stat(self.narrative_path)
+        fscache.save_cache(
+            self.cache_path,
+            CACHE_VERSION,
+            {
+                "narrative": {"path": str(self.narrative_path), "size": st.st_size, "mtime_ns": st.st_mtime_ns},
+                "journals": self.entries,
+            },
+        )
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Streaming NDJSON reader/writer shared by the history tools.
+
+Readers yield one line at a time, so peak memory is bounded by the longest
+record rather than the size of the file. Writers stream lines into a temp file
+next to the target and atomically rename it into place, so a crash never leaves
+a half-written history behind.
+"""
+
+import contextlib
+import itertools
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, TextIO, Tuple
+
+
+def iter_lines(path: Path) -> Iterator[Tuple[int, str]]:
+    """Yield (lineno, line) for every line of ``path``, without the line terminator.
+
+    Line numbers are 1-based. Blank lines are yielded so callers can report them.
+    """
+    with open(path, "rb") as f:
+        for lineno, raw in enumerate(f, start=1):
+            yield lineno, decode_line(raw)
+
+
+def decode_line(raw: bytes) -> str:
+    if raw.endswith(b"\n"):
+        raw = raw[:-1]
+        if raw.endswith(b"\r"):
+            raw = raw[:-1]
+    return raw.decode("utf-8")
+
+
+def iter_records(path: Path) -> Iterator[Dict]:
+    """Yield each parseable JSON record in ``path``, skipping blank and invalid lines."""
+    if not path.exists():
+        return
+    for _, line in iter_lines(path):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            continue  # best effort
+
+
+def dumps(record: Dict) -> str:
+    """Canonical single-line encoding used for every history record."""
+    return json.dumps(record, sort_keys=True, separators=(",", ":"))
+
+
+@contextlib.contextmanager
+def atomic_writer(path: Path) -> Iterator[TextIO]:
+    """Open a temp file next to ``path`` for writing; rename it over ``path`` on success."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+
+def write_lines(path: Path, lines: Iterable[str]) -> int:
+    """Atomically write each line followed by a newline. Returns the number of lines."""
+    count = 0
+    with atomic_writer(path) as f:
+        for line in lines:
+            f.write(line)
+            f.write("\n")
+            count += 1
+    return count
+
+
+def write_records(path: Path, records: Iterable[Dict]) -> int:
+    """Atomically write records as canonical NDJSON. Returns the number of records."""
+    return write_lines(path, (dumps(rec) for rec in records))
+
+
+def iter_newline_chunks(chunks: Iterable[str]) -> Iterator[str]:
+    """Re-chunk arbitrary text pieces into lines that each end with "\n" (except a final partial line)."""
+    pending = ""
+    for chunk in chunks:
+        pending += chunk
+        *complete, pending = pending.split("\n")
+        for line in complete:
+            yield line + "\n"
+    if pending:
+        yield pending
+
+
+def first_difference(path: Path, chunks: Iterable[str]) -> Optional[int]:
+    """Compare generated text with the file at ``path`` one line at a time.
+
+    Returns the 1-based line number of the first differing line, or None when the
+    file content equals the concatenated chunks. A missing file compares equal to
+    empty output. Both sides are streamed and the comparison stops at the first
+    mismatch, so neither the file nor the generated text is held in memory.
+    """
+    generated = (line.encode("utf-8") for line in iter_newline_chunks(chunks))
+    try:
+        existing = open(path, "rb")
+    except FileNotFoundError:
+        existing = open(os.devnull, "rb")
+    with existing:
+        for lineno, (want, have) in enumerate(itertools.zip_longest(generated, existing), start=1):
+            if want != have:
+                return lineno
+    return None
@@ -34,6 +34,19 @@ LOGS_DIR = ARTIFACTS_ROOT / "logs"
 AGENT_MODE_FILE = LOGS_DIR / "agent_mode.json"
 CONTEXT_MANIFEST = LOGS_DIR / "context_manifest.md"
 POST_VERIFY_REPORT = LOGS_DIR / "post_verify_report.md"
+VERIFY_RESULTS_JSON = LOGS_DIR / "verify_results.json"
+VERIFY_RESULTS_SARIF = LOGS_DIR / "verify_results.sarif"
+PROFILE_DIR = LOGS_DIR / "profile"
+
+# Caches (derived data; always safe to delete)
+CACHE_DIR = ARTIFACTS_ROOT / "cache"
+AGGREGATE_RUN_CACHE = CACHE_DIR / "aggregate_runs.json"
+NARRATIVE_CACHE = CACHE_DIR / "narrative.json"
+HISTORY_ROW_CACHE = CACHE_DIR / "history_rows.json"
+HISTORY_LINT_CACHE = CACHE_DIR / "history_lint.json"
+CONTENT_LINT_CACHE = CACHE_DIR / "content_lint.json"
+LINT_RESULT_CACHE = CACHE_DIR / "lint_results.json"
+RUN_ARTIFACT_INDEX = CACHE_DIR / "run_artifacts.json"
 
 # Evidence directories
 DIFFS_DIR = ARTIFACTS_ROOT / "diffs"
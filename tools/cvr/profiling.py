@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""Opt-in cProfile and tracemalloc instrumentation for the CVR tools.
+
+Every CVR tool (aggregate_history, close_run, journal,
+generate_context_manifest and the linters) runs its main() through run_main(),
+which profiles it when asked to:
+
+  CVR_PROFILE=1 python3 tools/cvr/aggregate_history.py
+  python3 tools/cvr/linters/history_lint.py --profile
+  python3 tools/cvr/close_run.py --run-id ID --profile=cpu,mem
+
+The mode is "cpu" (cProfile), "mem" (tracemalloc) or both, comma-separated;
+"1" means cpu. --profile is removed from sys.argv before main() parses it.
+verify_all.py --profile sets CVR_PROFILE so every linter it runs is profiled.
+
+Results go to artifacts/logs/profile/, one set per tool invocation:
+
+  NAME-STAMP.pstats      cProfile data (python3 -m pstats FILE, snakeviz, ...)
+  NAME-STAMP.tracemalloc tracemalloc snapshot at exit (tracemalloc.Snapshot.load)
+  NAME-STAMP.txt         top functions by cumulative and own time, and with mem
+                         the peak traced size and the top allocation sites
+
+CVR_PROFILE_TOP sets how many entries the summary lists (default 25).
+"""
+
+import contextlib
+import cProfile
+import datetime
+import io
+import os
+import pstats
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Callable, FrozenSet, Iterator, List, Optional
+
+from tools.cvr import paths
+
+ENV = "CVR_PROFILE"
+TOP_ENV = "CVR_PROFILE_TOP"
+DEFAULT_TOP = 25
+MODES = ("cpu", "mem")
+FLAG = "--profile"
+
+# cProfile cannot nest; an inner profile() only adds what the outer one is not doing.
+_active: set = set()
+
+
+def parse_modes(value: Optional[str]) -> FrozenSet[str]:
+    """Modes named by a CVR_PROFILE / --profile value; empty when profiling is off."""
+    value = (value or "").strip().lower()
+    if value in ("", "0", "off", "false", "no"):
+        return frozenset()
+    if value in ("1", "on", "true", "yes"):
+        return frozenset({"cpu"})
+    modes = frozenset(part.strip() for part in value.split(",") if part.strip())
+    unknown = sorted(modes - set(MODES))
+    if unknown:
+        raise ValueError(f"unknown profile mode(s) {', '.join(unknown)}; expected {', '.join(MODES)}")
+    return modes
+
+
+def env_modes() -> FrozenSet[str]:
+    return parse_modes(os.environ.get(ENV))
+
+
+def take_flag(argv: List[str]) -> Optional[str]:
+    """Remove every --profile / --profile=MODES from ``argv`` in place; return the last value or None."""
+    value = None
+    kept = [argv[0]] if argv else []
+    for arg in argv[1:]:
+        if arg == FLAG:
+            value = "cpu"
+        elif arg.startswith(FLAG + "="):
+            value = arg[len(FLAG) + 1:]
+        else:
+            kept.append(arg)
+    argv[:] = kept
+    return value
+
+
+def top_count() -> int:
+    try:
+        return max(1, int(os.environ.get(TOP_ENV, DEFAULT_TOP)))
+    except ValueError:
+        return DEFAULT_TOP
+
+
+def output_stem(name: str, out_dir: Path) -> Path:
+    stamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    return out_dir / f"{name}-{stamp}-{os.getpid()}"
+
+
+def cpu_summary(profiler: cProfile.Profile, top: int) -> str:
+    out = io.StringIO()
+    for key, label in (("cumulative", "cumulative time"), ("tottime", "own time")):
+        out.write(f"== top {top} by {label} ==\n")
+        pstats.Stats(profiler, stream=out).sort_stats(key).print_stats(top)
+    return out.getvalue()
+
+
+def mem_summary(snapshot: tracemalloc.Snapshot, peak: int, top: int) -> str:
+    lines = [f"== tracemalloc: peak traced memory {peak / 1024:.1f} KiB; top {top} allocation sites at exit =="]
+    for stat in snapshot.statistics("lineno")[:top]:
+        lines.append(str(stat))
+    return "\n".join(lines) + "\n"
+
+
+@contextlib.contextmanager
+def profile(name: str, modes: Optional[FrozenSet[str]] = None, out_dir: Optional[Path] = None) -> Iterator[None]:
+    """Profile the block under ``name`` (modes default to CVR_PROFILE); a no-op when no mode is on."""
+    modes = (env_modes() if modes is None else frozenset(modes)) - _active
+    if not modes:
+        yield
+        return
+    out_dir = paths.PROFILE_DIR if out_dir is None else out_dir
+    profiler = cProfile.Profile() if "cpu" in modes else None
+    started_tracing = "mem" in modes and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    _active.update(modes)
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        _active.difference_update(modes)
+        write_results(name, out_dir, profiler, started_tracing)
+
+
+def write_results(name: str, out_dir: Path, profiler: Optional[cProfile.Profile], tracing: bool) -> None:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stem = output_stem(name, out_dir)
+    top = top_count()
+    summary = [f"# {name} (pid {os.getpid()})\n"]
+    if profiler is not None:
+        profiler.dump_stats(f"{stem}.pstats")
+        summary.append(cpu_summary(profiler, top))
+    if tracing:
+        snapshot = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        snapshot.dump(f"{stem}.tracemalloc")
+        summary.append(mem_summary(snapshot, peak, top))
+    Path(f"{stem}.txt").write_text("\n".join(summary), encoding="utf-8")
+    print(f"profiling: wrote {stem}.txt", file=sys.stderr)
+
+
+def run_main(name: str, main: Callable[[], object]) -> object:
+    """Call ``main`` (a tool's entry point), profiled if --profile or CVR_PROFILE asks for it.
+
+    Use as ``raise SystemExit(profiling.run_main("tool", main))``.
+    """
+    flag = take_flag(sys.argv)
+    try:
+        modes = parse_modes(flag) if flag is not None else env_modes()
+    except ValueError as exc:
+        print(f"{name}: ERROR: {exc}", file=sys.stderr)
+        return 2
+    with profile(name, modes):
+        return main()
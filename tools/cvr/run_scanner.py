@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Single-pass scanner for run artifacts (walkthrough.md, post_verify_report.md).
+
+aggregate_history, journal and close_run all need overlapping facts from the
+same markdown files: hypothesis ids and claims, the reported status, evidence
+pointers and the "Lessons Learned" bullets. This module reads each file once,
+line by line, and extracts all of them together. Results are memoized per
+process (keyed by path, mtime and size), so a file is read and tokenized once
+per invocation no matter how many tools ask for it.
+"""
+
+import collections
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+HYP_ID_RE = re.compile(r"HYP-[0-9]{4,}")
+ID_CLAIM_RE = re.compile(r"\b(HYP-[0-9]{4,})\b[^\n]*?[\:\-–]\s*(.+)")
+STATUS_RE = re.compile(r"Status:\s*([A-Za-z\-]+)")
+STATUS_VALUE_RE = re.compile(r"\s*([A-Za-z\-]+)")
+# Old: YYYY-MM-DD_HHMMSS or YYYY-MM-DD_HHMMSS-HYP-####
+# New: YYYY-MM-DD-HH-MM-SS or YYYY-MM-DD-HH-MM-SS-HYP-####
+_RUN_ID = r"[0-9]{4}-[0-9]{2}-[0-9]{2}[-_][0-9]{2}[-:]?[0-9]{2}[-:]?[0-9]{2}(?:-[A-Z]+-[0-9]{4,})?"
+RUN_ID_RE = re.compile(r"Run ID:\s*(" + _RUN_ID + ")")
+RUN_ID_VALUE_RE = re.compile(r"\s*(" + _RUN_ID + ")")
+LINK_RE = re.compile(r"\[[^\]]*\]\(([^)]+)\)")
+# A link opened but not yet closed at the end of the text seen so far.
+PARTIAL_LINK_RE = re.compile(r"\[[^\]]*(?:\]\([^)]*)?\Z")
+# How much of an unclosed link is carried into the following lines.
+LINK_CARRY_LIMIT = 4096
+INLINE_PATH_RE = re.compile(r"\b((?:docs|artifacts|tests|tools|src)/[^\s)]+)")
+HYPOTHESIS_MARKER = "Hypothesis:"
+
+
+@dataclass
+class ArtifactScan:
+    """Everything the CVR tools extract from one run artifact."""
+
+    # HYP ids in order of first appearance (unique).
+    hyp_ids: List[str] = field(default_factory=list)
+    # Last "HYP-####: claim" pair seen per id.
+    id_claims: Dict[str, str] = field(default_factory=dict)
+    # Text after the first "Hypothesis:" marker on its line (may be empty).
+    hypothesis_line: Optional[str] = None
+    # First non-empty text following a "Hypothesis:" marker, possibly on the next line.
+    hypothesis: Optional[str] = None
+    status: Optional[str] = None
+    run_id: Optional[str] = None
+    # Raw link targets and inline repo paths, in order of appearance.
+    evidence: List[str] = field(default_factory=list)
+    # Bullets under the first heading that mentions "lessons".
+    lessons: List[str] = field(default_factory=list)
+
+
+def scan_lines(lines: Iterable[str]) -> ArtifactScan:
+    """Scan lines (without terminators) in a single pass."""
+    scan = ArtifactScan()
+    seen_ids = set()
+    awaiting_hypothesis = False
+    hypothesis_padding = False
+    awaiting_status = False
+    awaiting_run_id = False
+    link_carry = ""
+    lessons_state = "before"  # before -> inside -> after
+
+    for line in lines:
+        for hyp_id in HYP_ID_RE.findall(line):
+            if hyp_id not in seen_ids:
+                seen_ids.add(hyp_id)
+                scan.hyp_ids.append(hyp_id)
+        if seen_ids:
+            match = ID_CLAIM_RE.search(line)
+            if match:
+                scan.id_claims[match.group(1)] = match.group(2).strip()
+
+        if awaiting_hypothesis and line:
+            if line.strip():
+                scan.hypothesis = line.strip()
+                awaiting_hypothesis = False
+            else:
+                hypothesis_padding = True
+        if HYPOTHESIS_MARKER in line:
+            rest = line.split(HYPOTHESIS_MARKER, 1)[1]
+            if scan.hypothesis_line is None:
+                scan.hypothesis_line = rest.strip()
+            if scan.hypothesis is None and not awaiting_hypothesis:
+                if rest.strip():
+                    scan.hypothesis = rest.strip()
+                else:
+                    # The claim may follow on a later line, as with "Hypothesis:\s*(.+)".
+                    awaiting_hypothesis = True
+                    hypothesis_padding = bool(rest)
+
+        if scan.status is None:
+            if awaiting_status and line.strip():
+                awaiting_status = False
+                match = STATUS_VALUE_RE.match(line)
+                if match:
+                    scan.status = match.group(1)
+        if scan.status is None:
+            match = STATUS_RE.search(line)
+            if match:
+                scan.status = match.group(1).strip()
+            elif line.rstrip().endswith("Status:"):
+                awaiting_status = True  # the value may follow on a later line
+        if scan.run_id is None:
+            if awaiting_run_id and line.strip():
+                awaiting_run_id = False
+                match = RUN_ID_VALUE_RE.match(line)
+                if match:
+                    scan.run_id = match.group(1)
+        if scan.run_id is None:
+            match = RUN_ID_RE.search(line)
+            if match:
+                scan.run_id = match.group(1)
+            elif line.rstrip().endswith("Run ID:"):
+                awaiting_run_id = True  # the value may follow on a later line
+
+        # Links may wrap across lines, so an unclosed one is rejoined with the next line.
+        text = link_carry + "\n" + line if link_carry else line
+        end = 0
+        for m in LINK_RE.finditer(text):
+            scan.evidence.append(m.group(1))
+            end = m.end()
+        match = PARTIAL_LINK_RE.search(text, end)
+        link_carry = match.group(0) if match and len(match.group(0)) <= LINK_CARRY_LIMIT else ""
+        scan.evidence.extend(m.group(1) for m in INLINE_PATH_RE.finditer(line))
+
+        if lessons_state != "after" and line.startswith("#"):
+            if "lessons" in line.lower():
+                lessons_state = "inside"
+            elif lessons_state == "inside":
+                lessons_state = "after"
+            continue
+        if lessons_state == "inside" and line.strip().startswith("- "):
+            scan.lessons.append(line.strip()[2:])
+
+    if awaiting_hypothesis and hypothesis_padding:
+        scan.hypothesis = ""
+    return scan
+
+
+def scan_text(text: str) -> ArtifactScan:
+    return scan_lines(text.splitlines())
+
+
+# Bounded so that bulk scans (e.g. aggregating thousands of runs) do not pin every result.
+SCAN_CACHE_SIZE = 64
+_SCAN_CACHE: "collections.OrderedDict[str, Tuple[Tuple[int, int, int], ArtifactScan]]" = collections.OrderedDict()
+
+
+def scan_file(path: Path) -> Optional[ArtifactScan]:
+    """Scan a file once per process; returns None if it does not exist.
+
+    Callers MUST treat the result as read-only, since it is shared.
+    """
+    try:
+        st = path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    key = str(path.resolve())
+    stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+    cached = _SCAN_CACHE.get(key)
+    if cached and cached[0] == stamp:
+        _SCAN_CACHE.move_to_end(key)
+        return cached[1]
+    with open(path, encoding="utf-8") as f:
+        scan = scan_lines(line.rstrip("\n") for line in f)
+    _SCAN_CACHE[key] = (stamp, scan)
+    _SCAN_CACHE.move_to_end(key)
+    while len(_SCAN_CACHE) > SCAN_CACHE_SIZE:
+        _SCAN_CACHE.popitem(last=False)
+    return scan
@@ -0,0 +1,828 @@
+#!/usr/bin/env python3
+"""Run every CVR linter, then the project tests (the body of tools/verify_all.sh).
+
+Linters are imported and their main() called in this one interpreter, so
+interpreter startup and shared imports (jsonschema, tools.cvr.paths,
+lint_common) are paid once instead of once per linter. External commands
+(format_md's markdown tools, tools/test.sh) still run as subprocesses.
+
+The log format and exit semantics match the original shell script:
+
+  ==> NAME @ TIMESTAMP        (stdout and artifacts/logs/NAME.log)
+  + COMMAND                   (stdout and the log)
+  ...linter output...         (the log only)
+  ==> OK: NAME                (stdout and the log)
+
+The first failing step stops the run with that step's exit status.
+
+Steps declare ordering constraints (``after``) and form a DAG; independent
+steps run concurrently in forked worker processes (--jobs, default: CPU count).
+--watch re-runs only a few linters at a time, so it runs them in this process
+unless --jobs is given; --jobs 1 does the same for a plain run. Terminal output
+is still printed in step order, one complete block per step, so it does not
+depend on scheduling. A summary with the critical path (the longest chain of
+dependent steps) goes to stderr.
+
+Linters that declare an ``INPUTS`` tuple of glob patterns are cached: the
+result (exit status and exact output) is stored in artifacts/cache/ keyed by
+the content hashes of every matching file plus the linter's and the shared
+runtime's source, and replayed without running the linter while the key is
+unchanged. Digests are reused for files whose mtime and size are unchanged, so
+a no-op verify only stats files. --no-cache disables this.
+
+--watch runs the linters once, then polls the files matched by every linter's
+INPUTS (os.scandir and mtimes, no inotify) and re-runs only the linters whose
+inputs changed. Project tests are not run in watch mode. When the CVR sources
+themselves change, the watcher restarts itself so new linter code is used.
+
+--format json|sarif also writes the whole result to one file (default
+artifacts/logs/verify_results.json or .sarif): per step its exit status, wall
+and CPU time and whether it was replayed, plus every diagnostic (tool, rule_id,
+file, line, message). Linters report diagnostics through lint_common (die(),
+report(), record()); failing steps that reported none, such as external
+commands, fall back to the "tool: ERROR: ..." lines in their output. rule_id,
+title, severity and fix are resolved from diagnostic_db's rules.json when the
+file is written.
+
+--profile[=cpu,mem] sets CVR_PROFILE for the run (see profiling.py): each
+linter's import and main() are profiled into artifacts/logs/profile/ under the
+step name, and the result cache is bypassed so every linter actually runs.
+"""
+
+import argparse
+import ast
+import concurrent.futures
+import contextlib
+import datetime
+import hashlib
+import importlib
+import io
+import json
+import multiprocessing
+import os
+import re
+import resource
+import subprocess
+import sys
+import time
+import traceback
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, TextIO, Tuple
+
+CVR_DIR = Path(__file__).resolve().parent
+LINTERS_DIR = CVR_DIR / "linters"
+# Scripts run from the repo root; commands in the logs are shown relative to it.
+sys.path.insert(0, str(CVR_DIR.parent.parent))
+for _path in (CVR_DIR, LINTERS_DIR):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+from tools.cvr import fscache, ndjson_io, paths, profiling
+import lint_common
+from diagnostic_db import DiagnosticDB
+
+CVR_REL = "tools/cvr"
+# Bump whenever cache keys or cached result fields change.
+RESULT_CACHE_VERSION = 2
+# Sources (relative to tools/cvr/) every linter's result depends on besides its own module.
+SHARED_SOURCES = ("*.py", "linters/lint_common.py", "linters/schema_validation.py", "schemas/*.json")
+# Sources whose change makes --watch restart (relative to tools/cvr/).
+WATCHED_SOURCES = ("*.py", "linters/*.py", "schemas/*.json")
+WATCH_INTERVAL = 0.05
+RESULTS_FORMAT_VERSION = 1
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+# rules.json severities as SARIF result levels.
+SARIF_LEVELS = {"error": "error", "warning": "warning", "info": "note", "note": "note"}
+
+
+def always() -> bool:
+    return True
+
+
+@dataclass(frozen=True)
+class Step:
+    """One verification step: a linter run in-process, or an external command."""
+
+    name: str
+    # Command line as shown in the log (and run as a subprocess when module is None).
+    argv: Tuple[str, ...]
+    # Linter module whose main() runs in-process.
+    module: Optional[str] = None
+    # Arguments passed to main(); None calls main() with no arguments.
+    main_args: Optional[Tuple[str, ...]] = None
+    # Skip the step unless this returns true (checked before any step runs).
+    when: Callable[[], bool] = always
+    # Steps that must finish successfully first; each must come earlier in the step list.
+    after: Tuple[str, ...] = ()
+
+
+@dataclass
+class StepResult:
+    """What running (or replaying) one step produced."""
+
+    status: int
+    replayed: bool = False
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    # lint_common diagnostic dicts: tool, message, file, line.
+    diagnostics: List[Dict] = field(default_factory=list)
+
+
+def linter(name: str, *args: str, module: Optional[str] = None, main_args=None, when=always, after=()) -> Step:
+    module = module or name
+    return Step(name, ("python3", f"{CVR_REL}/linters/{module}.py", *args), module, main_args, when, tuple(after))
+
+
+def has_walkthrough() -> bool:
+    return Path("walkthrough.md").is_file() or lint_common.run_artifact_index().latest("walkthrough.md") is not None
+
+
+def has_run_plans() -> bool:
+    return any(paths.RUNS_DIR.glob("*/implementation_plan.json"))
+
+
+def has_root_plan_only() -> bool:
+    return not has_run_plans() and Path("implementation_plan.json").is_file()
+
+
+def markdown_tools_present() -> bool:
+    check = Path("tools/check_tools.sh")
+    if not (check.is_file() and os.access(check, os.X_OK)):
+        return False
+    if subprocess.run([str(check)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode == 0:
+        return True
+    print("WARNING: Missing markdown tools (see tools/check_tools.sh). Skipping formatting checks.", flush=True)
+    return False
+
+
+STEPS = (
+    Step("format_md_check", ("python3", f"{CVR_REL}/format_md.py", "--check"), when=markdown_tools_present),
+    linter("template_baseline_lint"),
+    linter("workflow_intent_lint"),
+    linter("panic_style_lint"),
+    linter("intent_lint"),
+    linter("agenda_lint"),
+    linter("context_manifest_lint", when=paths.CONTEXT_MANIFEST.is_file),
+    # post_verify_lint cross-checks the report against AGENDA.md, so AGENDA.md must lint first.
+    linter("post_verify_lint", when=paths.POST_VERIFY_REPORT.is_file, after=("agenda_lint",)),
+    linter("lessons_lint", when=paths.LESSONS_LEARNED.is_file),
+    linter("walkthrough_lint", when=has_walkthrough),
+    linter("run_artifacts_lint", when=paths.RUNS_DIR.is_dir),
+    linter("evidence_location_lint"),
+    linter("journal_lint"),
+    linter("content_lint", main_args=()),
+    # history_lint cross-checks journal records and the agenda; report broken inputs at their source first.
+    linter("history_lint", main_args=(), after=("agenda_lint", "journal_lint")),
+    linter("plan_lint_run", "--run", module="plan_lint", main_args=("plan_lint.py", "--run"), when=has_run_plans),
+    linter("plan_lint_root", module="plan_lint", main_args=("plan_lint.py",), when=has_root_plan_only),
+)
+
+
+def declared_inputs(source: Path) -> Optional[Tuple[str, ...]]:
+    """A linter's INPUTS constant, read from its source without importing the module."""
+    try:
+        tree = ast.parse(source.read_bytes())
+    except (OSError, SyntaxError):
+        return None
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(isinstance(t, ast.Name) and t.id == "INPUTS" for t in node.targets):
+            return tuple(ast.literal_eval(node.value))
+    return None
+
+
+class ResultCache:
+    """Linter results keyed by a digest of their declared inputs and sources."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        data = fscache.load_cache(path, RESULT_CACHE_VERSION)
+        self.previous = data.get("fingerprints", {})
+        self.results: Dict[str, Dict] = data.get("results", {})
+        self.fingerprints: Dict[str, Dict] = {}
+        self.globs: Dict[str, List[Path]] = {}
+        self.changed = False
+
+    def digest(self, path: Path) -> str:
+        name = str(path)
+        fp = self.fingerprints.get(name)
+        if fp is None:
+            if path.is_dir():
+                fp = {"dir": True}
+            else:
+                fp = fscache.file_fingerprint(path, self.previous.get(name)) or {"missing": True}
+            self.fingerprints[name] = fp
+        if "sha256" in fp:
+            return fp["sha256"]
+        return "dir" if fp.get("dir") else "missing"
+
+    def expand(self, pattern: str, root: Path = Path(".")) -> List[Path]:
+        key = f"{root}\0{pattern}"
+        if key not in self.globs:
+            self.globs[key] = sorted(root.glob(pattern))
+        return self.globs[key]
+
+    def key_for(self, step: Step) -> Optional[str]:
+        """The cache key for an in-process linter that declares INPUTS; None if it cannot be cached."""
+        if step.module is None:
+            return None
+        source = LINTERS_DIR / f"{step.module}.py"
+        inputs = declared_inputs(source)
+        if inputs is None:
+            return None
+        h = hashlib.sha256(json.dumps([step.name, step.argv, step.main_args]).encode("utf-8"))
+        sources = [source] + [p for pattern in SHARED_SOURCES for p in self.expand(pattern, CVR_DIR)]
+        for path in sources:
+            h.update(f"{path.relative_to(CVR_DIR)}\0{self.digest(path)}\n".encode("utf-8"))
+        for pattern in inputs:
+            h.update(f"{pattern}\n".encode("utf-8"))
+            for path in self.expand(pattern):
+                h.update(f"{path.as_posix()}\0{self.digest(path)}\n".encode("utf-8"))
+        return h.hexdigest()
+
+    def lookup(self, name: str, key: str) -> Optional[Tuple[int, str, List[Dict]]]:
+        entry = self.results.get(name)
+        if entry and entry.get("key") == key:
+            return entry["status"], entry["output"], entry["diagnostics"]
+        return None
+
+    def store(self, name: str, key: str, status: int, output: str, diagnostics: List[Dict]) -> None:
+        self.results[name] = {"key": key, "status": status, "output": output, "diagnostics": diagnostics}
+        self.changed = True
+
+    def merge(self, name: str, entry: Optional[Dict], fingerprints: Dict[str, Dict]) -> None:
+        """Fold in what a worker process computed."""
+        if entry is not None and self.results.get(name) != entry:
+            self.results[name] = entry
+            self.changed = True
+        self.fingerprints.update(fingerprints)
+
+    def save(self) -> None:
+        if self.changed or self.fingerprints != {k: self.previous.get(k) for k in self.fingerprints}:
+            fscache.save_cache(self.path, RESULT_CACHE_VERSION, {"fingerprints": self.fingerprints, "results": self.results})
+
+
+def run_in_process(step: Step, log: TextIO) -> int:
+    """Call the linter's main() with stdout and stderr going to ``log``; return its exit status."""
+    saved_argv = sys.argv
+    sys.argv = list(step.argv[1:])
+    try:
+        with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+            try:
+                with profiling.profile(step.name):
+                    module = importlib.import_module(step.module)
+                    result = module.main(*([list(step.main_args)] if step.main_args is not None else []))
+            except SystemExit as exc:
+                result = exc.code
+            except Exception:
+                traceback.print_exc()
+                return 1
+    finally:
+        sys.argv = saved_argv
+    if result is None:
+        return 0
+    if isinstance(result, int):
+        return result
+    print(result, file=log)  # like SystemExit("message"): print it and fail
+    return 1
+
+
+def run_subprocess(step: Step, log: TextIO) -> int:
+    log.flush()
+    return subprocess.run(list(step.argv), stdout=log, stderr=subprocess.STDOUT).returncode
+
+
+def diagnostics_from_output(step: Step, status: int, output: str) -> List[Dict]:
+    """Diagnostics for a failing step that reported none: its "tool: ERROR:" lines, else its exit status."""
+    found = [d for d in map(lint_common.parse_diagnostic, output.splitlines()) if d is not None]
+    return found or [{"tool": step.module or step.name, "message": f"exited with status {status}", "file": None, "line": None}]
+
+
+def cpu_seconds() -> float:
+    """CPU time used by this process and its waited-for children so far."""
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return time.process_time() + children.ru_utime + children.ru_stime
+
+
+def run_step(step: Step, ts: str, emit: Callable[[str], None], cache: Optional[ResultCache] = None) -> StepResult:
+    """Run (or replay) one step, writing its log; ``emit`` receives the lines meant for the terminal."""
+    start, cpu_start = time.perf_counter(), cpu_seconds()
+    key = cache.key_for(step) if cache is not None else None
+    cached = cache.lookup(step.name, key) if key is not None else None
+    header = [f"==> {step.name} @ {ts}", f"+ {' '.join(step.argv)}"]
+    log_path = paths.LOGS_DIR / f"{step.name}.log"
+    with open(log_path, "w", encoding="utf-8") as log:
+        for line in header:
+            emit(line)
+            log.write(line + "\n")
+        if cached is not None:
+            status, output, diagnostics = cached
+            log.write(output)
+        elif step.module is not None:
+            buffer = io.StringIO()
+            lint_common.DIAGNOSTICS.clear()
+            status = run_in_process(step, buffer)
+            output = buffer.getvalue()
+            diagnostics = list(lint_common.DIAGNOSTICS)
+            if status != 0 and not diagnostics:
+                diagnostics = diagnostics_from_output(step, status, output)
+            log.write(output)
+            if key is not None:
+                cache.store(step.name, key, status, output, diagnostics)
+        else:
+            status = run_subprocess(step, log)
+            diagnostics = []
+        if status == 0:
+            log.write(f"==> OK: {step.name}\n")
+    if status != 0 and step.module is None:
+        diagnostics = diagnostics_from_output(step, status, log_path.read_text(encoding="utf-8", errors="replace"))
+    if status == 0:
+        emit(f"==> OK: {step.name}")
+    return StepResult(status, cached is not None, time.perf_counter() - start, cpu_seconds() - cpu_start, diagnostics)
+
+
+def emit_now(line: str) -> None:
+    print(line, flush=True)
+
+
+# Steps being scheduled, by name, and the result cache. Set before the worker
+# pool forks, so workers look steps up by name instead of pickling them.
+_scheduled: Dict[str, Step] = {}
+_cache: Optional[ResultCache] = None
+
+
+def run_scheduled(name: str, ts: str) -> Tuple[StepResult, List[str], Optional[Dict], Dict[str, Dict]]:
+    """Worker entry point: run a step.
+
+    Returns (result, terminal lines, new cache entry, fingerprints).
+    """
+    lines: List[str] = []
+    result = run_step(_scheduled[name], ts, lines.append, _cache)
+    if _cache is None:
+        return result, lines, None, {}
+    entry = None if result.replayed else _cache.results.get(name)
+    return result, lines, entry, _cache.fingerprints
+
+
+def check_order(steps: Sequence[Step]) -> None:
+    seen = set()
+    for step in steps:
+        for dep in step.after:
+            if dep not in seen and dep in {s.name for s in steps}:
+                raise ValueError(f"step {step.name} must come after its dependency {dep}")
+        seen.add(step.name)
+
+
+def critical_path(steps: Sequence[Step], durations: Dict[str, float]) -> Tuple[float, List[str]]:
+    """Longest chain of dependent steps that ran, by wall time: (seconds, names in run order)."""
+    finish: Dict[str, float] = {}
+    via: Dict[str, Optional[str]] = {}
+    for step in steps:
+        if step.name not in durations:
+            continue
+        deps = [d for d in step.after if d in finish]
+        prev = max(deps, key=finish.__getitem__, default=None)
+        finish[step.name] = durations[step.name] + (finish[prev] if prev else 0.0)
+        via[step.name] = prev
+    if not finish:
+        return 0.0, []
+    name: Optional[str] = max(finish, key=finish.__getitem__)
+    total = finish[name]
+    chain = []
+    while name is not None:
+        chain.append(name)
+        name = via[name]
+    return total, chain[::-1]
+
+
+def run_sequential(steps: Sequence[Step], ts: str, results: Dict[str, StepResult], cache: Optional[ResultCache]) -> int:
+    for step in steps:
+        result = results[step.name] = run_step(step, ts, emit_now, cache)
+        if result.status != 0:
+            return result.status
+    return 0
+
+
+def run_parallel(
+    steps: Sequence[Step],
+    ts: str,
+    jobs: int,
+    results: Dict[str, StepResult],
+    cache: Optional[ResultCache],
+) -> int:
+    """Run ``steps`` on a forked worker pool, honoring ``after`` edges.
+
+    Output is printed in step order as soon as every earlier step has finished.
+    Once a step fails, no step after it in the list is started; steps already
+    running finish (and write their logs) but their output is not printed.
+    """
+    global _cache
+    _scheduled.clear()
+    _scheduled.update((step.name, step) for step in steps)
+    _cache = cache
+    order = {step.name: i for i, step in enumerate(steps)}
+    output: Dict[str, List[str]] = {}
+    started = set()
+    first_failure = len(steps)  # index of the earliest failed step known so far
+    next_to_print = 0
+    context = multiprocessing.get_context("fork")
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs, mp_context=context) as pool:
+        running: Dict[concurrent.futures.Future, str] = {}
+        while True:
+            for step in steps[:first_failure]:
+                if step.name in started:
+                    continue
+                if all(dep in results and results[dep].status == 0 for dep in step.after if dep in order):
+                    started.add(step.name)
+                    running[pool.submit(run_scheduled, step.name, ts)] = step.name
+            if not running:
+                break
+            done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                result, output[name], entry, fingerprints = future.result()
+                results[name] = result
+                if cache is not None:
+                    cache.merge(name, entry, fingerprints)
+                if result.status != 0:
+                    first_failure = min(first_failure, order[name])
+            while next_to_print < len(steps) and steps[next_to_print].name in output:
+                name = steps[next_to_print].name
+                for line in output[name]:
+                    emit_now(line)
+                if results[name].status != 0:
+                    return results[name].status
+                next_to_print += 1
+    return 0
+
+
+PROJECT_TESTS = Step("project_tests", ("tools/test.sh",))
+
+
+def run_project_tests(ts: str, results: Dict[str, StepResult]) -> int:
+    test_sh = Path("tools/test.sh")
+    if not (test_sh.is_file() and os.access(test_sh, os.X_OK)):
+        print("verify_all: tools/test.sh not present/executable; skipping project tests")
+        return 0
+    results[PROJECT_TESTS.name] = run_step(PROJECT_TESTS, ts, emit_now)
+    return results[PROJECT_TESTS.name].status
+
+
+def run_linters(
+    steps: Sequence[Step], jobs: int = 1, use_cache: bool = True, results: Optional[Dict[str, StepResult]] = None
+) -> Tuple[int, str]:
+    """Run the selected ``steps``; return (status of the first failing step or 0, timestamp used).
+
+    Each step that ran is added to ``results``.
+    """
+    check_order(steps)
+    for directory in (paths.LOGS_DIR, paths.TEST_RESULTS_DIR, paths.RUNS_DIR, paths.INTENT_DIR):
+        directory.mkdir(parents=True, exist_ok=True)
+    ts = datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    selected = [step for step in steps if step.when()]
+    results = {} if results is None else results
+    cache = ResultCache(paths.LINT_RESULT_CACHE) if use_cache else None
+    start = time.perf_counter()
+    if jobs > 1 and len(selected) > 1:
+        status = run_parallel(selected, ts, jobs, results, cache)
+    else:
+        status = run_sequential(selected, ts, results, cache)
+    if cache is not None:
+        cache.save()
+    wall = time.perf_counter() - start
+    durations = {name: result.wall_s for name, result in results.items()}
+    replayed = sum(result.replayed for result in results.values())
+    path_time, chain = critical_path(selected, durations)
+    print(
+        f"verify_all: {len(durations)} step(s) ({replayed} cached) in {wall:.2f}s with {jobs} job(s); "
+        f"step total {sum(durations.values()):.2f}s; critical path {path_time:.2f}s: {' -> '.join(chain) or '-'}",
+        file=sys.stderr,
+    )
+    return status, ts
+
+
+def resolve_rule(db: DiagnosticDB, diagnostic: Dict) -> Dict:
+    """``diagnostic`` plus rule_id, title, severity and fix of the first matching rule (None if no rule matches).
+
+    Rules filed under lint_common cover the checks every linter shares (path hygiene).
+    """
+    rule = db.lookup(diagnostic["tool"], diagnostic["message"]) or db.lookup("lint_common", diagnostic["message"]) or {}
+    return {
+        **diagnostic,
+        "rule_id": rule.get("rule_id"),
+        "title": rule.get("title"),
+        "severity": rule.get("severity", "error"),
+        "fix": rule.get("fix"),
+    }
+
+
+def results_document(ts: str, status: int, steps: Sequence[Step], results: Dict[str, StepResult]) -> Dict:
+    """The verification result as one JSON-ready dict, steps in run order."""
+    db = DiagnosticDB()
+    ran = [step for step in steps if step.name in results]
+    return {
+        "version": RESULTS_FORMAT_VERSION,
+        "timestamp": ts,
+        "status": status,
+        "steps": [
+            {
+                "name": step.name,
+                "command": " ".join(step.argv),
+                "log": (paths.LOGS_DIR / f"{step.name}.log").as_posix(),
+                "status": results[step.name].status,
+                "replayed": results[step.name].replayed,
+                "wall_s": round(results[step.name].wall_s, 6),
+                "cpu_s": round(results[step.name].cpu_s, 6),
+                "diagnostics": [resolve_rule(db, d) for d in results[step.name].diagnostics],
+            }
+            for step in ran
+        ],
+    }
+
+
+def sarif_document(document: Dict) -> Dict:
+    """SARIF 2.1.0 for a results_document(): one run per step, timings in the invocation's properties."""
+    runs = []
+    for step in document["steps"]:
+        rules: Dict[str, Dict] = {}
+        sarif_results = []
+        for d in step["diagnostics"]:
+            rule_id = d["rule_id"] or f"{d['tool']}.unmatched"
+            if d["rule_id"] and rule_id not in rules:
+                rules[rule_id] = {"id": rule_id, "shortDescription": {"text": d["title"] or rule_id}}
+                if d["fix"]:
+                    rules[rule_id]["properties"] = {"fix": d["fix"]}
+            result = {
+                "ruleId": rule_id,
+                "level": SARIF_LEVELS.get(d["severity"], "error"),
+                "message": {"text": d["message"]},
+            }
+            if d["file"]:
+                location: Dict = {"artifactLocation": {"uri": d["file"]}}
+                if d["line"]:
+                    location["region"] = {"startLine": d["line"]}
+                    if d.get("column"):
+                        location["region"]["startColumn"] = d["column"]
+                result["locations"] = [{"physicalLocation": location}]
+            sarif_results.append(result)
+        runs.append({
+            "tool": {"driver": {"name": step["name"], "rules": list(rules.values())}},
+            "invocations": [{
+                "commandLine": step["command"],
+                "executionSuccessful": step["status"] == 0,
+                "exitCode": step["status"],
+                "properties": {k: step[k] for k in ("wall_s", "cpu_s", "replayed", "log")},
+            }],
+            "results": sarif_results,
+        })
+    return {"$schema": SARIF_SCHEMA, "version": "2.1.0", "runs": runs}
+
+
+def write_results(
+    path: Path, output_format: str, ts: str, status: int, steps: Sequence[Step], results: Dict[str, StepResult]
+) -> None:
+    document = results_document(ts, status, steps, results)
+    if output_format == "sarif":
+        document = sarif_document(document)
+    with ndjson_io.atomic_writer(path) as f:
+        json.dump(document, f, indent=2)
+        f.write("\n")
+    print(f"verify_all: wrote {output_format} results to {path}", file=sys.stderr)
+
+
+def run_all(
+    steps: Sequence[Step] = STEPS,
+    jobs: int = 1,
+    use_cache: bool = True,
+    output_format: str = "text",
+    output: Optional[Path] = None,
+) -> int:
+    results: Dict[str, StepResult] = {}
+    status, ts = run_linters(steps, jobs, use_cache, results)
+    if status == 0:
+        status = run_project_tests(ts, results)
+    if output_format != "text":
+        write_results(output or default_output(output_format), output_format, ts, status, [*steps, PROJECT_TESTS], results)
+    if status != 0:
+        return status
+    print("verify_all: OK")
+    return 0
+
+
+def default_output(output_format: str) -> Path:
+    return paths.VERIFY_RESULTS_JSON if output_format == "json" else paths.VERIFY_RESULTS_SARIF
+
+
+def glob_regex(pattern: str) -> "re.Pattern[str]":
+    """Compile a Path.glob() pattern ("*", "?", "**/") into a regex over POSIX relative paths."""
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:[^/]+/)*")
+            i += 3
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(out) + r"\Z")
+
+
+def static_root(pattern: str) -> Tuple[str, bool]:
+    """The directory to scan for ``pattern`` and whether the scan must recurse."""
+    parts = pattern.split("/")
+    for i, part in enumerate(parts):
+        if any(c in part for c in "*?["):
+            return "/".join(parts[:i]) or ".", i < len(parts) - 1
+    return "/".join(parts[:-1]) or ".", False
+
+
+class Watcher:
+    """Poll the files named by linters' INPUTS and map changes back to linters."""
+
+    def __init__(self, steps: Sequence[Step]) -> None:
+        self.steps = list(steps)
+        self.patterns: Dict[str, List["re.Pattern[str]"]] = {}
+        self.roots: Dict[str, bool] = {}
+        for step in self.steps:
+            inputs = declared_inputs(LINTERS_DIR / f"{step.module}.py") if step.module else None
+            if not inputs:
+                continue
+            self.patterns[step.name] = [glob_regex(pattern) for pattern in inputs]
+            for pattern in inputs:
+                root, recursive = static_root(pattern)
+                self.roots[root] = self.roots.get(root, False) or recursive
+        self.any_input = re.compile("|".join(f"(?:{p.pattern})" for ps in self.patterns.values() for p in ps) or "(?!)")
+        self.state = self.snapshot()
+
+    def snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """(mtime_ns, size) of every existing path matched by some input pattern; directories as (0, 0)."""
+        found: Dict[str, Tuple[int, int]] = {}
+        for root, recursive in self.roots.items():
+            self._scan(root, recursive, found)
+        return found
+
+    def _scan(self, directory: str, recursive: bool, found: Dict[str, Tuple[int, int]]) -> None:
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return
+        prefix = "" if directory == "." else directory + "/"
+        for entry in entries:
+            rel = prefix + entry.name
+            try:
+                is_dir = entry.is_dir()
+                if self.any_input.match(rel):
+                    if is_dir:
+                        found[rel] = (0, 0)
+                    else:
+                        st = entry.stat()
+                        found[rel] = (st.st_mtime_ns, st.st_size)
+                if recursive and is_dir and not entry.is_symlink():
+                    self._scan(rel, True, found)
+            except OSError:
+                continue  # vanished while scanning; the next poll sees it gone
+
+    def affected(self, changed: Iterable[str]) -> List[Step]:
+        """Steps whose inputs cover any of the ``changed`` paths, in step order."""
+        changed = list(changed)
+        return [
+            step
+            for step in self.steps
+            if any(p.match(path) for p in self.patterns.get(step.name, ()) for path in changed)
+        ]
+
+    def poll(self) -> Tuple[List[str], List[Step]]:
+        """Rescan; return (changed paths, affected steps) since the previous poll."""
+        current = self.snapshot()
+        changed = sorted(path for path in current.keys() | self.state.keys() if current.get(path) != self.state.get(path))
+        self.state = current
+        return changed, self.affected(changed) if changed else []
+
+
+def source_stamp() -> Dict[str, int]:
+    stamp = {}
+    for pattern in WATCHED_SOURCES:
+        for path in CVR_DIR.glob(pattern):
+            with contextlib.suppress(OSError):
+                stamp[str(path)] = path.stat().st_mtime_ns
+    return stamp
+
+
+def watch(
+    steps: Sequence[Step],
+    jobs: int,
+    use_cache: bool,
+    interval: float = WATCH_INTERVAL,
+    output_format: str = "text",
+    output: Optional[Path] = None,
+) -> int:
+    """Run ``steps`` once, then re-run the ones whose inputs change until interrupted.
+
+    With a structured ``output_format`` the results file is rewritten after every
+    run, keeping the latest result of each step.
+    """
+    results: Dict[str, StepResult] = {}
+
+    def run(selected: Sequence[Step]) -> None:
+        # Linters trust the process-wide run artifact index; revalidate it between runs.
+        lint_common.run_artifact_index(refresh=True)
+        _, ts = run_linters(selected, jobs, use_cache, results)
+        if output_format != "text":
+            status = next((results[s.name].status for s in steps if results.get(s.name, StepResult(0)).status), 0)
+            write_results(output or default_output(output_format), output_format, ts, status, steps, results)
+
+    run(steps)
+    watcher = Watcher(steps)
+    sources = source_stamp()
+    print(f"verify_all: watching {len(watcher.state)} input path(s); Ctrl-C to stop", file=sys.stderr, flush=True)
+    try:
+        while True:
+            started = time.perf_counter()
+            changed, affected = watcher.poll()
+            if affected:
+                names = ", ".join(step.name for step in affected)
+                print(f"verify_all: {len(changed)} changed path(s) -> {names}", file=sys.stderr, flush=True)
+                run(affected)
+            if source_stamp() != sources:
+                print("verify_all: CVR sources changed; restarting", file=sys.stderr, flush=True)
+                os.execv(sys.executable, [sys.executable, *sys.argv])
+            # A scan slower than the interval backs the polling off instead of spinning.
+            time.sleep(max(interval, time.perf_counter() - started))
+    except KeyboardInterrupt:
+        return 0
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be >= 1")
+    return number
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run all CVR linters and the project tests.")
+    parser.add_argument(
+        "--jobs",
+        type=positive_int,
+        help=(
+            "Linters to run concurrently in forked workers (default: CPU count, or 1 with --watch; "
+            "1 runs them in this process, in order)"
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Run every linter instead of replaying unchanged results from artifacts/cache/lint_results.json",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("text", "json", "sarif"),
+        default="text",
+        help="Also write the full result (step timings, diagnostics with rule ids) as JSON or SARIF",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="Results file for --format (default: artifacts/logs/verify_results.json or .sarif)",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="cpu",
+        metavar="MODES",
+        help="Profile every linter (cpu, mem or cpu,mem; default cpu) into artifacts/logs/profile/; implies --no-cache",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running: poll linter inputs and re-run only the linters whose inputs changed",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=WATCH_INTERVAL,
+        help=f"Polling interval in seconds for --watch (default: {WATCH_INTERVAL})",
+    )
+    args = parser.parse_args(argv)
+    if args.profile is not None:
+        try:
+            profiling.parse_modes(args.profile)
+        except ValueError as exc:
+            parser.error(str(exc))
+        os.environ[profiling.ENV] = args.profile
+    if profiling.env_modes():
+        args.no_cache = True  # replayed results would leave nothing to profile
+    if args.jobs is None:
+        args.jobs = 1 if args.watch else os.cpu_count() or 1
+    if args.watch:
+        return watch(STEPS, args.jobs, not args.no_cache, args.interval, args.format, args.output)
+    return run_all(jobs=args.jobs, use_cache=not args.no_cache, output_format=args.format, output=args.output)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,13 +5,20 @@ if [ -f .venv/bin/activate ]; then
   source .venv/bin/activate
 fi
 
-# Add linters and CVR directories to Python path
+# Add linters and CVR directories to Python path (for subprocesses the linters start)
 if [ -d tools/cvr ]; then
   export PYTHONPATH="${PYTHONPATH:-}:$(pwd)/tools/cvr:$(pwd)/tools/cvr/linters"
 elif [ -d tools/linters ]; then
   export PYTHONPATH="${PYTHONPATH:-}:$(pwd)/tools/linters"
 fi
 
+# With the CVR runtime present, all linters run in one interpreter; see
+# tools/cvr/verify_all.py for the step list. The steps below are the fallback for
+# template layouts without it.
+if [ -f tools/cvr/verify_all.py ]; then
+  exec python3 tools/cvr/verify_all.py "$@"
+fi
+
 mkdir -p artifacts/logs artifacts/test_results artifacts/history/runs artifacts/intent
 
 ts="$(date -u +"%Y-%m-%dT%H:%M:%SZ")"